@@ -7,17 +7,32 @@
 
 import os
 from http import HTTPStatus
-from flask import Flask, abort, g, request
+from flask import Flask, abort, g, request, url_for
 from flask_login import current_user as flask_login_current_user
 from flask_cors import CORS
 from redis import Redis
 from jinja2 import ChoiceLoader, FileSystemLoader
+from werkzeug.local import LocalProxy
 from werkzeug.middleware.shared_data import SharedDataMiddleware
 
 from .config import Config
+from app.core.beat_schedule import build_beat_schedule
 from app.core.database import db
-from app.core.extensions import celery, csrf, login_manager, mail, migrate
+from app.core.db_pool import configure_engine_options, instrument_engines
+from app.core.extensions import celery, csrf, login_manager, mail
+from app.core.fragment_cache import init_fragment_cache
+from app.core.json_provider import install_json_provider
+from app.core.assets import (
+    FingerprintedStaticMiddleware,
+    build_static_assets,
+    load_manifest,
+    static_roots,
+)
 from app.core.central_middleware import register_central_middleware
+from app.core.compression import register_response_compression
+from app.core.metrics import REGISTRY as metrics_registry, register_celery_metrics
+from app.core.template_cache import configure_template_mode
+from app.core.template_context import lazy, request_memo, user_context_enabled
 from app.logging.logger import initialize_logging
 
 redis_client: Redis | None = None
@@ -32,27 +47,42 @@ verify_jwt_in_request_optional = lambda *a, **kw: None
 def _mount_static_mappings(app: Flask) -> None:
     """Serve module-specific static assets through the shared /static endpoint."""
 
-    static_roots = {
-        "admin": os.path.join(app.root_path, "modules", "admin", "static", "admin"),
-        "companies": os.path.join(app.root_path, "modules", "companies", "static", "companies"),
-        "members": os.path.join(app.root_path, "modules", "members", "static", "members"),
-        "core": os.path.join(app.root_path, "core", "static"),
-    }
-
     mounts: dict[str, str] = {}
-    for module_key in ("admin", "companies", "members"):
-        module_path = static_roots[module_key]
-        if os.path.isdir(module_path):
-            mounts[f"/static/{module_key}"] = module_path
-
-    core_static = static_roots.get("core")
-    if core_static and os.path.isdir(core_static):
-        mounts["/static"] = core_static
+    for prefix, path in static_roots(app).items():
+        if os.path.isdir(path):
+            mounts[f"/static/{prefix}" if prefix else "/static"] = path
 
     if mounts:
         app.wsgi_app = SharedDataMiddleware(app.wsgi_app, mounts)
 
 
+def _install_fingerprinted_assets(app: Flask) -> None:
+    """Emit hashed static URLs and serve them with immutable caching when a build exists."""
+
+    if not app.config.get("STATIC_FINGERPRINTING", False):
+        return
+
+    build_dir = app.config["STATIC_BUILD_DIR"]
+    if app.config.get("STATIC_BUILD_ON_STARTUP", False):
+        manifest = build_static_assets(app, build_dir)
+    else:
+        manifest = load_manifest(build_dir)
+    if not manifest:
+        return
+
+    app.extensions["static_manifest"] = manifest
+
+    @app.url_defaults
+    def _fingerprint_static_urls(endpoint: str, values: dict) -> None:
+        if endpoint != "static":
+            return
+        hashed = manifest.get(values.get("filename"))
+        if hashed:
+            values["filename"] = hashed
+
+    app.wsgi_app = FingerprintedStaticMiddleware(app.wsgi_app, build_dir, manifest.values())
+
+
 def _enforce_security_requirements(app: Flask) -> None:
     """Fail fast when mandatory security controls are missing."""
 
@@ -88,7 +118,9 @@ def _validate_production_settings(app: Flask) -> None:
         raise RuntimeError(" | ".join(error_messages))
 
 
-def create_app(config_class: type[Config] = Config) -> Flask:
+def _create_base_app(config_class: type[Config]) -> Flask:
+    """Build the Flask object, configuration, logging and template loaders."""
+
     app = Flask(__name__, template_folder="core/templates", static_folder="core/static")
     app.config.from_object(config_class)
 
@@ -97,7 +129,12 @@ def create_app(config_class: type[Config] = Config) -> Flask:
 
     app.secret_key = app.config["SECRET_KEY"]
 
+    install_json_provider(app)
     initialize_logging(app)
+    metrics_registry.configure(
+        app.config.get("METRICS_MULTIPROC_DIR"),
+        app.config.get("METRICS_FLUSH_INTERVAL", 5.0),
+    )
 
     app.jinja_loader = ChoiceLoader(
         [
@@ -107,8 +144,100 @@ def create_app(config_class: type[Config] = Config) -> Flask:
             app.jinja_loader,
         ]
     )
+    init_fragment_cache(app)
+    return app
+
+
+def _init_data_layer(app: Flask) -> None:
+    """Initialise the database, Redis, Celery and mail extensions."""
+
+    configure_engine_options(app)
+    db.init_app(app)
+    instrument_engines(app, db)
+
+    global redis_client
+    redis_client = Redis.from_url(app.config["REDIS_URL"], decode_responses=True)
+
+    from app.services.catalog_version_service import register_catalog_version_hooks
+
+    register_catalog_version_hooks()
+
+    from app.services.outbox_service import register_outbox_hooks
+
+    register_outbox_hooks()
+
+    from app.services.redemption_ledger_service import register_activity_log_compat_hooks
+
+    register_activity_log_compat_hooks()
+
+    from app.services.usage_code_stream_service import register_usage_code_stream_hooks
+
+    register_usage_code_stream_hooks()
+
+    celery.conf.update(app.config)
+    celery.conf.broker_url = app.config.get("CELERY_BROKER_URL", celery.conf.broker_url)
+    celery.conf.result_backend = app.config.get("CELERY_RESULT_BACKEND", celery.conf.result_backend)
+    celery.conf.beat_schedule = build_beat_schedule(app.config)
+
+    class AppContextTask(celery.Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery.Task = AppContextTask
+    register_celery_metrics()
+
+    mail.init_app(app)
+
+
+def _register_blueprints(app: Flask) -> None:
+    """Import and register every web blueprint (dev tools outside production only)."""
+
+    from app.modules.members.routes import (
+        main as main_blueprint,
+        notifications,
+        offers,
+        usage_codes,
+        users,
+    )
+    from app.modules.members.routes.user_portal_routes import portal  # noqa: E402
+    from app.modules.members.auth.routes import auth  # noqa: E402
+    from app.modules.companies.routes import company_bp  # noqa: E402
+    from app.modules.admin import admin  # noqa: E402
+    from app.modules.companies import company_portal  # noqa: E402
+    from app.modules.companies.routes.api_routes import companies  # noqa: E402
+    from app.core.metrics.routes import metrics_bp  # noqa: E402
+
+    app.register_blueprint(main_blueprint)
+    app.register_blueprint(admin)  # ← الآن يستخدم تعريف blueprint الصحيح من app/admin/__init__.py
+    app.register_blueprint(auth)
+    app.register_blueprint(company_bp)
+    app.register_blueprint(company_portal)
+    app.register_blueprint(portal)
+    app.register_blueprint(offers, url_prefix="/api/offers")
+    app.register_blueprint(companies, url_prefix="/api/companies")
+    app.register_blueprint(users, url_prefix="/api/users")
+    app.register_blueprint(usage_codes)
+    app.register_blueprint(notifications)
+    app.register_blueprint(metrics_bp)
+
+    env_name = str(app.config.get("ENV", "production")).lower()
+    if env_name != "production":
+        # Dev tools are only imported where they are mounted.
+        from routes.dev_tools.normalization_test import normalization_test  # noqa: E402
+        from routes.dev_tools.choices_monitor import choices_monitor  # noqa: E402
+
+        app.register_blueprint(normalization_test)
+        app.register_blueprint(choices_monitor)
+
+
+def create_app(config_class: type[Config] = Config) -> Flask:
+    app = _create_base_app(config_class)
 
     _mount_static_mappings(app)
+    _install_fingerprinted_assets(app)
+    # Registered first so it runs after every other after_request hook.
+    register_response_compression(app)
 
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
@@ -129,26 +258,14 @@ def create_app(config_class: type[Config] = Config) -> Flask:
 
     login_manager.login_view = "auth.login"
     login_manager.login_message_category = "info"
-    login_manager.init_app(app)
+    # inject_user_context provides a lazy current_user to templates.
+    login_manager.init_app(app, add_context_processor=False)
 
-    db.init_app(app)
-    migrate.init_app(app, db)
-
-    global redis_client
-    redis_client = Redis.from_url(app.config["REDIS_URL"], decode_responses=True)
-
-    celery.conf.update(app.config)
-    celery.conf.broker_url = app.config.get("CELERY_BROKER_URL", celery.conf.broker_url)
-    celery.conf.result_backend = app.config.get("CELERY_RESULT_BACKEND", celery.conf.result_backend)
-
-    class AppContextTask(celery.Task):
-        def __call__(self, *args, **kwargs):
-            with app.app_context():
-                return self.run(*args, **kwargs)
+    _init_data_layer(app)
 
-    celery.Task = AppContextTask
+    from app.core.extensions import migrate
 
-    mail.init_app(app)
+    migrate.init_app(app, db)
 
     @login_manager.user_loader
     def load_user(user_id: str):
@@ -218,11 +335,8 @@ def create_app(config_class: type[Config] = Config) -> Flask:
             clear_auth_cookie(response)
         return response
 
-    @app.context_processor
-    def inject_user_context():
-        """Inject user and role context into all templates, including status labels."""
-        from app.services.incentive_eligibility_service import get_offer_runtime_flags
-        from app.services.access_control import can_access
+    def _resolve_template_identity() -> dict:
+        """Resolve the user shown in page templates, including the status label."""
 
         user = getattr(g, "current_user", None)
         role = getattr(g, "user_role", "guest") or "guest"
@@ -283,64 +397,98 @@ def create_app(config_class: type[Config] = Config) -> Flask:
         else:
             user_status_label = "👥 تصفح كـ ضيف"
 
-        is_admin = normalized_role in {"admin", "superadmin"}
-        is_superadmin = normalized_role == "superadmin"
+        return {
+            "user": user,
+            "role": normalized_role,
+            "permissions": permissions,
+            "status_label": user_status_label,
+        }
 
+    def _template_identity() -> dict:
+        return request_memo("identity", _resolve_template_identity)
+
+    def _unread_messages_count() -> int:
         from app.services.communication_service import CommunicationService
-        unread_messages_count = 0
+
+        user = _template_identity()["user"]
         if user and getattr(user, "is_authenticated", False):
             try:
-                unread_messages_count = CommunicationService.get_unread_count(user.id)
+                return CommunicationService.get_unread_count(user.id)
             except Exception:
-                unread_messages_count = 0
+                return 0
+        return 0
+
+    @app.context_processor
+    def inject_user_context():
+        """Inject lazily resolved user and role context into page templates.
+
+        Every value is a proxy evaluated on first use and at most once per
+        request; emails and renders outside a request get none of it.
+        """
+        if not user_context_enabled():
+            return {}
+
+        from app.services.incentive_eligibility_service import get_offer_runtime_flags
+        from app.services.access_control import can_access
 
+        role = LocalProxy(lambda: _template_identity()["role"])
         return {
-            "current_user": user,
-            "role": normalized_role,  # <--- أُضيف لضمان عمل {{ role }} في القوالب
-            "user_role": normalized_role,
-            "user_permissions": permissions,
-            "user_status_label": user_status_label,
-            "is_admin": is_admin,
-            "is_superadmin": is_superadmin,
+            "current_user": LocalProxy(lambda: _template_identity()["user"]),
+            "role": role,  # <--- أُضيف لضمان عمل {{ role }} في القوالب
+            "user_role": role,
+            "user_permissions": LocalProxy(lambda: _template_identity()["permissions"]),
+            "user_status_label": LocalProxy(lambda: _template_identity()["status_label"]),
+            "is_admin": LocalProxy(lambda: _template_identity()["role"] in {"admin", "superadmin"}),
+            "is_superadmin": LocalProxy(lambda: _template_identity()["role"] == "superadmin"),
             "get_offer_runtime_flags": get_offer_runtime_flags,
-            "unread_messages_count": unread_messages_count,
+            "unread_messages_count": lazy("unread_messages_count", _unread_messages_count),
             "can_access": can_access,
         }
 
     with app.app_context():
         from app.models import Company, Offer, Permission, User  # noqa: F401
 
-    from app.modules.members.routes import (
-        main as main_blueprint,
-        notifications,
-        offers,
-        usage_codes,
-        users,
-    )
-    from app.modules.members.routes.user_portal_routes import portal  # noqa: E402
-    from app.modules.members.auth.routes import auth  # noqa: E402
-    from app.modules.companies.routes import company_bp  # noqa: E402
-    from app.modules.admin import admin  # noqa: E402
-    from app.modules.companies import company_portal  # noqa: E402
-    from app.modules.companies.routes.api_routes import companies  # noqa: E402
-    from routes.dev_tools.normalization_test import normalization_test  # noqa: E402
-    from routes.dev_tools.choices_monitor import choices_monitor  # noqa: E402
+    from app.services.image_processing_service import build_srcset, pick_rendition
 
-    app.register_blueprint(main_blueprint)
-    app.register_blueprint(admin)  # ← الآن يستخدم تعريف blueprint الصحيح من app/admin/__init__.py
-    app.register_blueprint(auth)
-    app.register_blueprint(company_bp)
-    app.register_blueprint(company_portal)
-    app.register_blueprint(portal)
-    app.register_blueprint(offers, url_prefix="/api/offers")
-    app.register_blueprint(companies, url_prefix="/api/companies")
-    app.register_blueprint(users, url_prefix="/api/users")
-    app.register_blueprint(usage_codes)
-    app.register_blueprint(notifications)
+    app.add_template_filter(build_srcset, "srcset")
+    app.add_template_filter(pick_rendition, "rendition")
 
-    env_name = str(app.config.get("ENV", "production")).lower()
-    if env_name != "production":
-        app.register_blueprint(normalization_test)
-        app.register_blueprint(choices_monitor)
+    from app.cli import register_cli_commands
+
+    register_cli_commands(app)
+    _register_blueprints(app)
+    configure_template_mode(app)
+
+    return app
+
+
+def create_worker_app(config_class: type[Config] = Config) -> Flask:
+    """Slim application for Celery workers and beat.
+
+    Only configuration, logging, metrics and the data layer are initialised and
+    the task modules imported; request middleware, CSRF, login, template
+    precompilation, CLI commands and dev tools are skipped. Web blueprints are
+    registered on first use by ``url_for`` (notification tasks build portal
+    links), so workers that never build a URL never import the view modules.
+    """
+
+    app = _create_base_app(config_class)
+    _init_data_layer(app)
+
+    # Importing the task modules registers their tasks with Celery.
+    from app.modules.members.services import member_notifications_service  # noqa: F401
+    from app.services import image_processing_service  # noqa: F401
+    from app.services import outbox_service  # noqa: F401
+    from app.services import redemption_ledger_service  # noqa: F401
+    from app.services import retention_service  # noqa: F401
+    from app.services import usage_code_service  # noqa: F401
+
+    def _register_blueprints_on_demand(error, endpoint, values):
+        if app.extensions.get("elite_worker_blueprints"):
+            raise error
+        app.extensions["elite_worker_blueprints"] = True
+        _register_blueprints(app)
+        return url_for(endpoint, **values)
 
+    app.url_build_error_handlers.append(_register_blueprints_on_demand)
     return app
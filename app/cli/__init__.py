@@ -0,0 +1,28 @@
+"""Flask CLI commands shipped with the ELITE backend."""
+
+from __future__ import annotations
+
+from flask import Flask
+
+from .assets import assets_cli
+from .outbox import outbox_cli
+from .partitions import partitions_cli
+from .retention import retention_cli
+from .seed import seed_command
+from .startup import startup_report_command
+from .templates import templates_cli
+
+
+def register_cli_commands(app: Flask) -> None:
+    """Attach the ELITE command groups to ``flask``."""
+
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(partitions_cli)
+    app.cli.add_command(retention_cli)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(startup_report_command)
+    app.cli.add_command(templates_cli)
+
+
+__all__ = ["register_cli_commands"]
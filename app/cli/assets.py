@@ -0,0 +1,29 @@
+"""`flask elite-assets` commands for the fingerprinted static build."""
+
+from __future__ import annotations
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.core.assets import build_static_assets
+
+assets_cli = AppGroup("elite-assets", help="Build fingerprinted, precompressed static assets.")
+
+
+@assets_cli.command("build")
+@click.option(
+    "--output",
+    "output_dir",
+    default=None,
+    help="Target directory (defaults to STATIC_BUILD_DIR).",
+)
+def build_command(output_dir: str | None) -> None:
+    """Fingerprint every static asset and write gzip/brotli variants plus the manifest."""
+
+    target = output_dir or current_app.config["STATIC_BUILD_DIR"]
+    manifest = build_static_assets(current_app, target)
+    click.echo(f"Fingerprinted {len(manifest)} assets into {target}")
+
+
+__all__ = ["assets_cli"]
@@ -0,0 +1,53 @@
+"""`flask elite-outbox` commands for inspecting and draining the transactional outbox."""
+
+from __future__ import annotations
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func
+
+from app.core.database import db
+from app.models import OutboxMessage
+from app.services.outbox_service import dispatch_pending, requeue_failed
+
+outbox_cli = AppGroup("elite-outbox", help="Inspect and drain the email/SMS/notification outbox.")
+
+
+@outbox_cli.command("status")
+def status_command() -> None:
+    """Print message counts by kind and status."""
+
+    rows = (
+        db.session.query(OutboxMessage.kind, OutboxMessage.status, func.count(OutboxMessage.id))
+        .group_by(OutboxMessage.kind, OutboxMessage.status)
+        .order_by(OutboxMessage.kind, OutboxMessage.status)
+        .all()
+    )
+    if not rows:
+        click.echo("Outbox is empty.")
+        return
+    for kind, status, count in rows:
+        click.echo(f"{kind:<20} {status:<12} {count:>8}")
+
+
+@outbox_cli.command("dispatch")
+@click.option("--max-batches", type=int, default=None, help="Stop after this many batches.")
+def dispatch_command(max_batches: int | None) -> None:
+    """Deliver due messages in this process (what the outbox.dispatch task does)."""
+
+    report = dispatch_pending(max_batches)
+    click.echo(
+        f"Claimed {report.claimed}: {report.sent} sent, {report.retried} scheduled for retry, "
+        f"{report.failed} failed, {report.expired} expired"
+    )
+
+
+@outbox_cli.command("requeue-failed")
+@click.option("--kind", default=None, help="Only requeue messages of this kind.")
+def requeue_command(kind: str | None) -> None:
+    """Give permanently failed messages a fresh set of attempts."""
+
+    click.echo(f"Requeued {requeue_failed(kind)} messages")
+
+
+__all__ = ["outbox_cli"]
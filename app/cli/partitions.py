@@ -0,0 +1,46 @@
+"""`flask elite-partitions` commands for the month-partitioned redemption ledger."""
+
+from __future__ import annotations
+
+import click
+from flask.cli import AppGroup
+
+from app.core.database import db
+from app.core.partitioning import default_partition_months, has_default_partition, list_monthly_partitions
+from app.models import RedemptionEvent
+from app.services.redemption_ledger_service import maintain_partitions
+
+partitions_cli = AppGroup("elite-partitions", help="Inspect and create redemption_events partitions.")
+
+
+@partitions_cli.command("list")
+def list_command() -> None:
+    """Print the attached monthly partitions and their ranges."""
+
+    table = RedemptionEvent.__tablename__
+    with db.engine.connect() as connection:
+        partitions = list_monthly_partitions(connection, table)
+        has_default = has_default_partition(connection, table)
+        stray_months = default_partition_months(connection, table, "created_at")
+    if not partitions:
+        click.echo(f"{table} is not partitioned on this database.")
+        return
+    for partition in partitions:
+        click.echo(f"{partition.name:<32} {partition.month.isoformat()} .. {partition.upper_bound.isoformat()}")
+    if not has_default:
+        click.echo("No DEFAULT partition: inserts for a month without a child will fail.")
+    elif stray_months:
+        months = ", ".join(month.strftime("%Y-%m") for month in stray_months)
+        click.echo(f"DEFAULT partition holds rows for {months}; run `flask elite-partitions ensure`.")
+
+
+@partitions_cli.command("ensure")
+@click.option("--months-ahead", type=int, default=None, help="Defaults to REDEMPTION_PARTITION_MONTHS_AHEAD.")
+def ensure_command(months_ahead: int | None) -> None:
+    """Create missing partitions now (what the redemptions.maintain_partitions task does)."""
+
+    created = maintain_partitions(months_ahead)
+    click.echo(f"Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+
+
+__all__ = ["partitions_cli"]
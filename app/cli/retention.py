@@ -0,0 +1,56 @@
+"""`flask elite-retention` commands for inspecting and running retention sweeps."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.services.retention_service import POLICIES, count_eligible, cutoff_for, sweep
+
+retention_cli = AppGroup("elite-retention", help="Inspect and run the table retention policies.")
+
+
+@retention_cli.command("status")
+def status_command() -> None:
+    """Print each policy's settings and how many rows it would reclaim now."""
+
+    config = current_app.config
+    for policy in POLICIES:
+        cutoff = cutoff_for(policy)
+        if cutoff is None:
+            click.echo(f"{policy.name:<20} {policy.table:<20} disabled")
+            continue
+        keep_last = policy.keep_last(config)
+        details = [f"older than {policy.max_age_days(config)}d"]
+        if keep_last:
+            details.append(f"keep last {keep_last} per {policy.owner_column}")
+        if policy.archive and config.get("RETENTION_ARCHIVE_DIR"):
+            details.append("archived")
+        click.echo(f"{policy.name:<20} {policy.table:<20} {count_eligible(policy):>8} eligible ({', '.join(details)})")
+
+
+@retention_cli.command("run")
+@click.option(
+    "--policy",
+    "names",
+    multiple=True,
+    type=click.Choice([policy.name for policy in POLICIES]),
+    help="Only run this policy (repeatable).",
+)
+@click.option("--max-batches", type=int, default=None, help="Per policy; defaults to RETENTION_MAX_BATCHES_PER_RUN.")
+def run_command(names: Tuple[str, ...], max_batches: int | None) -> None:
+    """Run the sweep in this process (what the retention.sweep task does)."""
+
+    for report in sweep(names or None, max_batches=max_batches):
+        click.echo(
+            f"{report.policy:<20} deleted {report.deleted}, archived {report.archived} "
+            f"in {report.batches} batches"
+        )
+        for path in report.files:
+            click.echo(f"  {path}")
+
+
+__all__ = ["retention_cli"]
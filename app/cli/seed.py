@@ -0,0 +1,65 @@
+"""`flask elite-seed` command generating synthetic load-testing data."""
+
+from __future__ import annotations
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.services.synthetic_data_service import (
+    SCALE_PRESETS,
+    SEED_PASSWORD,
+    generate_synthetic_data,
+    resolve_scale,
+)
+
+
+@click.command("elite-seed")
+@click.option(
+    "--scale",
+    "preset",
+    type=click.Choice(sorted(SCALE_PRESETS)),
+    default="small",
+    show_default=True,
+    help="Base volume preset; the options below override individual counts.",
+)
+@click.option("--members", type=int, help="Member accounts to create.")
+@click.option("--companies", type=int, help="Partner companies (each with an owner account).")
+@click.option("--offers-per-company", type=int, help="Offers per partner.")
+@click.option("--usage-codes-per-company", type=int, help="Usage-code history rows per partner.")
+@click.option("--attempts", type=int, help="Usage-code attempts written to the redemption ledger.")
+@click.option("--notifications", type=int, help="Member notifications.")
+@click.option("--conversations", type=int, help="Member/partner conversations.")
+@click.option("--messages-per-conversation", type=int, help="Messages per conversation.")
+@click.option("--days", type=int, help="Spread timestamps over this many past days.")
+@click.option("--skew", type=float, help="Zipf exponent for hot partners/power members (0 = uniform).")
+@click.option("--batch-size", type=int, help="Rows per COPY/executemany batch.")
+@click.option("--seed", type=int, help="Random seed for reproducible datasets.")
+@click.option("--yes", is_flag=True, help="Skip the confirmation prompt.")
+@with_appcontext
+def seed_command(preset: str, yes: bool, **overrides) -> None:
+    """Append synthetic users, partners, offers and activity for load testing."""
+
+    scale = resolve_scale(preset, **overrides)
+    database = current_app.config.get("SQLALCHEMY_DATABASE_URI", "")
+    click.echo(f"Target database: {database.rsplit('@', 1)[-1]}")
+    click.echo(
+        f"Scale: {scale.members:,} members, {scale.companies:,} partners, "
+        f"{scale.companies * scale.offers_per_company:,} offers, {scale.attempts:,} attempts, "
+        f"{scale.notifications:,} notifications, {scale.conversations:,} conversations (skew {scale.skew})"
+    )
+    if not yes:
+        click.confirm("Append this synthetic data to the database?", abort=True)
+
+    def _progress(table: str, count: int, seconds: float) -> None:
+        rate = count / seconds if seconds else 0.0
+        click.echo(f"  {table:<22} {count:>12,} rows  {seconds:>8.1f}s  {rate:>12,.0f} rows/s")
+
+    report = generate_synthetic_data(scale, progress=_progress)
+    click.echo(
+        f"Inserted {report.total_rows:,} rows in {report.seconds:.1f}s. "
+        f"Seeded accounts use the password '{SEED_PASSWORD}'."
+    )
+
+
+__all__ = ["seed_command"]
@@ -0,0 +1,52 @@
+"""`flask elite-startup-report` - import-time and memory profile of the app factories."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.core.startup_report import profile_startup
+
+
+@click.command("elite-startup-report")
+@click.option("--worker", is_flag=True, help="Profile create_worker_app() instead of create_app().")
+@click.option("--top", default=20, show_default=True, help="Number of modules listed per section.")
+@click.option("--prefix", "prefixes", multiple=True, help="Only list modules under this package (repeatable).")
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON.")
+@with_appcontext
+def startup_report_command(worker: bool, top: int, prefixes: tuple, as_json: bool) -> None:
+    """Start the factory in a fresh interpreter and report where the time goes."""
+
+    factory = "worker" if worker else "web"
+    project_root = os.path.dirname(current_app.root_path)
+    try:
+        profile = profile_startup(factory, project_root)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    if as_json:
+        click.echo(json.dumps(profile.to_dict(limit=top), indent=2))
+        return
+
+    click.echo(
+        f"{factory}: import {profile.import_ms:.0f} ms + factory {profile.factory_ms:.0f} ms "
+        f"= {profile.total_ms:.0f} ms, max RSS {profile.max_rss_kb / 1024:.1f} MiB, "
+        f"{profile.modules} modules"
+    )
+    click.echo(f"\nTop {top} by cumulative import time:")
+    for record in profile.top_cumulative(top, prefixes):
+        click.echo(f"  {record.cumulative_us / 1000:9.1f} ms  {record.module}")
+    click.echo(f"\nTop {top} by self import time:")
+    for record in profile.top_self(top, prefixes):
+        click.echo(f"  {record.self_us / 1000:9.1f} ms  {record.module}")
+    if not prefixes:
+        click.echo(f"\nTop {top} top-level packages by self time:")
+        for package, total in profile.by_package(top):
+            click.echo(f"  {total / 1000:9.1f} ms  {package}")
+
+
+__all__ = ["startup_report_command"]
@@ -0,0 +1,38 @@
+"""`flask elite-templates` commands for the production template mode."""
+
+from __future__ import annotations
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.core.template_cache import install_bytecode_cache, precompile_templates
+
+templates_cli = AppGroup("elite-templates", help="Precompile Jinja templates into the bytecode cache.")
+
+
+@templates_cli.command("compile")
+@click.option(
+    "--cache-dir",
+    default=None,
+    help="Bytecode cache directory (defaults to TEMPLATE_BYTECODE_CACHE_DIR).",
+)
+def compile_command(cache_dir: str | None) -> None:
+    """Compile every template and persist the bytecode for worker start-up.
+
+    Cache entries are keyed by template name and absolute path, so run this
+    from the same install location the workers use.
+    """
+
+    target = install_bytecode_cache(current_app, cache_dir)
+    if current_app.jinja_env.cache is not None:
+        current_app.jinja_env.cache.clear()
+    report = precompile_templates(current_app)
+    click.echo(f"Compiled {report.compiled} templates into {target} in {report.seconds:.2f}s")
+    for name, error in sorted(report.failures.items()):
+        click.echo(f"  ✗ {name}: {error}", err=True)
+    if report.failures:
+        raise SystemExit(1)
+
+
+__all__ = ["templates_cli"]
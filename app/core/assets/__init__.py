@@ -0,0 +1,12 @@
+"""Fingerprinted static asset pipeline (build step, manifest and serving)."""
+
+from .fingerprint import build_static_assets, load_manifest, static_roots
+from .middleware import FingerprintedStaticMiddleware, IMMUTABLE_CACHE_CONTROL
+
+__all__ = [
+    "build_static_assets",
+    "load_manifest",
+    "static_roots",
+    "FingerprintedStaticMiddleware",
+    "IMMUTABLE_CACHE_CONTROL",
+]
@@ -0,0 +1,131 @@
+"""Build step that fingerprints static assets and writes precompressed variants."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from flask import Flask
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - brotli variants are skipped without it
+    brotli = None
+
+MANIFEST_FILENAME = "manifest.json"
+
+# User uploads change at runtime and already carry their own cache busting.
+EXCLUDED_DIRECTORIES = {"uploads", "qrcodes", "__pycache__"}
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map", ".ico"}
+MIN_COMPRESS_BYTES = 512
+
+
+def static_roots(app: Flask) -> Dict[str, str]:
+    """Return the URL prefix (relative to ``/static``) served by each static tree."""
+
+    return {
+        "admin": os.path.join(app.root_path, "modules", "admin", "static", "admin"),
+        "companies": os.path.join(app.root_path, "modules", "companies", "static", "companies"),
+        "members": os.path.join(app.root_path, "modules", "members", "static", "members"),
+        "": os.path.join(app.root_path, "core", "static"),
+    }
+
+
+def _iter_assets(prefix: str, root: str) -> Iterable[Tuple[str, str]]:
+    """Yield ``(logical_name, absolute_path)`` pairs for a static tree."""
+
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if d not in EXCLUDED_DIRECTORIES and not d.startswith("."))
+        for filename in sorted(files):
+            if filename.startswith("."):
+                continue
+            absolute = os.path.join(directory, filename)
+            relative = os.path.relpath(absolute, root).replace(os.sep, "/")
+            logical = f"{prefix}/{relative}" if prefix else relative
+            yield logical, absolute
+
+
+def _hashed_name(logical: str, digest: str) -> str:
+    stem, dot, extension = logical.rpartition(".")
+    if not dot or "/" in extension:
+        return f"{logical}.{digest}"
+    return f"{stem}.{digest}.{extension}"
+
+
+def _write_variants(target: Path, payload: bytes, *, compress: bool) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(payload)
+    if not compress or len(payload) < MIN_COMPRESS_BYTES:
+        return
+    gz_payload = gzip.compress(payload, compresslevel=9, mtime=0)
+    if len(gz_payload) < len(payload):
+        target.with_name(target.name + ".gz").write_bytes(gz_payload)
+    if brotli is not None:
+        br_payload = brotli.compress(payload, quality=11)
+        if len(br_payload) < len(payload):
+            target.with_name(target.name + ".br").write_bytes(br_payload)
+
+
+def build_static_assets(app: Flask, output_dir: str | os.PathLike | None = None) -> Dict[str, str]:
+    """Fingerprint every static asset into ``output_dir`` and write the manifest.
+
+    Each file is copied to ``<name>.<hash>.<ext>`` (plus ``.gz``/``.br`` siblings
+    for text assets) and the returned manifest maps the logical filename used in
+    ``url_for('static', filename=...)`` to its fingerprinted counterpart.
+    """
+
+    build_dir = Path(output_dir or app.config["STATIC_BUILD_DIR"])
+    staging_dir = build_dir.with_name(build_dir.name + ".tmp")
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir(parents=True)
+
+    manifest: Dict[str, str] = {}
+    for prefix, root in static_roots(app).items():
+        if not os.path.isdir(root):
+            continue
+        for logical, absolute in _iter_assets(prefix, root):
+            if logical in manifest:
+                continue
+            payload = Path(absolute).read_bytes()
+            digest = hashlib.sha256(payload).hexdigest()[:12]
+            hashed = _hashed_name(logical, digest)
+            compress = Path(logical).suffix.lower() in COMPRESSIBLE_EXTENSIONS
+            _write_variants(staging_dir / hashed, payload, compress=compress)
+            manifest[logical] = hashed
+
+    (staging_dir / MANIFEST_FILENAME).write_text(
+        json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"
+    )
+
+    # Swap the finished build in one step so running workers never see a partial tree.
+    if build_dir.exists():
+        shutil.rmtree(build_dir)
+    staging_dir.rename(build_dir)
+    return manifest
+
+
+def load_manifest(build_dir: str | os.PathLike) -> Dict[str, str]:
+    """Return the manifest written by :func:`build_static_assets`, or an empty map."""
+
+    manifest_path = Path(build_dir) / MANIFEST_FILENAME
+    if not manifest_path.is_file():
+        return {}
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {str(key): str(value) for key, value in data.items()} if isinstance(data, dict) else {}
+
+
+__all__ = [
+    "MANIFEST_FILENAME",
+    "build_static_assets",
+    "load_manifest",
+    "static_roots",
+]
@@ -0,0 +1,92 @@
+"""WSGI middleware serving fingerprinted assets with immutable caching."""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+from typing import Iterable, Mapping
+
+from werkzeug.datastructures import Headers
+from werkzeug.wsgi import get_path_info, wrap_file
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Preferred order when the client accepts several encodings.
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted: set[str] = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class FingerprintedStaticMiddleware:
+    """Serve ``/static/<hashed-name>`` from the build directory.
+
+    Requests for fingerprinted names are answered directly with far-future
+    immutable caching and a precompressed ``br``/``gzip`` variant when the client
+    accepts one. Any other path falls through to the wrapped application, so the
+    regular static mounts keep serving unversioned files and uploads.
+    """
+
+    def __init__(self, app, build_dir: str, hashed_names: Iterable[str], url_prefix: str = "/static/") -> None:
+        self.app = app
+        self.build_dir = os.path.abspath(build_dir)
+        self.hashed_names = frozenset(hashed_names)
+        self.url_prefix = url_prefix
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD", "GET")
+        path = get_path_info(environ)
+        if method not in {"GET", "HEAD"} or not path.startswith(self.url_prefix):
+            return self.app(environ, start_response)
+
+        name = path[len(self.url_prefix):]
+        if name not in self.hashed_names:
+            return self.app(environ, start_response)
+
+        return self._serve(environ, start_response, name, head_only=method == "HEAD")
+
+    def _serve(self, environ: Mapping, start_response, name: str, *, head_only: bool):
+        source = os.path.join(self.build_dir, *name.split("/"))
+        etag = '"' + name.rsplit("/", 1)[-1] + '"'
+
+        headers = Headers()
+        headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        headers["Vary"] = "Accept-Encoding"
+        headers["ETag"] = etag
+
+        if etag in environ.get("HTTP_IF_NONE_MATCH", ""):
+            start_response("304 Not Modified", headers.to_wsgi_list())
+            return []
+
+        accepted = _accepted_encodings(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        selected = source
+        for encoding, suffix in _ENCODINGS:
+            if encoding in accepted and os.path.isfile(source + suffix):
+                selected = source + suffix
+                headers["Content-Encoding"] = encoding
+                break
+
+        if not os.path.isfile(selected):
+            return self.app(environ, start_response)
+
+        mimetype, _ = mimetypes.guess_type(name)
+        content_type = mimetype or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in {"application/javascript", "image/svg+xml"}:
+            content_type = f"{content_type}; charset=utf-8"
+        headers["Content-Type"] = content_type
+        headers["Content-Length"] = str(os.path.getsize(selected))
+
+        start_response("200 OK", headers.to_wsgi_list())
+        if head_only:
+            return []
+        return wrap_file(environ, open(selected, "rb"))
+
+
+__all__ = ["FingerprintedStaticMiddleware", "IMMUTABLE_CACHE_CONTROL"]
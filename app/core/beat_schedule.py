@@ -0,0 +1,38 @@
+"""Periodic Celery jobs run by ``celery beat`` (see ``celery_worker.py``).
+
+Intervals come from configuration so deployments can slow a sweep down or
+switch it off (an interval of 0 drops the entry).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+
+def build_beat_schedule(config: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Return the ``beat_schedule`` mapping for the given app configuration."""
+
+    entries = {
+        # Safety net for messages whose post-commit dispatch never reached the broker,
+        # and the only trigger for retries that are waiting out their backoff.
+        "outbox-dispatch": ("outbox.dispatch", float(config.get("OUTBOX_DISPATCH_INTERVAL_SECONDS", 30))),
+        # Creates next months' redemption_events partitions before inserts reach them.
+        "redemption-partitions": (
+            "redemptions.maintain_partitions",
+            float(config.get("REDEMPTION_PARTITION_INTERVAL_SECONDS", 21600)),
+        ),
+        "retention-sweep": ("retention.sweep", float(config.get("RETENTION_INTERVAL_SECONDS", 3600))),
+        # Rotates expiring usage codes for partners with a screen open; GET requests never do.
+        "usage-code-rotation": (
+            "usage_codes.rotate",
+            float(config.get("USAGE_CODE_ROTATION_INTERVAL_SECONDS", 10)),
+        ),
+    }
+    return {
+        name: {"task": task, "schedule": seconds}
+        for name, (task, seconds) in entries.items()
+        if seconds > 0
+    }
+
+
+__all__ = ["build_beat_schedule"]
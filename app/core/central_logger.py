@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from app.logging.logger import LOG_FILE_PATH, get_logger, initialize_logging
 
-initialize_logging()
-logger = get_logger()
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``logger`` on first use instead of configuring logging at import time."""
+
+    if name == "logger":
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["logger", "LOG_FILE_PATH", "initialize_logging", "get_logger"]
@@ -4,15 +4,17 @@ from __future__ import annotations
 
 from flask import Flask
 
+from app.core.profiling import register_request_profiler
 from app.logging.middleware import register_logging_middleware
 
 REQUEST_ID_HEADER = "X-Request-ID"
 
 
 def register_central_middleware(app: Flask) -> None:
-    """Register the structured logging middleware used across the app."""
+    """Register the structured logging middleware and the opt-in request profiler."""
 
     register_logging_middleware(app)
+    register_request_profiler(app)
 
 
 __all__ = ["register_central_middleware", "REQUEST_ID_HEADER"]
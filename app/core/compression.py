@@ -0,0 +1,164 @@
+"""Negotiated gzip/brotli compression of dynamic HTML and JSON responses.
+
+Runs as the last ``after_request`` hook so logging, profiling and cookie hooks
+see the uncompressed body. Buffered responses below ``COMPRESSION_MIN_SIZE``
+are sent as-is; streamed responses are compressed chunk by chunk with a flush
+after each chunk, so nothing is buffered and every chunk reaches the client
+when the view yields it. File responses (``send_file``/static) are left to the
+precompressed asset pipeline, and ``text/event-stream`` is not in the default
+allowlist because event delivery must not wait on a compressor.
+
+Levels default to gzip 6 and brotli 4: on the portal offers page brotli 4 is
+smaller than gzip 9 for about a sixth of its CPU time, while brotli 5-6 double
+the CPU for ~12% fewer bytes and 11 is two orders of magnitude slower (see
+``benchmarks/compression.py``).
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, Response, current_app, request
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - gzip only without it
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/xml",
+    "text/csv",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        # wbits=31 writes the gzip header and trailer.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compressor_for(encoding: str, config) -> _GzipStream | _BrotliStream:
+    if encoding == "br":
+        return _BrotliStream(int(config.get("COMPRESSION_BROTLI_QUALITY", 4)))
+    return _GzipStream(int(config.get("COMPRESSION_GZIP_LEVEL", 6)))
+
+
+def compress_bytes(data: bytes, encoding: str, config) -> bytes:
+    """Compress a complete body with the configured level for ``encoding``."""
+
+    if encoding == "br":
+        return brotli.compress(data, quality=int(config.get("COMPRESSION_BROTLI_QUALITY", 4)))
+    compressor = zlib.compressobj(int(config.get("COMPRESSION_GZIP_LEVEL", 6)), zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks: Iterable[bytes | str], encoding: str, config) -> Iterator[bytes]:
+    compressor = compressor_for(encoding, config)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """Return the best supported encoding the client accepts (``q=0`` excluded)."""
+
+    encoding = accept_encodings.best_match(available_encodings())
+    return encoding or None
+
+
+def _is_compressible(response: Response, config) -> bool:
+    if response.mimetype not in set(config.get("COMPRESSION_MIMETYPES") or DEFAULT_MIMETYPES):
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return False
+    return "no-transform" not in (response.headers.get("Cache-Control") or "")
+
+
+def compress_response(response: Response) -> Response:
+    """``after_request`` hook compressing ``response`` when the client accepts it."""
+
+    config = current_app.config
+    if request.method == "HEAD" or not _is_compressible(response, config):
+        return response
+
+    # Caches must key on Accept-Encoding even when this response stays uncompressed.
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, config)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < int(config.get("COMPRESSION_MIN_SIZE", 1024)):
+            return response
+        compressed = compress_bytes(body, encoding, config)
+        if len(compressed) >= len(body):
+            return response
+        response.set_data(compressed)
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The encoded body is no longer byte-identical to the strong validator.
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def register_response_compression(app: Flask) -> None:
+    """Install :func:`compress_response`; call before other ``after_request`` hooks."""
+
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+    app.after_request(compress_response)
+
+
+__all__ = [
+    "DEFAULT_MIMETYPES",
+    "available_encodings",
+    "compress_bytes",
+    "compress_response",
+    "negotiate_encoding",
+    "register_response_compression",
+]
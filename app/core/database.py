@@ -1,3 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from app.core.read_replica import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
@@ -0,0 +1,275 @@
+"""Engine and connection-pool configuration per process role, with telemetry.
+
+Web, Celery worker and beat processes have different connection needs, so
+``SQLALCHEMY_ENGINE_OPTIONS`` is derived from the ``DB_*`` settings resolved
+for ``ELITE_PROCESS_ROLE`` (see ``app/config.py``) on top of the role defaults
+below. With ``DB_PGBOUNCER_MODE`` the application keeps no pool of its own and
+sets nothing at session level, which is what PgBouncer's transaction pooling
+requires; the statement timeout is then applied per transaction.
+"""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.core.metrics.instruments import (
+    observe_pool_checkout,
+    record_pool_connect,
+    record_pool_timeout,
+    set_pool_state,
+)
+from app.core.read_replica import RoutingSession
+from app.logging.logger import get_logger
+from app.logging.sql import record_pool_wait
+
+_LOGGER = get_logger(__name__)
+
+PRIMARY_BIND = "primary"
+
+
+@dataclass(frozen=True)
+class PoolDefaults:
+    """Pool sizing used when the matching ``DB_*`` setting is unset."""
+
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    statement_timeout_ms: int
+    pool_recycle: int = 1800
+
+
+ROLE_DEFAULTS: Dict[str, PoolDefaults] = {
+    # Threads per web worker share one pool; overflow absorbs short bursts.
+    "web": PoolDefaults(pool_size=5, max_overflow=10, pool_timeout=10, statement_timeout_ms=15_000),
+    # Prefork children run one task at a time; broadcasts fan out across children.
+    "worker": PoolDefaults(pool_size=2, max_overflow=2, pool_timeout=30, statement_timeout_ms=120_000),
+    "beat": PoolDefaults(pool_size=1, max_overflow=0, pool_timeout=30, statement_timeout_ms=30_000),
+}
+
+# Engines that need ``SET LOCAL statement_timeout`` at the start of each transaction.
+_TRANSACTION_TIMEOUTS: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+_SESSION_HOOK_INSTALLED = False
+
+
+class TimedQueuePool(QueuePool):
+    """``QueuePool`` that reports how long each checkout waited."""
+
+    def __init__(
+        self,
+        creator,
+        metric_labels: Optional[Tuple[str, str]] = None,
+        wait_warning_ms: int = 0,
+        **kwargs,
+    ):
+        # Positional-or-keyword so create_engine() recognises them as pool arguments.
+        super().__init__(creator, **kwargs)
+        self.metric_labels = metric_labels
+        self.wait_warning_ms = wait_warning_ms
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.metric_labels = self.metric_labels
+        pool.wait_warning_ms = self.wait_warning_ms
+        return pool
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            self._report_timeout(perf_counter() - started)
+            raise
+        self._report_wait(perf_counter() - started)
+        return connection
+
+    def _report_wait(self, seconds: float) -> None:
+        if self.metric_labels is None:
+            return
+        role, bind = self.metric_labels
+        observe_pool_checkout(role, bind, seconds)
+        record_pool_wait(seconds * 1000)
+        if self.wait_warning_ms and seconds * 1000 >= self.wait_warning_ms:
+            _LOGGER.warning(
+                "Slow database connection checkout",
+                extra={"log_payload": {"event": "db_pool_slow_checkout", **self._state(seconds)}},
+            )
+
+    def _report_timeout(self, seconds: float) -> None:
+        if self.metric_labels is None:
+            return
+        role, bind = self.metric_labels
+        record_pool_timeout(role, bind)
+        record_pool_wait(seconds * 1000)
+        _LOGGER.error(
+            "Database connection pool exhausted",
+            extra={"log_payload": {"event": "db_pool_timeout", **self._state(seconds)}},
+        )
+
+    def _state(self, seconds: float) -> Dict[str, Any]:
+        role, bind = self.metric_labels or ("unknown", "unknown")
+        return {
+            "role": role,
+            "bind": bind,
+            "wait_ms": round(seconds * 1000, 2),
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+        }
+
+
+def _setting(config, key: str, default):
+    value = config.get(key)
+    return default if value is None else value
+
+
+def _statement_timeout_ms(config) -> int:
+    defaults = ROLE_DEFAULTS.get(config.get("PROCESS_ROLE") or "web", ROLE_DEFAULTS["web"])
+    return int(_setting(config, "DB_STATEMENT_TIMEOUT_MS", defaults.statement_timeout_ms))
+
+
+def build_engine_options(config, url, bind: str = PRIMARY_BIND) -> Dict[str, Any]:
+    """Return ``create_engine`` options for ``url`` under the current process role."""
+
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # Flask-SQLAlchemy pins in-memory SQLite to a StaticPool.
+        return {}
+
+    role = config.get("PROCESS_ROLE") or "web"
+    defaults = ROLE_DEFAULTS.get(role, ROLE_DEFAULTS["web"])
+    pgbouncer = bool(config.get("DB_PGBOUNCER_MODE")) and backend == "postgresql"
+    statement_timeout_ms = _statement_timeout_ms(config)
+
+    options: Dict[str, Any] = {}
+    if pgbouncer:
+        # PgBouncer owns pooling; a second pool would pin server connections.
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            metric_labels=(role, bind),
+            wait_warning_ms=int(config.get("DB_POOL_WAIT_WARNING_MS") or 0),
+            pool_size=int(_setting(config, "DB_POOL_SIZE", defaults.pool_size)),
+            max_overflow=int(_setting(config, "DB_MAX_OVERFLOW", defaults.max_overflow)),
+            pool_timeout=int(_setting(config, "DB_POOL_TIMEOUT", defaults.pool_timeout)),
+            pool_recycle=int(_setting(config, "DB_POOL_RECYCLE", defaults.pool_recycle)),
+            pool_pre_ping=bool(_setting(config, "DB_POOL_PRE_PING", True)),
+        )
+
+    if backend == "postgresql":
+        connect_args: Dict[str, Any] = {"application_name": f"elite-{role}"}
+        if pgbouncer:
+            if parsed.get_driver_name() == "psycopg":
+                # Server-side prepared statements do not survive transaction pooling.
+                connect_args["prepare_threshold"] = None
+        elif statement_timeout_ms > 0:
+            connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+        options["connect_args"] = connect_args
+    return options
+
+
+def configure_engine_options(app: Flask) -> None:
+    """Populate ``SQLALCHEMY_ENGINE_OPTIONS`` and bind options before ``db.init_app``.
+
+    Explicit ``SQLALCHEMY_ENGINE_OPTIONS`` entries win over the derived ones.
+    """
+
+    config = app.config
+    options = build_engine_options(config, config["SQLALCHEMY_DATABASE_URI"])
+    options.update(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    binds = {}
+    for key, value in (config.get("SQLALCHEMY_BINDS") or {}).items():
+        if isinstance(value, dict):
+            binds[key] = value
+        else:
+            binds[key] = {"url": value, **build_engine_options(config, value, bind=key)}
+    config["SQLALCHEMY_BINDS"] = binds
+
+
+def _apply_transaction_timeout(session, transaction, connection) -> None:
+    timeout_ms = _TRANSACTION_TIMEOUTS.get(connection.engine)
+    if timeout_ms:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def _watch_pool(engine, role: str, bind: str) -> None:
+    pool = engine.pool
+
+    def _publish(returning: int = 0) -> None:
+        current = engine.pool
+        if isinstance(current, QueuePool):
+            set_pool_state(
+                role,
+                bind,
+                size=current.size(),
+                checked_out=max(current.checkedout() - returning, 0),
+                overflow=current.overflow(),
+            )
+
+    def _on_checkout(*_args) -> None:
+        _publish()
+
+    def _on_checkin(*_args) -> None:
+        # "checkin" fires before the connection is back in the queue.
+        _publish(returning=1)
+
+    def _on_connect(*_args) -> None:
+        record_pool_connect(role, bind)
+
+    event.listen(pool, "connect", _on_connect)
+    event.listen(pool, "checkout", _on_checkout)
+    event.listen(pool, "checkin", _on_checkin)
+
+
+def instrument_engines(app: Flask, db) -> None:
+    """Attach pool telemetry and PgBouncer-mode timeouts to every engine of ``app``."""
+
+    global _SESSION_HOOK_INSTALLED
+    config = app.config
+    role = config.get("PROCESS_ROLE") or "web"
+    with app.app_context():
+        engines = dict(db.engines)
+    for key, engine in engines.items():
+        bind = key or PRIMARY_BIND
+        _watch_pool(engine, role, bind)
+        if isinstance(engine.pool, NullPool) and engine.dialect.name == "postgresql":
+            timeout_ms = _statement_timeout_ms(config)
+            if timeout_ms > 0:
+                _TRANSACTION_TIMEOUTS[engine] = timeout_ms
+    if _TRANSACTION_TIMEOUTS and not _SESSION_HOOK_INSTALLED:
+        event.listen(RoutingSession, "after_begin", _apply_transaction_timeout)
+        _SESSION_HOOK_INSTALLED = True
+    _LOGGER.info(
+        "Database engines configured",
+        extra={
+            "log_payload": {
+                "event": "db_engines_configured",
+                "role": role,
+                "pgbouncer_mode": bool(config.get("DB_PGBOUNCER_MODE")),
+                "binds": {
+                    (key or PRIMARY_BIND): type(engine.pool).__name__ for key, engine in engines.items()
+                },
+            }
+        },
+    )
+
+
+__all__ = [
+    "PoolDefaults",
+    "ROLE_DEFAULTS",
+    "TimedQueuePool",
+    "build_engine_options",
+    "configure_engine_options",
+    "instrument_engines",
+]
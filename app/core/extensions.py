@@ -1,11 +1,26 @@
+from typing import Any
+
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
-from flask_migrate import Migrate
 from flask_mail import Mail
 from celery import Celery
 
 login_manager = LoginManager()
 csrf = CSRFProtect()
-migrate = Migrate()
 mail = Mail()
 celery = Celery()
+
+_migrate = None
+
+
+def __getattr__(name: str) -> Any:
+    """Create ``migrate`` on first use; Flask-Migrate pulls in Alembic, which workers never need."""
+
+    global _migrate
+    if name == "migrate":
+        if _migrate is None:
+            from flask_migrate import Migrate
+
+            _migrate = Migrate()
+        return _migrate
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,218 @@
+"""Versioned cache for rendered template fragments.
+
+Templates wrap markup that only depends on a few values in a ``cache`` block::
+
+    {% cache 'offer-card', offer.id, offer.version %} ... {% endcache %}
+
+The rendered block is stored under the template name, the block's line and the
+given key parts, so a new ``version`` simply misses and the old entry ages out.
+Lookups go to a per-process LRU first and then, when ``FRAGMENT_CACHE_REDIS`` is
+on, to Redis so a freshly started worker reuses markup rendered elsewhere.
+A key part that is ``None`` or undefined disables caching for that call.
+
+Every key also carries a salt derived from the template source and the static
+asset manifest, so deploying a template change or new asset fingerprints never
+serves markup rendered by the previous release.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from jinja2.runtime import Undefined
+from markupsafe import Markup
+from redis.exceptions import RedisError
+
+import app as app_module
+from app.core.metrics.instruments import record_fragment_lookup, track_redis
+from app.logging.logger import get_logger
+
+_LOGGER = get_logger(__name__)
+
+KEY_PREFIX = "fragment"
+# After a Redis failure the cache stays in-process for this long.
+REDIS_RETRY_SECONDS = 30.0
+
+
+class FragmentCache:
+    """In-process LRU of rendered fragments with an optional Redis tier."""
+
+    def __init__(self, max_entries: int = 4096, *, use_redis: bool = True, ttl_seconds: int = 86400) -> None:
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._salts: Dict[str, Tuple[str, Optional[Callable[[], bool]]]] = {}
+        self._redis_retry_at = 0.0
+
+    def key(self, salt: str, template_name: str, lineno: int, parts: Iterable[object]) -> str:
+        joined = ":".join(str(part) for part in parts)
+        return f"{KEY_PREFIX}:{salt}:{template_name}:{lineno}:{joined}"
+
+    def get(self, key: str, fragment: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        if value is not None:
+            record_fragment_lookup(fragment, "memory")
+            return value
+
+        value = self._redis_get(key)
+        if value is not None:
+            self._remember(key, value)
+            record_fragment_lookup(fragment, "redis")
+            return value
+        record_fragment_lookup(fragment, "miss")
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        self._remember(key, value)
+        self._redis_set(key, value)
+
+    def get_or_render(self, key: str, fragment: str, render: Callable[[], str]) -> str:
+        value = self.get(key, fragment)
+        if value is None:
+            value = str(render())
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._salts.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _redis_client(self):
+        if not self.use_redis or monotonic() < self._redis_retry_at:
+            return None
+        return app_module.redis_client
+
+    def _redis_get(self, key: str) -> Optional[str]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            with track_redis("get"):
+                return client.get(key)
+        except RedisError as exc:
+            self._redis_failed(exc)
+            return None
+
+    def _redis_set(self, key: str, value: str) -> None:
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            with track_redis("set"):
+                client.set(key, value, ex=self.ttl_seconds)
+        except RedisError as exc:
+            self._redis_failed(exc)
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self._redis_retry_at = monotonic() + REDIS_RETRY_SECONDS
+        _LOGGER.warning(
+            "Fragment cache Redis tier unavailable",
+            extra={"log_payload": {"event": "fragment_cache_redis_unavailable", "error": str(exc)}},
+        )
+
+    def salt_for(self, app: Flask, template_name: str) -> str:
+        """Digest of the template source, static manifest and ``FRAGMENT_CACHE_SALT``."""
+
+        env = app.jinja_env
+        cached = self._salts.get(template_name)
+        if cached is not None:
+            salt, uptodate = cached
+            # With auto-reload on (development), edited templates get a new salt.
+            if not env.auto_reload or uptodate is None or uptodate():
+                return salt
+
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(str(app.config.get("FRAGMENT_CACHE_SALT") or "").encode())
+        source, _filename, uptodate = env.loader.get_source(env, template_name)
+        digest.update(source.encode("utf-8"))
+        manifest = app.extensions.get("static_manifest") or {}
+        for logical, hashed in sorted(manifest.items()):
+            digest.update(f"{logical}={hashed};".encode())
+        salt = digest.hexdigest()
+        self._salts[template_name] = (salt, uptodate)
+        return salt
+
+
+class FragmentCacheExtension(Extension):
+    """Jinja ``{% cache part, ... %}...{% endcache %}`` tag backed by :class:`FragmentCache`."""
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method(
+            "_render_cached",
+            [nodes.Const(parser.name), nodes.Const(lineno), nodes.List(parts)],
+        )
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, template_name: str, lineno: int, parts: list, caller) -> Markup:
+        cache = get_fragment_cache()
+        if cache is None or template_name is None or any(_is_missing(part) for part in parts):
+            return Markup(caller())
+        app = current_app._get_current_object()
+        key = cache.key(cache.salt_for(app, template_name), template_name, lineno, parts)
+        return Markup(cache.get_or_render(key, str(parts[0]), caller))
+
+
+def _is_missing(value: object) -> bool:
+    return value is None or isinstance(value, Undefined)
+
+
+def get_fragment_cache() -> Optional[FragmentCache]:
+    """Return the current app's fragment cache, or ``None`` when it is disabled."""
+
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("fragment_cache")
+
+
+def init_fragment_cache(app: Flask) -> None:
+    """Register the ``cache`` tag and, when enabled, the app's :class:`FragmentCache`.
+
+    The tag is always registered so templates compile with caching disabled.
+    """
+
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    if not app.config.get("FRAGMENT_CACHE_ENABLED", True):
+        return
+    app.extensions["fragment_cache"] = FragmentCache(
+        int(app.config.get("FRAGMENT_CACHE_MAX_ENTRIES", 4096)),
+        use_redis=bool(app.config.get("FRAGMENT_CACHE_REDIS", True)),
+        ttl_seconds=int(app.config.get("FRAGMENT_CACHE_TTL_SECONDS", 86400)),
+    )
+
+
+__all__ = [
+    "FragmentCache",
+    "FragmentCacheExtension",
+    "get_fragment_cache",
+    "init_fragment_cache",
+]
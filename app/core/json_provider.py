@@ -0,0 +1,169 @@
+"""JSON encoding backed by ``orjson`` when it is installed, stdlib otherwise.
+
+``app.json`` (``jsonify``, ``request.get_json``, ``response.get_json``), the
+structured log formatter and the Redis payload helpers all encode through this
+module. ``JSON_BACKEND`` selects ``orjson``, ``stdlib`` or ``auto`` (orjson if
+importable). Both backends write datetimes and dates as ISO 8601 strings and
+emit UTF-8 rather than ``\\uXXXX`` escapes; values orjson rejects (integers
+beyond 64 bits, unsupported option combinations) are retried with stdlib so
+the output never depends on which backend is active.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Optional
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+BACKENDS = ("auto", "orjson", "stdlib")
+
+_use_orjson = orjson is not None
+
+
+def _default(value: Any) -> Any:
+    """Encode the types stdlib ``json`` does not know (orjson handles most natively)."""
+
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def set_backend(name: str) -> str:
+    """Select the process-wide backend and return the one actually in use."""
+
+    global _use_orjson
+    if name not in BACKENDS:
+        raise ValueError(f"JSON_BACKEND must be one of {', '.join(BACKENDS)}, got {name!r}")
+    _use_orjson = orjson is not None and name != "stdlib"
+    return active_backend()
+
+
+def active_backend() -> str:
+    return "orjson" if _use_orjson else "stdlib"
+
+
+def _orjson_options(sort_keys: bool, indent: bool) -> int:
+    options = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        options |= orjson.OPT_SORT_KEYS
+    if indent:
+        options |= orjson.OPT_INDENT_2
+    return options
+
+
+def dumps_bytes(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON bytes."""
+
+    if _use_orjson:
+        try:
+            return orjson.dumps(obj, default=_default, option=_orjson_options(sort_keys, indent))
+        except TypeError:
+            pass  # orjson.JSONEncodeError; stdlib either encodes it or raises the real error
+    return _stdlib_dumps(obj, sort_keys=sort_keys, indent=indent).encode("utf-8")
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> str:
+    """Encode ``obj`` as a JSON string."""
+
+    if _use_orjson:
+        try:
+            return orjson.dumps(obj, default=_default, option=_orjson_options(sort_keys, indent)).decode("utf-8")
+        except TypeError:
+            pass
+    return _stdlib_dumps(obj, sort_keys=sort_keys, indent=indent)
+
+
+def _stdlib_dumps(obj: Any, *, sort_keys: bool, indent: bool) -> str:
+    return json.dumps(
+        obj,
+        default=_default,
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    )
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """Decode a JSON document."""
+
+    if _use_orjson:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass  # orjson rejects NaN/Infinity, which stdlib accepts
+    return json.loads(data)
+
+
+class EliteJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that routes through :func:`dumps` and :func:`loads`.
+
+    Keeps ``DefaultJSONProvider``'s ``sort_keys`` and debug pretty-printing;
+    calls with extra ``json`` keyword arguments use the stdlib path unchanged.
+    """
+
+    ensure_ascii = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            kwargs.setdefault("default", _default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = bool(self.compact is False or (self.compact is None and self._app.debug))
+        response = self._app.response_class(
+            dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent),
+            mimetype=self.mimetype,
+        )
+        # Lets the request logger reuse the payload instead of re-parsing the body.
+        response.elite_json_body = obj
+        return response
+
+
+def install_json_provider(app: Flask, backend: Optional[str] = None) -> str:
+    """Install :class:`EliteJSONProvider` as ``app.json`` and return the backend name."""
+
+    name = set_backend(backend or app.config.get("JSON_BACKEND") or "auto")
+    app.json_provider_class = EliteJSONProvider
+    app.json = EliteJSONProvider(app)
+    return name
+
+
+__all__ = [
+    "BACKENDS",
+    "EliteJSONProvider",
+    "active_backend",
+    "dumps",
+    "dumps_bytes",
+    "install_json_provider",
+    "loads",
+    "set_backend",
+]
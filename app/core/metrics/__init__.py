@@ -0,0 +1,23 @@
+"""In-process metrics registry exposed in the Prometheus text format."""
+
+from .instruments import (
+    observe_query,
+    observe_request,
+    record_usage_attempt,
+    register_celery_metrics,
+    track_redis,
+)
+from .registry import REGISTRY, Counter, Gauge, Histogram, MetricsRegistry
+
+__all__ = [
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "observe_query",
+    "observe_request",
+    "record_usage_attempt",
+    "register_celery_metrics",
+    "track_redis",
+]
@@ -0,0 +1,246 @@
+"""ELITE metric definitions and the hooks that feed them."""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterator
+
+from .registry import REGISTRY
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "elite_http_requests_total",
+    "HTTP requests handled, by endpoint, method and status.",
+    ("endpoint", "method", "status"),
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "elite_http_request_duration_seconds",
+    "End-to-end request latency measured by the logging middleware.",
+    ("endpoint", "method", "status"),
+)
+DB_QUERIES = REGISTRY.histogram(
+    "elite_db_query_duration_seconds",
+    "SQL statement execution time, by statement verb.",
+    ("operation",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+REDIS_CALLS = REGISTRY.histogram(
+    "elite_redis_command_duration_seconds",
+    "Redis command latency, by command.",
+    ("command",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+REDIS_ERRORS = REGISTRY.counter(
+    "elite_redis_errors_total",
+    "Redis commands that raised, by command.",
+    ("command",),
+)
+CELERY_TASKS = REGISTRY.histogram(
+    "elite_celery_task_duration_seconds",
+    "Celery task run time, by task name and final state.",
+    ("task", "state"),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+USAGE_CODE_ATTEMPTS = REGISTRY.counter(
+    "elite_usage_code_attempts_total",
+    "Usage-code redemption attempts, by verification result.",
+    ("result",),
+)
+DB_REPLICA_LAG = REGISTRY.gauge(
+    "elite_db_replica_lag_seconds",
+    "Replication lag last measured on the read replica.",
+    multiprocess_mode="max",
+)
+DB_REPLICA_FALLBACKS = REGISTRY.counter(
+    "elite_db_replica_fallbacks_total",
+    "Replica-eligible reads sent to the primary, by reason.",
+    ("reason",),
+)
+DB_POOL_SIZE = REGISTRY.gauge(
+    "elite_db_pool_size",
+    "Configured persistent connections per pool, by process role and bind.",
+    ("role", "bind"),
+)
+DB_POOL_CHECKED_OUT = REGISTRY.gauge(
+    "elite_db_pool_checked_out",
+    "Connections currently checked out of the pool, by process role and bind.",
+    ("role", "bind"),
+)
+DB_POOL_OVERFLOW = REGISTRY.gauge(
+    "elite_db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is still filling).",
+    ("role", "bind"),
+)
+DB_POOL_CONNECTIONS = REGISTRY.counter(
+    "elite_db_pool_connections_opened_total",
+    "New DBAPI connections opened by the pool, by process role and bind.",
+    ("role", "bind"),
+)
+DB_POOL_WAIT = REGISTRY.histogram(
+    "elite_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, by process role and bind.",
+    ("role", "bind"),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_TIMEOUTS = REGISTRY.counter(
+    "elite_db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout, by process role and bind.",
+    ("role", "bind"),
+)
+FRAGMENT_CACHE_LOOKUPS = REGISTRY.counter(
+    "elite_fragment_cache_lookups_total",
+    "Template fragment cache lookups, by fragment and result (memory, redis, miss).",
+    ("fragment", "result"),
+)
+OUTBOX_DELIVERIES = REGISTRY.counter(
+    "elite_outbox_deliveries_total",
+    "Outbox delivery attempts, by message kind and result (sent, retry, failed).",
+    ("kind", "result"),
+)
+OUTBOX_DELIVERY_LAG = REGISTRY.histogram(
+    "elite_outbox_delivery_lag_seconds",
+    "Time from enqueueing an outbox message to its successful delivery, by kind.",
+    ("kind",),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+RETENTION_ROWS = REGISTRY.counter(
+    "elite_retention_rows_total",
+    "Rows reclaimed by retention sweeps, by policy and action (deleted, archived).",
+    ("policy", "action"),
+)
+RETENTION_BATCH_SECONDS = REGISTRY.histogram(
+    "elite_retention_batch_seconds",
+    "Duration of one retention batch (select, archive, delete, commit), by policy.",
+    ("policy",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+_SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK"})
+
+
+def observe_request(endpoint: str | None, method: str, status: int, duration_seconds: float) -> None:
+    labels = {"endpoint": endpoint or "unmatched", "method": method, "status": str(status)}
+    HTTP_REQUESTS.inc(**labels)
+    HTTP_LATENCY.observe(duration_seconds, **labels)
+
+
+def observe_query(statement: str, duration_seconds: float) -> None:
+    verb = (statement or "").lstrip().split(None, 1)
+    operation = verb[0].upper() if verb else ""
+    DB_QUERIES.observe(duration_seconds, operation=operation if operation in _SQL_OPERATIONS else "OTHER")
+
+
+def record_usage_attempt(result: str) -> None:
+    USAGE_CODE_ATTEMPTS.inc(result=result or "unknown")
+
+
+def observe_pool_checkout(role: str, bind: str, wait_seconds: float) -> None:
+    DB_POOL_WAIT.observe(wait_seconds, role=role, bind=bind)
+
+
+def record_pool_timeout(role: str, bind: str) -> None:
+    DB_POOL_TIMEOUTS.inc(role=role, bind=bind)
+
+
+def record_pool_connect(role: str, bind: str) -> None:
+    DB_POOL_CONNECTIONS.inc(role=role, bind=bind)
+
+
+def set_pool_state(role: str, bind: str, *, size: int, checked_out: int, overflow: int) -> None:
+    DB_POOL_SIZE.set(size, role=role, bind=bind)
+    DB_POOL_CHECKED_OUT.set(checked_out, role=role, bind=bind)
+    DB_POOL_OVERFLOW.set(overflow, role=role, bind=bind)
+
+
+def record_fragment_lookup(fragment: str, result: str) -> None:
+    FRAGMENT_CACHE_LOOKUPS.inc(fragment=fragment, result=result)
+
+
+def record_outbox_delivery(kind: str, result: str, lag_seconds: float | None = None) -> None:
+    OUTBOX_DELIVERIES.inc(kind=kind, result=result)
+    if lag_seconds is not None:
+        OUTBOX_DELIVERY_LAG.observe(max(lag_seconds, 0.0), kind=kind)
+
+
+def record_retention_batch(policy: str, *, deleted: int, archived: int, duration_seconds: float) -> None:
+    RETENTION_ROWS.inc(deleted, policy=policy, action="deleted")
+    if archived:
+        RETENTION_ROWS.inc(archived, policy=policy, action="archived")
+    RETENTION_BATCH_SECONDS.observe(duration_seconds, policy=policy)
+
+
+def set_replica_lag(seconds: float) -> None:
+    DB_REPLICA_LAG.set(seconds)
+
+
+def record_replica_fallback(reason: str) -> None:
+    DB_REPLICA_FALLBACKS.inc(reason=reason)
+
+
+@contextmanager
+def track_redis(command: str) -> Iterator[None]:
+    """Time a Redis call; failures are counted and re-raised."""
+
+    started = perf_counter()
+    try:
+        yield
+    except Exception:
+        REDIS_ERRORS.inc(command=command)
+        raise
+    finally:
+        REDIS_CALLS.observe(perf_counter() - started, command=command)
+
+
+_task_started: Dict[str, float] = {}
+_task_lock = threading.Lock()
+_celery_hooks_installed = False
+
+
+def _on_task_prerun(task_id=None, task=None, **_kwargs) -> None:
+    if task_id:
+        with _task_lock:
+            _task_started[task_id] = perf_counter()
+
+
+def _on_task_postrun(task_id=None, task=None, state=None, **_kwargs) -> None:
+    with _task_lock:
+        started = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    CELERY_TASKS.observe(
+        perf_counter() - started,
+        task=getattr(task, "name", None) or "unknown",
+        state=state or "UNKNOWN",
+    )
+
+
+def register_celery_metrics() -> None:
+    """Connect Celery task signals to the task duration histogram (idempotent)."""
+
+    global _celery_hooks_installed
+    if _celery_hooks_installed:
+        return
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(_on_task_prerun, weak=False)
+    task_postrun.connect(_on_task_postrun, weak=False)
+    _celery_hooks_installed = True
+
+
+__all__ = [
+    "observe_pool_checkout",
+    "observe_query",
+    "observe_request",
+    "record_fragment_lookup",
+    "record_outbox_delivery",
+    "record_pool_connect",
+    "record_pool_timeout",
+    "record_replica_fallback",
+    "record_retention_batch",
+    "record_usage_attempt",
+    "register_celery_metrics",
+    "set_pool_state",
+    "set_replica_lag",
+    "track_redis",
+]
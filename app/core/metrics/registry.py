@@ -0,0 +1,554 @@
+"""Thread-safe counters, gauges and histograms with Prometheus text rendering.
+
+Values live in process memory. When ``METRICS_MULTIPROC_DIR`` is configured
+(gunicorn/Celery with several worker processes) every process also writes a
+JSON snapshot of its values to ``<dir>/metrics_<pid>.json`` at most once per
+``METRICS_FLUSH_INTERVAL`` seconds; rendering merges the live values of the
+current process with the snapshots of every other process.
+
+Counters and histograms of exited processes are folded into a single
+``metrics_aggregate.json`` and their per-PID file is removed, so totals stay
+cumulative without one file per recycled worker; gauges of exited processes
+are dropped. A process that finds its PID's file written by an earlier
+process folds that file in before overwriting it. :func:`clear_multiproc_dir`
+empties the directory and belongs in the process manager's start-up hook
+(see ``gunicorn.conf.py``).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+GAUGE_MODES = ("livesum", "max", "liveall")
+
+try:  # pragma: no cover - POSIX only; without it compaction is best effort
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+_SNAPSHOT_PREFIX = "metrics_"
+_SNAPSHOT_SUFFIX = ".json"
+_AGGREGATE_NAME = f"{_SNAPSHOT_PREFIX}aggregate{_SNAPSHOT_SUFFIX}"
+_LOCK_NAME = ".metrics.lock"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _pid_is_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _Metric:
+    """Base class holding label handling and the per-label value map."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._values: Dict[LabelValues, object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(sorted(labels))}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _reset(self) -> None:
+        self._values = {}
+
+    def _export(self) -> List[list]:
+        """Return ``[[label values], value]`` pairs safe to serialise or merge."""
+
+        return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts.")
+        key = self._key(labels)
+        with self._registry.lock:
+            self._registry._check_fork()
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self._registry._maybe_flush()
+
+
+class Gauge(_Metric):
+    """Value that can go up and down; ``multiprocess_mode`` controls merging."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, multiprocess_mode: str = "livesum", **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if multiprocess_mode not in GAUGE_MODES:
+            raise ValueError(f"Unsupported gauge multiprocess_mode: {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._registry.lock:
+            self._registry._check_fork()
+            self._values[key] = float(value)
+        self._registry._maybe_flush()
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._registry.lock:
+            self._registry._check_fork()
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self._registry._maybe_flush()
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed upper-bound buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        bounds = sorted(float(bound) for bound in buckets)
+        if not bounds or bounds[-1] != math.inf:
+            bounds.append(math.inf)
+        self.buckets: Tuple[float, ...] = tuple(bounds)
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = len(self.buckets) - 1
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._registry.lock:
+            self._registry._check_fork()
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts (non-cumulative), sum, count]
+                state = [[0] * len(self.buckets), 0.0, 0]
+                self._values[key] = state
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+        self._registry._maybe_flush()
+
+    def _export(self) -> List[list]:
+        return [[list(key), [list(state[0]), state[1], state[2]]] for key, state in self._values.items()]
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._owner_pid = os.getpid()
+        self._instance = uuid.uuid4().hex
+        self._multiproc_dir: Optional[str] = None
+        self._flush_interval = 5.0
+        self._last_flush = 0.0
+        self._atexit_registered = False
+
+    # -- registration -------------------------------------------------
+    def _register(self, metric_cls, name: str, documentation: str, labelnames, **kwargs) -> _Metric:
+        with self.lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, metric_cls) or existing.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} already registered with a different shape.")
+                return existing
+            metric = metric_cls(self, name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        multiprocess_mode: str = "livesum",
+    ) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames, multiprocess_mode=multiprocess_mode)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    # -- multiprocess support ----------------------------------------
+    def configure(self, multiproc_dir: Optional[str], flush_interval: float = 5.0) -> None:
+        """Enable (or disable) the file-backed cross-process aggregation."""
+
+        with self.lock:
+            self._multiproc_dir = multiproc_dir or None
+            self._flush_interval = max(float(flush_interval), 0.0)
+            if self._multiproc_dir:
+                os.makedirs(self._multiproc_dir, exist_ok=True)
+                if not self._atexit_registered:
+                    atexit.register(self.flush)
+                    self._atexit_registered = True
+
+    def _check_fork(self) -> None:
+        """Drop values inherited from a parent process after ``fork``."""
+
+        pid = os.getpid()
+        if pid != self._owner_pid:
+            self._owner_pid = pid
+            self._instance = uuid.uuid4().hex
+            self._last_flush = 0.0
+            for metric in self._metrics.values():
+                metric._reset()
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self._multiproc_dir, f"{_SNAPSHOT_PREFIX}{pid}{_SNAPSHOT_SUFFIX}")
+
+    def _maybe_flush(self) -> None:
+        if not self._multiproc_dir:
+            return
+        if time.monotonic() - self._last_flush < self._flush_interval:
+            return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write this process's values to its snapshot file (atomic replace)."""
+
+        if not self._multiproc_dir:
+            return
+        with self.lock:
+            self._check_fork()
+            self._last_flush = time.monotonic()
+            payload = {
+                "pid": self._owner_pid,
+                "instance": self._instance,
+                "kinds": {name: metric.kind for name, metric in self._metrics.items()},
+                "metrics": {name: metric._export() for name, metric in self._metrics.items()},
+            }
+            path = self._snapshot_path(self._owner_pid)
+            try:
+                with self._directory_lock():
+                    previous = _read_snapshot(path)
+                    if previous is not None and previous.get("instance") != self._instance:
+                        # The PID was reused: keep the earlier process's totals.
+                        self._fold_into_aggregate([previous])
+                    _write_json(path, payload)
+            except OSError:
+                return
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Fold an exited process's snapshot into the aggregate (e.g. gunicorn ``child_exit``)."""
+
+        if not self._multiproc_dir:
+            return
+        path = self._snapshot_path(pid)
+        try:
+            with self._directory_lock():
+                snapshot = _read_snapshot(path)
+                if snapshot is not None:
+                    self._fold_into_aggregate([snapshot])
+                    os.remove(path)
+        except OSError:
+            return
+
+    def _compact_dead_snapshots(self, names: List[str]) -> List[str]:
+        """Fold snapshots of exited processes into the aggregate (lock held); return what is left."""
+
+        dead = [name for name in names if name != _AGGREGATE_NAME and not _pid_is_alive(_pid_from_name(name))]
+        if not dead:
+            return names
+        snapshots, paths = [], []
+        for name in dead:
+            path = os.path.join(self._multiproc_dir, name)
+            snapshot = _read_snapshot(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+            paths.append(path)
+        self._fold_into_aggregate(snapshots)
+        for path in paths:
+            os.remove(path)
+        remaining = [name for name in names if name not in dead]
+        if snapshots and _AGGREGATE_NAME not in remaining:
+            remaining.append(_AGGREGATE_NAME)
+        return remaining
+
+    def _fold_into_aggregate(self, snapshots: List[dict]) -> None:
+        """Add the counters and histograms of ``snapshots`` to the aggregate file (lock held)."""
+
+        if not snapshots:
+            return
+        # Works from the recorded kinds alone: the gunicorn master never imports the instruments.
+        path = os.path.join(self._multiproc_dir, _AGGREGATE_NAME)
+        kinds: Dict[str, str] = {}
+        merged: Dict[str, Dict[LabelValues, object]] = {}
+        for snapshot in [_read_snapshot(path) or {}] + snapshots:
+            snapshot_kinds = snapshot.get("kinds") or {}
+            for name, samples in (snapshot.get("metrics") or {}).items():
+                kind = snapshot_kinds.get(name)
+                if kind not in (Counter.kind, Histogram.kind):
+                    continue
+                kinds[name] = kind
+                target = merged.setdefault(name, {})
+                for raw_key, value in samples:
+                    _merge_sample(_KIND_PROTOTYPES[kind], target, tuple(raw_key), value)
+        _write_json(
+            path,
+            {
+                "pid": 0,
+                "kinds": kinds,
+                "metrics": {
+                    name: [[list(key), value] for key, value in samples.items()]
+                    for name, samples in merged.items()
+                },
+            },
+        )
+
+    def _directory_lock(self):
+        return _DirectoryLock(os.path.join(self._multiproc_dir, _LOCK_NAME))
+
+    def _snapshot_names(self) -> List[str]:
+        try:
+            names = os.listdir(self._multiproc_dir)
+        except OSError:
+            return []
+        return [
+            name
+            for name in names
+            if name == _AGGREGATE_NAME or _pid_from_name(name) > 0
+        ]
+
+    def _foreign_snapshots(self) -> List[dict]:
+        if not self._multiproc_dir:
+            return []
+        snapshots = []
+        own_name = os.path.basename(self._snapshot_path(self._owner_pid))
+        try:
+            # Under the lock so a concurrent fold is never seen half done.
+            with self._directory_lock():
+                for name in self._compact_dead_snapshots(self._snapshot_names()):
+                    snapshot = _read_snapshot(os.path.join(self._multiproc_dir, name))
+                    if snapshot is None:
+                        continue
+                    # Our own file only counts while it still holds a previous owner's totals.
+                    if name == own_name and snapshot.get("instance") == self._instance:
+                        continue
+                    snapshots.append(snapshot)
+        except OSError:
+            return []
+        return snapshots
+
+    # -- rendering ----------------------------------------------------
+    def _merged_values(self) -> Dict[str, Dict[LabelValues, object]]:
+        with self.lock:
+            self._check_fork()
+            local = {name: metric._export() for name, metric in self._metrics.items()}
+            own_pid = self._owner_pid
+
+        sources: List[Tuple[int, Dict[str, list]]] = [(own_pid, local)]
+        for snapshot in self._foreign_snapshots():
+            sources.append((int(snapshot.get("pid", 0)), snapshot.get("metrics") or {}))
+
+        merged: Dict[str, Dict[LabelValues, object]] = {name: {} for name in self._metrics}
+        for pid, metrics in sources:
+            for name, samples in metrics.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                if isinstance(metric, Gauge) and pid == own_pid and metrics is not local:
+                    continue  # a previous owner of this PID; its gauges are stale
+                is_live_gauge = isinstance(metric, Gauge) and metric.multiprocess_mode.startswith("live")
+                if is_live_gauge and pid != own_pid and not _pid_is_alive(pid):
+                    continue
+                target = merged[name]
+                for raw_key, value in samples:
+                    key = tuple(raw_key)
+                    if isinstance(metric, Gauge) and metric.multiprocess_mode == "liveall":
+                        key = key + (str(pid),)
+                    _merge_sample(metric, target, key, value)
+        return merged
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format (0.0.4)."""
+
+        merged = self._merged_values()
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            labelnames = metric.labelnames
+            if isinstance(metric, Gauge) and metric.multiprocess_mode == "liveall":
+                labelnames = labelnames + ("pid",)
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key in sorted(merged.get(name, {})):
+                value = merged[name][key]
+                if isinstance(metric, Histogram):
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(metric.buckets, counts):
+                        cumulative += bucket_count
+                        bucket_labels = _format_labels(
+                            labelnames + ("le",), key + (_format_value(bound),)
+                        )
+                        lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                    label_text = _format_labels(labelnames, key)
+                    lines.append(f"{name}_sum{label_text} {_format_value(total)}")
+                    lines.append(f"{name}_count{label_text} {_format_value(count)}")
+                else:
+                    lines.append(f"{name}{_format_labels(labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge_sample(metric: _Metric, target: Dict[LabelValues, object], key: LabelValues, value) -> None:
+    existing = target.get(key)
+    if isinstance(metric, Histogram):
+        counts, total, count = value
+        if existing is None or len(existing[0]) != len(counts):
+            target[key] = [list(counts), float(total), int(count)]
+            return
+        existing[0] = [left + right for left, right in zip(existing[0], counts)]
+        existing[1] += float(total)
+        existing[2] += int(count)
+        return
+    value = float(value)
+    if existing is None:
+        target[key] = value
+    elif isinstance(metric, Gauge) and metric.multiprocess_mode == "max":
+        target[key] = max(existing, value)
+    else:
+        target[key] = existing + value
+
+
+class _DirectoryLock:
+    """Exclusive ``flock`` serialising snapshot rewrites across processes."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._handle = None
+
+    def __enter__(self) -> "_DirectoryLock":
+        self._handle = open(self._path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._handle, fcntl.LOCK_UN)
+        self._handle.close()
+
+
+def _pid_from_name(name: str) -> int:
+    if not (name.startswith(_SNAPSHOT_PREFIX) and name.endswith(_SNAPSHOT_SUFFIX)):
+        return 0
+    digits = name[len(_SNAPSHOT_PREFIX):-len(_SNAPSHOT_SUFFIX)]
+    return int(digits) if digits.isdigit() else 0
+
+
+def _read_snapshot(path: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, payload: dict) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def clear_multiproc_dir(path: Optional[str]) -> None:
+    """Remove every snapshot in ``path``; call once when the process manager starts."""
+
+    if not path or not os.path.isdir(path):
+        return
+    for name in os.listdir(path):
+        if name.startswith(_SNAPSHOT_PREFIX):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                continue
+
+
+REGISTRY = MetricsRegistry()
+# Stand-ins telling _merge_sample how to add samples of a kind when folding snapshots.
+_KIND_PROTOTYPES = {
+    Counter.kind: Counter(REGISTRY, "_fold_counter", ""),
+    Histogram.kind: Histogram(REGISTRY, "_fold_histogram", ""),
+}
+
+
+__all__ = [
+    "Counter",
+    "DEFAULT_LATENCY_BUCKETS",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "clear_multiproc_dir",
+]
@@ -0,0 +1,38 @@
+"""Prometheus scrape endpoint."""
+
+from __future__ import annotations
+
+import hmac
+
+from flask import Blueprint, Response, current_app, request
+
+from app.services.access_control import admin_required
+
+from .registry import REGISTRY
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _render() -> Response:
+    response = Response(REGISTRY.render(), mimetype="text/plain")
+    response.headers["Content-Type"] = PROMETHEUS_CONTENT_TYPE
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@admin_required
+def _render_for_admin() -> Response:
+    return _render()
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics() -> Response:
+    """Expose metrics to admins or to scrapers holding ``METRICS_SCRAPE_TOKEN``."""
+
+    token = current_app.config.get("METRICS_SCRAPE_TOKEN")
+    header = request.headers.get("Authorization", "")
+    if token and header.startswith("Bearer ") and hmac.compare_digest(header[7:], token):
+        return _render()
+    return _render_for_admin()
@@ -1,5 +1,6 @@
 """Normalization utilities for shared use across the platform."""
 
+from .arabic_normalizer import build_search_document, normalize_arabic, tokenize_arabic
 from .url_normalizer import normalize_url
 
-__all__ = ["normalize_url"]
+__all__ = ["normalize_url", "normalize_arabic", "tokenize_arabic", "build_search_document"]
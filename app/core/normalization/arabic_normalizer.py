@@ -0,0 +1,57 @@
+"""Arabic-aware text normalization used for search documents and queries."""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, Optional
+
+# Harakat, Quranic annotation marks and the superscript alef.
+_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]")
+_TATWEEL = "\u0640"
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+_CHARACTER_MAP = str.maketrans(
+    {
+        "\u0622": "\u0627",  # alef with madda -> alef
+        "\u0623": "\u0627",  # alef with hamza above -> alef
+        "\u0625": "\u0627",  # alef with hamza below -> alef
+        "\u0671": "\u0627",  # alef wasla -> alef
+        "\u0624": "\u0648",  # waw with hamza -> waw
+        "\u0626": "\u064a",  # yeh with hamza -> yeh
+        "\u0649": "\u064a",  # alef maksura -> yeh
+        "\u0629": "\u0647",  # taa marbuta -> heh
+        "\u0621": None,  # standalone hamza
+        **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    }
+)
+
+
+def normalize_arabic(raw: Optional[str]) -> str:
+    """Fold Arabic spelling variants so equivalent words compare equal.
+
+    Diacritics and tatweel are removed, alef/hamza forms collapse to their bare
+    letters, taa marbuta becomes haa, Arabic-Indic digits become ASCII and
+    Latin text is lower-cased. Punctuation is replaced by single spaces.
+    """
+
+    if not raw:
+        return ""
+    value = _DIACRITICS.sub("", str(raw)).replace(_TATWEEL, "")
+    value = value.translate(_CHARACTER_MAP).casefold()
+    return _NON_WORD.sub(" ", value).strip()
+
+
+def tokenize_arabic(raw: Optional[str]) -> List[str]:
+    """Return the normalized word tokens contained in ``raw``."""
+
+    normalized = normalize_arabic(raw)
+    return normalized.split() if normalized else []
+
+
+def build_search_document(parts: Iterable[Optional[str]]) -> str:
+    """Join the normalized, non-empty ``parts`` into a single search document."""
+
+    return " ".join(value for value in (normalize_arabic(part) for part in parts) if value)
+
+
+__all__ = ["normalize_arabic", "tokenize_arabic", "build_search_document"]
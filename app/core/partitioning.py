@@ -0,0 +1,225 @@
+"""Monthly range partitions for append-only PostgreSQL tables.
+
+A partitioned parent is declared ``PARTITION BY RANGE (<timestamp column>)``
+and gets one child per calendar month named ``<table>_yYYYYmMM``, covering
+``[first of month, first of next month)``. PostgreSQL prunes children whose
+range cannot match a query's timestamp predicate, so window queries only
+read recent months, and old months can be detached or dropped without a
+bulk ``DELETE``.
+
+A ``DEFAULT`` partition named ``<table>_default`` catches rows for months
+that have no child yet, so inserts keep working if the job creating future
+months stops running. Creating a month moves that month's rows out of the
+default partition into the new child, and :func:`ensure_monthly_partitions`
+also creates every month still holding rows there.
+
+Every helper here is a no-op on other dialects (SQLite in development),
+where the same table is a plain heap.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterator, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+@dataclass(frozen=True)
+class MonthlyPartition:
+    name: str
+    month: date
+
+    @property
+    def upper_bound(self) -> date:
+        return add_months(self.month, 1)
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def iter_months(first: date, last: date) -> Iterator[date]:
+    """Yield the first day of every month from ``first`` to ``last`` inclusive."""
+
+    month, last = month_start(first), month_start(last)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def supports_partitioning(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def is_partitioned(connection: Connection, table: str) -> bool:
+    if not supports_partitioning(connection):
+        return False
+    return bool(
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def has_default_partition(connection: Connection, table: str) -> bool:
+    if not is_partitioned(connection, table):
+        return False
+    return bool(
+        connection.execute(
+            text(
+                "SELECT pt.partdefid <> 0 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def create_default_partition(connection: Connection, table: str) -> str | None:
+    """Create ``table``'s DEFAULT partition if it is missing; return its name."""
+
+    if not is_partitioned(connection, table):
+        return None
+    name = default_partition_name(table)
+    if not has_default_partition(connection, table):
+        connection.execute(text(f'CREATE TABLE "{name}" PARTITION OF "{table}" DEFAULT'))
+    return name
+
+
+def default_partition_months(connection: Connection, table: str, column: str) -> List[date]:
+    """Return the months that currently have rows in ``table``'s DEFAULT partition."""
+
+    if not has_default_partition(connection, table):
+        return []
+    rows = connection.execute(
+        text(
+            f'SELECT DISTINCT date_trunc(\'month\', "{column}")::date '
+            f'FROM "{default_partition_name(table)}" WHERE "{column}" IS NOT NULL'
+        )
+    ).scalars()
+    return sorted(rows)
+
+
+def list_monthly_partitions(connection: Connection, table: str) -> List[MonthlyPartition]:
+    """Return the attached monthly children of ``table``, oldest first."""
+
+    if not is_partitioned(connection, table):
+        return []
+    rows = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+        ),
+        {"table": table},
+    ).scalars()
+    partitions = []
+    for name in rows:
+        match = _PARTITION_SUFFIX.search(name)
+        if match and name == partition_name(table, date(int(match[1]), int(match[2]), 1)):
+            partitions.append(MonthlyPartition(name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda partition: partition.month)
+
+
+def create_monthly_partition(
+    connection: Connection, table: str, month: date, *, column: str = "created_at"
+) -> str:
+    """Create the child for ``month`` if it is missing and return its name.
+
+    Rows of that month sitting in the DEFAULT partition are moved into the new
+    child in the same transaction. PostgreSQL refuses to create a child whose
+    range still has rows in the default partition.
+    """
+
+    name = partition_name(table, month)
+    lower, upper = month_start(month), add_months(month_start(month), 1)
+    # Bounds are dates generated here, not user input; DDL cannot take bind parameters.
+    bounds = f"\"{column}\" >= '{lower.isoformat()}' AND \"{column}\" < '{upper.isoformat()}'"
+    stray_rows = has_default_partition(connection, table)
+    if stray_rows:
+        default = default_partition_name(table)
+        # Blocks inserts into the default partition until the move commits.
+        connection.execute(text(f'LOCK TABLE "{default}" IN SHARE ROW EXCLUSIVE MODE'))
+        connection.execute(
+            text(f'CREATE TEMPORARY TABLE "{name}_moving" AS SELECT * FROM "{default}" WHERE {bounds}')
+        )
+        connection.execute(text(f'DELETE FROM "{default}" WHERE {bounds}'))
+    connection.execute(
+        text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    )
+    if stray_rows:
+        connection.execute(text(f'INSERT INTO "{table}" SELECT * FROM "{name}_moving"'))
+        connection.execute(text(f'DROP TABLE "{name}_moving"'))
+    return name
+
+
+def ensure_monthly_partitions(
+    connection: Connection,
+    table: str,
+    *,
+    first: date | datetime,
+    last: date | datetime,
+    column: str = "created_at",
+) -> List[str]:
+    """Create every missing monthly child between ``first`` and ``last``; return the new names.
+
+    Months outside that range that have rows in the DEFAULT partition get
+    their child too, so stray rows never stay there longer than one run.
+    """
+
+    if not is_partitioned(connection, table):
+        return []
+    existing = {partition.month for partition in list_monthly_partitions(connection, table)}
+    months = set(iter_months(month_start(first), month_start(last)))
+    months.update(default_partition_months(connection, table, column))
+    created = []
+    for month in sorted(months - existing):
+        created.append(create_monthly_partition(connection, table, month, column=column))
+    return created
+
+
+__all__ = [
+    "MonthlyPartition",
+    "add_months",
+    "create_default_partition",
+    "create_monthly_partition",
+    "default_partition_months",
+    "default_partition_name",
+    "ensure_monthly_partitions",
+    "has_default_partition",
+    "is_partitioned",
+    "iter_months",
+    "list_monthly_partitions",
+    "month_start",
+    "partition_name",
+    "supports_partitioning",
+]
@@ -0,0 +1,226 @@
+"""Opt-in per-request cProfile hook with on-disk artifacts.
+
+Nothing is registered unless ``PROFILER_ENABLED`` is set, so the disabled
+path adds no per-request work. When enabled, a request is profiled if it is
+picked by ``PROFILER_SAMPLE_RATE`` or carries the ``X-Elite-Profile`` header
+/ ``_profile`` query flag. The flag is only honoured for admins: the user is
+resolved before profiling starts, and anyone else's request runs unprofiled.
+
+Each artifact is a ``<artifact_id>.prof`` file (loadable with ``pstats`` or
+snakeviz) plus a ``<artifact_id>.json`` summary with the top functions. The
+artifact id is the request id followed by a random suffix generated here:
+clients choose their ``X-Request-ID``, so it alone must not name a file.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import uuid
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, current_app, g, request
+
+from app.logging.logger import LOG_FILE_PATH, get_logger
+
+PROFILE_HEADER = "X-Elite-Profile"
+PROFILE_QUERY_FLAG = "_profile"
+_TOP_FUNCTIONS = 15
+_SAFE_REQUEST_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+# Request-id prefix kept in artifact ids; with "-" and 32 hex digits the id stays within 64 characters.
+_ARTIFACT_PREFIX_LENGTH = 31
+
+_LOGGER = get_logger(__name__)
+
+
+def profile_directory(app: Optional[Flask] = None) -> str:
+    app = app or current_app
+    return app.config.get("PROFILER_DIR") or str(LOG_FILE_PATH.parent / "profiles")
+
+
+def _flag_requested() -> bool:
+    if request.headers.get(PROFILE_HEADER, "").strip() in {"1", "true", "yes"}:
+        return True
+    return request.args.get(PROFILE_QUERY_FLAG, "").strip() in {"1", "true", "yes"}
+
+
+def _is_admin(user) -> bool:
+    role = str(getattr(user, "role", "") or "").strip().lower()
+    return role in {"admin", "superadmin"} and bool(getattr(user, "is_active", False))
+
+
+def _requesting_user():
+    """Return the request's user, resolving it when this hook runs before authentication."""
+
+    if "current_user" in g:
+        return g.current_user
+    from app.modules.members.services.member_roles_service import resolve_user_from_request
+
+    return resolve_user_from_request()
+
+
+def _top_functions(profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (_cc, ncalls, tottime, cumtime, _callers) in stats.stats.items():
+        rows.append(
+            {
+                "function": function,
+                "location": f"{filename}:{line}",
+                "calls": ncalls,
+                "own_ms": round(tottime * 1000, 3),
+                "cumulative_ms": round(cumtime * 1000, 3),
+            }
+        )
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:_TOP_FUNCTIONS]
+
+
+def _prune(directory: str, keep: int) -> None:
+    summaries = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in summaries[keep:]:
+        stem = entry.path[: -len(".json")]
+        for path in (entry.path, f"{stem}.prof"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _write_artifact(profiler: cProfile.Profile, duration_ms: float, status: int, trigger: str) -> None:
+    request_id = str(getattr(g, "request_id", "") or "")
+    if not _SAFE_REQUEST_ID.match(request_id):
+        return
+    artifact_id = f"{request_id[:_ARTIFACT_PREFIX_LENGTH]}-{uuid.uuid4().hex}"
+    directory = profile_directory()
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, artifact_id)
+    profiler.dump_stats(f"{stem}.prof")
+    summary = {
+        "artifact_id": artifact_id,
+        "request_id": request_id,
+        "path": request.path,
+        "method": request.method,
+        "endpoint": request.endpoint,
+        "status": status,
+        "duration_ms": round(duration_ms, 2),
+        "trigger": trigger,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "top_functions": _top_functions(profiler),
+    }
+    with open(f"{stem}.json", "w", encoding="utf-8") as handle:
+        json.dump(summary, handle, ensure_ascii=False)
+    _prune(directory, int(current_app.config.get("PROFILER_MAX_ARTIFACTS", 200)))
+    _LOGGER.info(
+        "request_profiled",
+        extra={
+            "log_payload": {
+                "event": "request_profiled",
+                "request_id": request_id,
+                "artifact_id": artifact_id,
+                "path": request.path,
+                "duration_ms": summary["duration_ms"],
+                "trigger": trigger,
+            }
+        },
+    )
+
+
+def list_profiles(limit: int = 50) -> List[Dict[str, Any]]:
+    """Return the newest profile summaries first."""
+
+    directory = profile_directory()
+    if not os.path.isdir(directory):
+        return []
+    entries = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    profiles = []
+    for entry in entries[:limit]:
+        try:
+            with open(entry.path, encoding="utf-8") as handle:
+                profiles.append(json.load(handle))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def profile_artifact_path(artifact_id: str) -> Optional[str]:
+    """Return the ``.prof`` path for ``artifact_id`` when it exists."""
+
+    if not _SAFE_REQUEST_ID.match(artifact_id or ""):
+        return None
+    path = os.path.join(profile_directory(), f"{artifact_id}.prof")
+    return path if os.path.isfile(path) else None
+
+
+def register_request_profiler(app: Flask) -> None:
+    """Install the profiling hooks when ``PROFILER_ENABLED`` is set."""
+
+    if not app.config.get("PROFILER_ENABLED", False):
+        return
+    if getattr(app, "_request_profiler_installed", False):
+        return
+    app._request_profiler_installed = True
+    sample_rate = float(app.config.get("PROFILER_SAMPLE_RATE", 0.0) or 0.0)
+
+    @app.before_request
+    def _start_profiler() -> None:
+        if _flag_requested():
+            # Only admins may opt a request in; anyone else would just pay the overhead.
+            if not _is_admin(_requesting_user()):
+                return
+            trigger = "flag"
+        elif sample_rate > 0 and random.random() < sample_rate:
+            trigger = "sample"
+        else:
+            return
+        profiler = cProfile.Profile()
+        g._request_profiler = (profiler, trigger, perf_counter())
+        profiler.enable()
+
+    @app.after_request
+    def _stop_profiler(response):
+        state = g.pop("_request_profiler", None)
+        if state is None:
+            return response
+        profiler, trigger, started = state
+        profiler.disable()
+        try:
+            _write_artifact(profiler, (perf_counter() - started) * 1000, response.status_code, trigger)
+        except OSError:
+            _LOGGER.warning(
+                "request_profile_write_failed",
+                extra={"log_payload": {"event": "request_profile_write_failed"}},
+                exc_info=True,
+            )
+        return response
+
+    @app.teardown_request
+    def _discard_profiler(_exc) -> None:
+        state = g.pop("_request_profiler", None)
+        if state is not None:
+            state[0].disable()
+
+
+__all__ = [
+    "PROFILE_HEADER",
+    "PROFILE_QUERY_FLAG",
+    "list_profiles",
+    "profile_artifact_path",
+    "profile_directory",
+    "register_request_profiler",
+]
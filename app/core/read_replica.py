@@ -0,0 +1,197 @@
+"""Route read-only ORM queries to an optional read replica.
+
+The replica is configured as the ``replica`` entry of ``SQLALCHEMY_BINDS``
+(``SQLALCHEMY_REPLICA_URI``). Code opts in with :func:`read_replica`; inside
+it, plain ``SELECT`` statements issued through ``db.session`` go to the
+replica while flushes, DML, ``SELECT ... FOR UPDATE`` and anything issued
+after the session has written stay on the primary. When the replica lags
+behind by more than the allowed staleness (or cannot be probed) queries fall
+back to the primary.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+from contextlib import contextmanager
+from time import monotonic
+from typing import Callable, Iterator, Optional, TypeVar
+
+from flask import current_app, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.selectable import CompoundSelect
+
+from app.core.metrics.instruments import record_replica_fallback, set_replica_lag
+from app.logging.logger import get_logger
+
+REPLICA_BIND_KEY = "replica"
+_WROTE_FLAG = "elite_wrote_to_primary"
+
+# Seconds the replica is behind the primary, or 0 when it is caught up.
+POSTGRES_LAG_QUERY = (
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+_LOGGER = get_logger(__name__)
+_F = TypeVar("_F", bound=Callable)
+
+_max_staleness: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "elite_read_replica_max_staleness", default=None
+)
+
+
+class _LagProbe:
+    """Per-process cache of the replica lag, refreshed at most every interval."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._lag: Optional[float] = None
+
+    def lag_seconds(self, engine, interval: float, query: Optional[str]) -> Optional[float]:
+        """Return the cached lag, or ``None`` when the replica is unreachable."""
+
+        with self._lock:
+            now = monotonic()
+            if self._checked_at is not None and now - self._checked_at < interval:
+                return self._lag
+            self._checked_at = now
+            self._lag = _measure_lag(engine, query)
+            return self._lag
+
+
+_PROBE = _LagProbe()
+
+
+def _measure_lag(engine, query: Optional[str]) -> Optional[float]:
+    if query is None and engine.dialect.name == "postgresql":
+        query = POSTGRES_LAG_QUERY
+    if not query:
+        return 0.0
+    try:
+        with engine.connect() as connection:
+            value = connection.execute(text(query)).scalar()
+    except Exception as exc:  # pragma: no cover - depends on replica availability
+        _LOGGER.warning(
+            "Read replica lag probe failed",
+            extra={"log_payload": {"event": "read_replica_probe_failed", "error": str(exc)}},
+        )
+        return None
+    lag = max(float(value or 0.0), 0.0)
+    set_replica_lag(lag)
+    return lag
+
+
+def _is_plain_select(clause) -> bool:
+    if isinstance(clause, Select):
+        return clause._for_update_arg is None
+    return isinstance(clause, CompoundSelect)
+
+
+class RoutingSession(Session):
+    """``db.session`` class that sends opted-in reads to the replica bind."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _max_staleness.get() is not None:
+            replica = self._replica_engine_for(clause)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_engine_for(self, clause):
+        engine = self._db.engines.get(REPLICA_BIND_KEY)
+        if engine is None:
+            return None
+        if self._flushing or not _is_plain_select(clause):
+            return None
+        if self.info.get(_WROTE_FLAG) or self.new or self.dirty or self.deleted:
+            record_replica_fallback("read_your_writes")
+            return None
+        if not replica_is_fresh(engine):
+            return None
+        return engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_primary_write(session, _flush_context) -> None:
+    # Replicas apply our own writes asynchronously; keep this session's later
+    # reads on the primary so it never reads behind itself.
+    session.info[_WROTE_FLAG] = True
+
+
+def replica_is_fresh(engine) -> bool:
+    """Return whether ``engine`` is within the current staleness budget."""
+
+    config = current_app.config if has_app_context() else {}
+    allowed = _max_staleness.get()
+    if allowed is None:
+        allowed = float(config.get("REPLICA_MAX_STALENESS_SECONDS", 30))
+    lag = _PROBE.lag_seconds(
+        engine,
+        float(config.get("REPLICA_LAG_CHECK_INTERVAL", 5)),
+        config.get("REPLICA_LAG_QUERY") or None,
+    )
+    if lag is None:
+        record_replica_fallback("unreachable")
+        return False
+    if lag > allowed:
+        record_replica_fallback("stale")
+        return False
+    return True
+
+
+@contextmanager
+def use_read_replica(max_staleness: Optional[float] = None) -> Iterator[None]:
+    """Route plain reads inside the block to the replica when one is configured.
+
+    ``max_staleness`` overrides ``REPLICA_MAX_STALENESS_SECONDS`` for the
+    block; nested blocks keep the strictest budget.
+    """
+
+    if max_staleness is None:
+        config = current_app.config if has_app_context() else {}
+        max_staleness = float(config.get("REPLICA_MAX_STALENESS_SECONDS", 30))
+    outer = _max_staleness.get()
+    if outer is not None:
+        max_staleness = min(outer, max_staleness)
+    token = _max_staleness.set(max_staleness)
+    try:
+        yield
+    finally:
+        _max_staleness.reset(token)
+
+
+def read_replica(func: Optional[_F] = None, *, max_staleness: Optional[float] = None):
+    """Decorate a read-only function so its queries may use the replica.
+
+    Usable bare (``@read_replica``) or with a staleness budget in seconds
+    (``@read_replica(max_staleness=300)``).
+    """
+
+    def decorator(inner: _F) -> _F:
+        @functools.wraps(inner)
+        def wrapper(*args, **kwargs):
+            with use_read_replica(max_staleness):
+                return inner(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+__all__ = [
+    "REPLICA_BIND_KEY",
+    "RoutingSession",
+    "read_replica",
+    "replica_is_fresh",
+    "use_read_replica",
+]
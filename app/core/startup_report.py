@@ -0,0 +1,153 @@
+"""Measure application start-up cost from ``python -X importtime`` output."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+_PROBE_MARKER = "ELITE_STARTUP_PROBE "
+
+FACTORIES = {"web": "create_app", "worker": "create_worker_app"}
+
+# Runs in a fresh interpreter so nothing is already imported.
+_PROBE_SOURCE = f"""
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+getattr(app, sys.argv[1])()
+finished = time.perf_counter()
+print({_PROBE_MARKER!r} + json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "factory_ms": (finished - imported) * 1000,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}}), flush=True)
+"""
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+@dataclass
+class StartupProfile:
+    """Import records plus wall time and memory of one factory start-up."""
+
+    factory: str
+    records: List[ImportRecord] = field(default_factory=list)
+    import_ms: float = 0.0
+    factory_ms: float = 0.0
+    max_rss_kb: int = 0
+    modules: int = 0
+
+    @property
+    def total_ms(self) -> float:
+        return self.import_ms + self.factory_ms
+
+    def matching(self, prefixes: Sequence[str] = ()) -> List[ImportRecord]:
+        if not prefixes:
+            return list(self.records)
+        return [
+            record
+            for record in self.records
+            if any(record.module == prefix or record.module.startswith(prefix + ".") for prefix in prefixes)
+        ]
+
+    def top_cumulative(self, limit: int, prefixes: Sequence[str] = ()) -> List[ImportRecord]:
+        return sorted(self.matching(prefixes), key=lambda record: -record.cumulative_us)[:limit]
+
+    def top_self(self, limit: int, prefixes: Sequence[str] = ()) -> List[ImportRecord]:
+        return sorted(self.matching(prefixes), key=lambda record: -record.self_us)[:limit]
+
+    def by_package(self, limit: int) -> List[tuple]:
+        totals: Dict[str, int] = defaultdict(int)
+        for record in self.records:
+            totals[record.package] += record.self_us
+        return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+    def to_dict(self, limit: int = 50) -> Dict[str, object]:
+        return {
+            "factory": self.factory,
+            "import_ms": round(self.import_ms, 1),
+            "factory_ms": round(self.factory_ms, 1),
+            "max_rss_kb": self.max_rss_kb,
+            "modules": self.modules,
+            "top_cumulative": [
+                {"module": record.module, "cumulative_ms": round(record.cumulative_us / 1000, 2)}
+                for record in self.top_cumulative(limit)
+            ],
+            "by_package": [
+                {"package": package, "self_ms": round(total / 1000, 2)} for package, total in self.by_package(limit)
+            ],
+        }
+
+
+def parse_importtime(lines: Iterable[str]) -> List[ImportRecord]:
+    """Parse ``-X importtime`` stderr lines, skipping the header and unrelated output."""
+
+    records = []
+    for line in lines:
+        match = _IMPORT_LINE.match(line.rstrip("\n"))
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(
+            ImportRecord(
+                module=module,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=len(indent) // 2,
+            )
+        )
+    return records
+
+
+def profile_startup(factory: str, project_root: str, python: Optional[str] = None) -> StartupProfile:
+    """Start the ``web`` or ``worker`` factory in a fresh interpreter and profile it."""
+
+    completed = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", _PROBE_SOURCE, FACTORIES[factory]],
+        cwd=project_root,
+        env={**os.environ, "PYTHONPATH": project_root},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    probe = next(
+        (line[len(_PROBE_MARKER):] for line in completed.stdout.splitlines() if line.startswith(_PROBE_MARKER)),
+        None,
+    )
+    if completed.returncode != 0 or probe is None:
+        tail = "\n".join(completed.stderr.strip().splitlines()[-15:])
+        raise RuntimeError(f"{FACTORIES[factory]}() failed to start:\n{tail}")
+
+    measurements = json.loads(probe)
+    return StartupProfile(
+        factory=factory,
+        records=parse_importtime(completed.stderr.splitlines()),
+        import_ms=measurements["import_ms"],
+        factory_ms=measurements["factory_ms"],
+        max_rss_kb=measurements["max_rss_kb"],
+        modules=measurements["modules"],
+    )
+
+
+__all__ = ["FACTORIES", "ImportRecord", "StartupProfile", "parse_importtime", "profile_startup"]
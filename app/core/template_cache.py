@@ -0,0 +1,163 @@
+"""Production template mode: fixed loader resolution, bytecode cache, precompilation.
+
+Templates live in several ``FileSystemLoader`` roots (members, companies,
+admin, core) plus the blueprint template folders, so a cold lookup stats the
+same name in every root until one matches. In production mode the loaders are
+flattened behind :class:`ResolvedNameLoader`, which remembers the root that
+served each name, auto-reload is off, compiled templates are persisted in a
+shared ``FileSystemBytecodeCache`` and every template is compiled once at
+startup (or at build time with ``flask elite-templates compile``).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from flask import Flask
+from jinja2 import BaseLoader, ChoiceLoader, FileSystemBytecodeCache, TemplateNotFound
+
+from app.logging.logger import get_logger
+
+_LOGGER = get_logger(__name__)
+
+TEMPLATE_EXTENSIONS = (".html", ".htm", ".txt", ".xml", ".j2")
+
+
+class ResolvedNameLoader(BaseLoader):
+    """Try ``loaders`` in order, remembering which one resolved each name."""
+
+    def __init__(self, loaders: List[BaseLoader]) -> None:
+        self.loaders = loaders
+        self._resolved: Dict[str, BaseLoader] = {}
+        self._lock = threading.Lock()
+
+    def get_source(self, environment, template):
+        loader = self._resolved.get(template)
+        if loader is not None:
+            try:
+                return loader.get_source(environment, template)
+            except TemplateNotFound:
+                with self._lock:
+                    self._resolved.pop(template, None)
+        for loader in self.loaders:
+            try:
+                source = loader.get_source(environment, template)
+            except TemplateNotFound:
+                continue
+            with self._lock:
+                self._resolved[template] = loader
+            return source
+        raise TemplateNotFound(template)
+
+    def list_templates(self) -> List[str]:
+        names = set()
+        for loader in self.loaders:
+            try:
+                names.update(loader.list_templates())
+            except TypeError:  # loaders that cannot enumerate their templates
+                continue
+        return sorted(names)
+
+    @property
+    def resolved(self) -> Dict[str, BaseLoader]:
+        return dict(self._resolved)
+
+
+@dataclass
+class CompileReport:
+    """Outcome of :func:`precompile_templates`."""
+
+    compiled: int = 0
+    seconds: float = 0.0
+    failures: Dict[str, str] = field(default_factory=dict)
+
+
+def _flatten(loader: Optional[BaseLoader]) -> List[BaseLoader]:
+    if loader is None:
+        return []
+    if isinstance(loader, ChoiceLoader):
+        flattened: List[BaseLoader] = []
+        for child in loader.loaders:
+            flattened.extend(_flatten(child))
+        return flattened
+    return [loader]
+
+
+def _app_loaders(app: Flask) -> List[BaseLoader]:
+    # Same precedence as Flask's DispatchingJinjaLoader: the app loader first,
+    # then each blueprint's template folder in registration order.
+    loaders = _flatten(app.jinja_loader)
+    for blueprint in app.iter_blueprints():
+        loaders.extend(_flatten(blueprint.jinja_loader))
+    return loaders
+
+
+def install_bytecode_cache(app: Flask, directory: Optional[str] = None) -> str:
+    """Attach a ``FileSystemBytecodeCache`` rooted at ``directory`` and return its path."""
+
+    directory = directory or app.config["TEMPLATE_BYTECODE_CACHE_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+    return directory
+
+
+def precompile_templates(app: Flask) -> CompileReport:
+    """Compile every template into the environment cache (and bytecode cache)."""
+
+    env = app.jinja_env
+    report = CompileReport()
+    started = perf_counter()
+    names = [name for name in env.list_templates() if name.endswith(TEMPLATE_EXTENSIONS)]
+    for name in names:
+        try:
+            env.get_template(name)
+        except Exception as exc:
+            report.failures[name] = f"{type(exc).__name__}: {exc}"
+        else:
+            report.compiled += 1
+    report.seconds = perf_counter() - started
+    return report
+
+
+def configure_template_mode(app: Flask) -> None:
+    """Enable production template mode when ``TEMPLATE_PRODUCTION_MODE`` is set.
+
+    Must run after every blueprint is registered so their template folders are
+    part of the resolved loader chain.
+    """
+
+    if not app.config.get("TEMPLATE_PRODUCTION_MODE", False):
+        return
+
+    app.config["TEMPLATES_AUTO_RELOAD"] = False
+    env = app.jinja_env
+    env.auto_reload = False
+    env.loader = ResolvedNameLoader(_app_loaders(app))
+    install_bytecode_cache(app)
+
+    if not app.config.get("TEMPLATE_PRECOMPILE_ON_STARTUP", True):
+        return
+    report = precompile_templates(app)
+    payload = {
+        "event": "templates_precompiled",
+        "compiled": report.compiled,
+        "duration_ms": round(report.seconds * 1000, 2),
+        "failures": report.failures,
+    }
+    if report.failures:
+        _LOGGER.warning("Some templates failed to precompile", extra={"log_payload": payload})
+    else:
+        _LOGGER.info("Templates precompiled", extra={"log_payload": payload})
+
+
+__all__ = [
+    "CompileReport",
+    "ResolvedNameLoader",
+    "configure_template_mode",
+    "install_bytecode_cache",
+    "precompile_templates",
+]
@@ -0,0 +1,57 @@
+"""Lazy, request-scoped values for the global template context.
+
+Context processors run for every ``render_template`` call, so anything
+expensive they return is wrapped in a proxy that is only evaluated when a
+template actually reads it, and then at most once per request.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from flask import g, has_request_context
+from werkzeug.local import LocalProxy
+
+_CACHE_ATTR = "_template_context_cache"
+
+_user_context_disabled: ContextVar[bool] = ContextVar("elite_user_context_disabled", default=False)
+
+
+def request_memo(key: str, factory: Callable[[], Any]) -> Any:
+    """Return ``factory()`` computed once per request and cached on ``g``."""
+
+    cache = g.setdefault(_CACHE_ATTR, {})
+    if key not in cache:
+        cache[key] = factory()
+    return cache[key]
+
+
+def lazy(key: str, factory: Callable[[], Any]) -> LocalProxy:
+    """Proxy that evaluates ``factory`` on first access through :func:`request_memo`."""
+
+    return LocalProxy(lambda: request_memo(key, factory))
+
+
+def user_context_enabled() -> bool:
+    """Whether templates rendered now should receive the member/partner/admin context.
+
+    Rendering outside a request (Celery tasks, CLI) and email bodies skip it.
+    """
+
+    return has_request_context() and not _user_context_disabled.get()
+
+
+@contextmanager
+def without_user_context() -> Iterator[None]:
+    """Render templates inside the block without the per-user context."""
+
+    token = _user_context_disabled.set(True)
+    try:
+        yield
+    finally:
+        _user_context_disabled.reset(token)
+
+
+__all__ = ["lazy", "request_memo", "user_context_enabled", "without_user_context"]
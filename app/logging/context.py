@@ -9,7 +9,9 @@ from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from flask import g, request
+from flask import current_app, g, request
+
+from .sql import QueryStats
 
 
 @dataclass
@@ -33,6 +35,7 @@ class LoggingContext:
     outgoing_payload: Dict[str, Any] = field(default_factory=dict)
     validation: Dict[str, Any] = field(default_factory=dict)
     normalization: List[Dict[str, Any]] = field(default_factory=list)
+    db: QueryStats = field(default_factory=QueryStats)
     finalized: bool = False
 
     def as_namespace(self) -> SimpleNamespace:
@@ -104,6 +107,9 @@ class LoggingContext:
             "breadcrumbs": self.breadcrumbs,
             "validation": self.validation,
             "timing": self.compute_timing(route_finished_at),
+            "database": self.db.to_payload(
+                int(current_app.config.get("SQL_REPEATED_STATEMENT_THRESHOLD", 5) or 0)
+            ),
             "response_status": int(response_status),
         }
         return payload
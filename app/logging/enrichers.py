@@ -60,11 +60,23 @@ def capture_incoming_request() -> dict[str, Any]:
 def capture_outgoing_response(response: Response) -> dict[str, Any]:
     """Capture response details for logging."""
 
-    json_body = None
-    try:
-        json_body = response.get_json(silent=True)
-    except Exception:
-        json_body = None
+    if response.direct_passthrough or response.is_streamed:
+        # File and streaming bodies must not be buffered just to be logged.
+        return {
+            "status_code": response.status_code,
+            "json": None,
+            "error": None,
+            "redirect": response.headers.get("Location"),
+            "response_size": response.content_length,
+        }
+
+    # Responses built by app.json carry the payload they were encoded from.
+    json_body = getattr(response, "elite_json_body", None)
+    if json_body is None:
+        try:
+            json_body = response.get_json(silent=True)
+        except Exception:
+            json_body = None
 
     error_payload = None
     if response.status_code >= 400:
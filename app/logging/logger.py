@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import re
 from datetime import datetime
@@ -12,6 +11,8 @@ from typing import Any
 
 from flask import Flask, g, has_request_context, request
 
+from app.core import json_provider
+
 _APP_LOGGER_NAME = "elite"
 _LOGGER_INITIALIZED = False
 _BASE_DIR = Path(__file__).resolve().parents[2]
@@ -109,7 +110,7 @@ class RequestAwareFormatter(logging.Formatter):
         payload = self._enrich_with_request(payload)
 
         if self.json_output:
-            return json.dumps(payload, ensure_ascii=False)
+            return json_provider.dumps(payload)
 
         color = _COLOR_MAP.get(record.levelname, "") if self.color else ""
         reset = _RESET_COLOR if color else ""
@@ -7,7 +7,7 @@ from http import HTTPStatus
 from time import perf_counter
 from uuid import uuid4
 
-from flask import Flask, Response, g, jsonify, request
+from flask import Flask, Response, current_app, g, jsonify, request
 from werkzeug.exceptions import HTTPException
 
 from .context import build_logging_context
@@ -18,7 +18,9 @@ from .enrichers import (
     snapshot_payload,
 )
 from .logger import get_logger
+from .sql import register_sql_instrumentation
 from app.core.cleaning.request_cleaner import extract_raw_data
+from app.core.metrics import observe_request
 from app.core.validation.validator import validate
 
 logger = get_logger()
@@ -52,6 +54,7 @@ def register_logging_middleware(app: Flask) -> None:
     if getattr(app, "_structured_logging_installed", False):
         return
     app._structured_logging_installed = True
+    register_sql_instrumentation()
 
     @app.before_request
     def _start_observation() -> None:
@@ -232,6 +235,38 @@ def _emit_final_log(ctx, status_code: int, *, level: str = "INFO") -> None:
         payload.pop("validation", None)
 
     logger.log(level_value, "request_cycle", extra={"log_payload": payload})
+    _emit_slow_request_log(payload)
+    observe_request(
+        request.endpoint,
+        request.method,
+        status_code,
+        (ctx.route_finished_at or perf_counter()) - ctx.started_at,
+    )
+
+
+def _emit_slow_request_log(payload: dict[str, object]) -> None:
+    """Log a dedicated record when the request exceeded the configured budget."""
+
+    threshold_ms = int(current_app.config.get("SLOW_REQUEST_THRESHOLD_MS", 0) or 0)
+    total_ms = (payload.get("timing") or {}).get("total_ms", 0)
+    if threshold_ms <= 0 or total_ms < threshold_ms:
+        return
+    logger.warning(
+        "slow_request",
+        extra={
+            "log_payload": {
+                "message": "slow_request",
+                "request_id": payload.get("request_id"),
+                "trace_id": payload.get("trace_id"),
+                "path": payload.get("path"),
+                "method": payload.get("method"),
+                "response_status": payload.get("response_status"),
+                "threshold_ms": threshold_ms,
+                "timing": payload.get("timing"),
+                "database": payload.get("database"),
+            }
+        },
+    )
 
 
 def __line__() -> int:
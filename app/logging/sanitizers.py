@@ -16,7 +16,7 @@ MASK = "***"
 
 
 def _is_sensitive(key: str) -> bool:
-    normalized = key.lower().replace("-", "_")
+    normalized = str(key).lower().replace("-", "_")
     return any(field in normalized for field in SENSITIVE_FIELDS)
 
 
@@ -0,0 +1,156 @@
+"""SQLAlchemy cursor hooks that feed per-request database statistics into logs."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import observe_query
+
+_START_STACK_KEY = "elite_query_started_at"
+_FINGERPRINT_MAX_LENGTH = 300
+_REPEATED_REPORT_LIMIT = 5
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMERIC_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_BIND_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SELECT_LIST = re.compile(r"^SELECT\s+.+?\s+FROM\s", re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+_HOOKS_INSTALLED = False
+
+
+def fingerprint_statement(statement: str) -> str:
+    """Return ``statement`` with literals, parameters and column lists collapsed.
+
+    Statements that differ only in bound values share a fingerprint, which is
+    what makes repeated per-row queries (N+1 patterns) countable.
+    """
+
+    value = _WHITESPACE.sub(" ", statement or "").strip()
+    value = _STRING_LITERAL.sub("?", value)
+    value = _BIND_PARAMETER.sub("?", value)
+    value = _NUMERIC_LITERAL.sub("?", value)
+    value = _PLACEHOLDER_LIST.sub("(?+)", value)
+    value = _SELECT_LIST.sub("SELECT … FROM ", value, count=1)
+    if len(value) > _FINGERPRINT_MAX_LENGTH:
+        value = value[: _FINGERPRINT_MAX_LENGTH - 1] + "…"
+    return value
+
+
+@dataclass
+class QueryStats:
+    """Aggregated SQL activity for a single request."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_fingerprint: Optional[str] = None
+    by_fingerprint: Dict[str, List[float]] = field(default_factory=dict)
+    pool_wait_ms: float = 0.0
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        fingerprint = fingerprint_statement(statement)
+        self.count += 1
+        self.total_ms += duration_ms
+        bucket = self.by_fingerprint.setdefault(fingerprint, [0, 0.0])
+        bucket[0] += 1
+        bucket[1] += duration_ms
+        if duration_ms >= self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_fingerprint = fingerprint
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """Return fingerprints executed at least ``threshold`` times, most frequent first."""
+
+        if threshold <= 0:
+            return []
+        offenders = [
+            {"fingerprint": fingerprint, "count": int(count), "total_ms": round(total, 2)}
+            for fingerprint, (count, total) in self.by_fingerprint.items()
+            if count >= threshold
+        ]
+        offenders.sort(key=lambda item: (-item["count"], -item["total_ms"]))
+        return offenders[:_REPEATED_REPORT_LIMIT]
+
+    def to_payload(self, repeated_threshold: int) -> Dict[str, Any]:
+        repeated = self.repeated(repeated_threshold)
+        return {
+            "query_count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "slowest": {
+                "fingerprint": self.slowest_fingerprint,
+                "duration_ms": round(self.slowest_ms, 2),
+            }
+            if self.slowest_fingerprint
+            else None,
+            "repeated_statements": repeated,
+            "n_plus_one_suspected": bool(repeated),
+            "pool_wait_ms": round(self.pool_wait_ms, 2),
+        }
+
+
+def _current_stats() -> Optional[QueryStats]:
+    if not has_request_context():
+        return None
+    ctx = getattr(g, "logging_context", None)
+    return getattr(ctx, "db", None)
+
+
+def record_pool_wait(duration_ms: float) -> None:
+    """Add time spent waiting for a pooled connection to the current request."""
+
+    stats = _current_stats()
+    if stats is not None:
+        stats.pool_wait_ms += duration_ms
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_START_STACK_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stack = conn.info.get(_START_STACK_KEY)
+    if not stack:
+        return
+    duration_ms = (perf_counter() - stack.pop()) * 1000
+    observe_query(statement, duration_ms / 1000)
+    stats = _current_stats()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+
+
+def _on_cursor_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is None:
+        return
+    stack = connection.info.get(_START_STACK_KEY)
+    if stack:
+        stack.pop()
+
+
+def register_sql_instrumentation() -> None:
+    """Attach the cursor timing hooks to every SQLAlchemy engine (idempotent)."""
+
+    global _HOOKS_INSTALLED
+    if _HOOKS_INSTALLED:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _on_cursor_error)
+    _HOOKS_INSTALLED = True
+
+
+__all__ = [
+    "QueryStats",
+    "fingerprint_statement",
+    "record_pool_wait",
+    "register_sql_instrumentation",
+]
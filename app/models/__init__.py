@@ -6,14 +6,17 @@ from .permission import Permission
 from .user import User
 from .company import Company
 from .offer import Offer, OfferClassification
+from .offer_feedback import OfferFeedback
 from .notification import Notification
 from .activity_log import ActivityLog
+from .redemption_event import RedemptionEvent
 from .lookup_choice import LookupChoice
 from .admin_setting import AdminSetting
 from .usage_code import UsageCode
 from .communication import Conversation, Message, Attachment
 from .sms_log import SMSLog
 from .verification_code import VerificationCode
+from .outbox_message import OutboxMessage
 
 __all__ = [
     "db",
@@ -21,9 +24,11 @@ __all__ = [
     "Company",
     "Offer",
     "OfferClassification",
+    "OfferFeedback",
     "Notification",
     "Permission",
     "ActivityLog",
+    "RedemptionEvent",
     "LookupChoice",
     "AdminSetting",
     "UsageCode",
@@ -32,4 +37,5 @@ __all__ = [
     "Attachment",
     "SMSLog",
     "VerificationCode",
+    "OutboxMessage",
 ]
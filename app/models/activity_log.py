@@ -33,32 +33,32 @@ class ActivityLog(db.Model):
         "User",
         foreign_keys=[admin_id],
         backref=db.backref("activity_logs", lazy="dynamic"),
-        lazy="joined",
+        lazy="select",
     )
     company = db.relationship(
         "Company",
         foreign_keys=[company_id],
         backref=db.backref("activity_logs", lazy="dynamic"),
-        lazy="joined",
+        lazy="select",
     )
     # ✅ Usage verification relationships
     member = db.relationship(
         "User",
         foreign_keys=[member_id],
         backref=db.backref("usage_attempts", lazy="dynamic"),
-        lazy="joined",
+        lazy="select",
     )
     partner = db.relationship(
         "Company",
         foreign_keys=[partner_id],
         backref=db.backref("usage_attempts", lazy="dynamic"),
-        lazy="joined",
+        lazy="select",
     )
     offer = db.relationship(
         "Offer",
         foreign_keys=[offer_id],
         backref=db.backref("usage_attempts", lazy="dynamic"),
-        lazy="joined",
+        lazy="select",
     )
 
     def __repr__(self) -> str:
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from sqlalchemy import event
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import validates
 
 from app.core.database import db
+from app.core.normalization import build_search_document
 
 
 def _safe_preferences(company: "Company") -> MutableDict:
@@ -31,18 +33,25 @@ class Company(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     owner_user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     logo_url = db.Column(db.String(255), nullable=True)
+    # Resized, metadata-free WebP/JPEG variants generated in the background.
+    logo_renditions = db.Column(db.JSON, nullable=True)
     notification_preferences = db.Column(
         MutableDict.as_mutable(db.JSON), default=dict, nullable=False
     )
     status = db.Column(db.String(20), default="pending", nullable=False)
     admin_notes = db.Column(db.Text, nullable=True)
+    # Lookup-backed facets used to filter and count offers in SQL.
+    city = db.Column(db.String(255), nullable=True, index=True)
+    industry = db.Column(db.String(255), nullable=True, index=True)
+    # Normalized name/industry text backing the trigram search index.
+    search_document = db.Column(db.Text, nullable=True)
 
     owner = db.relationship(
         "User",
         foreign_keys=[owner_user_id],
         backref=db.backref("owned_companies", lazy="dynamic"),
         cascade="all, delete-orphan",
-        lazy="joined",
+        lazy="select",
         passive_deletes=True,
         post_update=True,
         single_parent=True,
@@ -66,26 +75,6 @@ class Company(db.Model):
         prefs = _safe_preferences(self)
         prefs["contact_phone"] = value or None
 
-    @property
-    def city(self) -> str | None:
-        prefs = _safe_preferences(self)
-        return prefs.get("city")
-
-    @city.setter
-    def city(self, value: str | None) -> None:
-        prefs = _safe_preferences(self)
-        prefs["city"] = value or None
-
-    @property
-    def industry(self) -> str | None:
-        prefs = _safe_preferences(self)
-        return prefs.get("industry")
-
-    @industry.setter
-    def industry(self, value: str | None) -> None:
-        prefs = _safe_preferences(self)
-        prefs["industry"] = value or None
-
     @property
     def industry_icon(self) -> str | None:
         """Return the icon filename associated with the company's industry."""
@@ -148,6 +137,10 @@ class Company(db.Model):
         for user in user_records or []:
             user.is_active = active
 
+    @validates("city", "industry")
+    def _normalize_facet(self, key: str, value: str | None) -> str | None:
+        return (value or "").strip() or None
+
     @validates("status")
     def _normalize_status(self, key: str, value: str) -> str:
         normalized = (value or "").strip().lower()
@@ -165,4 +158,10 @@ class Company(db.Model):
         return f"<Company {self.name}>"
 
 
+@event.listens_for(Company, "before_insert")
+@event.listens_for(Company, "before_update")
+def _refresh_company_search_document(mapper, connection, target: Company) -> None:
+    target.search_document = build_search_document((target.name, target.industry))
+
+
 __all__ = ["Company"]
@@ -19,6 +19,7 @@ class Notification(db.Model):
     """
 
     __tablename__ = "notifications"
+    __table_args__ = (db.Index("ix_notifications_user_created", "user_id", "created_at"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
@@ -4,7 +4,11 @@ Key fields:
 - ``title`` and ``description``: Offer content details.
 """
 from datetime import datetime
+
+from sqlalchemy import event
+
 from app.core.database import db
+from app.core.normalization import build_search_document
 
 OFFER_CLASSIFICATION_TYPES = (
     "first_time_offer",
@@ -29,8 +33,12 @@ class Offer(db.Model):
     start_date = db.Column(db.DateTime, nullable=True)
     valid_until = db.Column(db.DateTime, nullable=True)
     image_url = db.Column(db.String(255), nullable=True)
+    # Resized, metadata-free WebP/JPEG variants generated in the background.
+    image_renditions = db.Column(db.JSON, nullable=True)
     company_id = db.Column(db.Integer, db.ForeignKey("companies.id"))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Normalized title/description text backing the trigram search index.
+    search_document = db.Column(db.Text, nullable=True)
 
     # Establish relationship with Company for easy access to related offers
     company = db.relationship("Company", backref="offers")
@@ -61,6 +69,12 @@ class Offer(db.Model):
         return [record.classification for record in self.classifications]
 
 
+@event.listens_for(Offer, "before_insert")
+@event.listens_for(Offer, "before_update")
+def _refresh_offer_search_document(mapper, connection, target: Offer) -> None:
+    target.search_document = build_search_document((target.title, target.description))
+
+
 class OfferClassification(db.Model):
     """Represents a single classification label attached to an offer."""
 
@@ -0,0 +1,46 @@
+"""Offer feedback fact table recording member interactions with offers."""
+
+from datetime import datetime
+
+from app.core.database import db
+
+
+class OfferFeedback(db.Model):
+    """Represents a single feedback event (like, share, note) left on an offer.
+
+    One row is stored per member interaction regardless of how many company
+    recipients are notified, so per-offer totals can be aggregated in SQL.
+    """
+
+    __tablename__ = "offer_feedback"
+
+    id = db.Column(db.Integer, primary_key=True)
+    offer_id = db.Column(
+        db.Integer,
+        db.ForeignKey("offers.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    company_id = db.Column(
+        db.Integer,
+        db.ForeignKey("companies.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    action = db.Column(db.String(20), nullable=False, default="like")
+    note = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_offer_feedback_offer_id_action", "offer_id", "action"),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"<OfferFeedback offer={self.offer_id} action={self.action}>"
+
+
+__all__ = ["OfferFeedback"]
@@ -0,0 +1,37 @@
+"""Outbox rows for side effects delivered after the business transaction commits."""
+
+from datetime import datetime
+
+from app.core.database import db
+
+
+class OutboxMessage(db.Model):
+    """An email, SMS or admin notification waiting for the outbox dispatcher.
+
+    Rows are added in the same transaction as the change that triggers them, so
+    a message exists exactly when that change was committed. ``status`` moves
+    from ``pending`` to ``processing`` (claimed, lease until ``next_attempt_at``)
+    and ends as ``sent`` or, after ``OUTBOX_MAX_ATTEMPTS``, ``failed``.
+    """
+
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        db.Index("ix_outbox_messages_status_next_attempt", "status", "next_attempt_at"),
+        db.Index("ix_outbox_messages_status_sent_at", "status", "sent_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"<OutboxMessage {self.id} {self.kind} {self.status}>"
+
+
+__all__ = ["OutboxMessage"]
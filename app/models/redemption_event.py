@@ -0,0 +1,57 @@
+"""Redemption ledger: usage-code verification attempts and applied incentives."""
+
+from datetime import datetime
+
+from app.core.database import db
+
+
+class RedemptionEvent(db.Model):
+    """One usage-code attempt (``kind="usage_code_attempt"``) or applied incentive.
+
+    Split out of ``activity_log`` so the high-volume ledger stays narrow. On
+    PostgreSQL the table is range-partitioned by month on ``created_at`` (the
+    primary key there is ``(id, created_at)``); always filter on ``created_at``
+    where the query allows it so old partitions are pruned.
+    """
+
+    __tablename__ = "redemption_events"
+    __table_args__ = (
+        db.Index("ix_redemption_events_kind_result_created", "kind", "result", "created_at"),
+        db.Index("ix_redemption_events_member_created", "member_id", "created_at"),
+        db.Index("ix_redemption_events_partner_created", "partner_id", "created_at"),
+        db.Index("ix_redemption_events_offer_member", "offer_id", "member_id"),
+    )
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    member_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    partner_id = db.Column(db.Integer, db.ForeignKey("companies.id", ondelete="SET NULL"), nullable=True)
+    offer_id = db.Column(db.Integer, db.ForeignKey("offers.id", ondelete="SET NULL"), nullable=True)
+    code_used = db.Column(db.String(8), nullable=True)
+    result = db.Column(db.String(32), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    member = db.relationship(
+        "User",
+        foreign_keys=[member_id],
+        backref=db.backref("redemption_events", lazy="dynamic"),
+        lazy="select",
+    )
+    partner = db.relationship(
+        "Company",
+        foreign_keys=[partner_id],
+        backref=db.backref("redemption_events", lazy="dynamic"),
+        lazy="select",
+    )
+    offer = db.relationship(
+        "Offer",
+        foreign_keys=[offer_id],
+        backref=db.backref("redemption_events", lazy="dynamic"),
+        lazy="select",
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"<RedemptionEvent {self.kind} {self.result} member={self.member_id} partner={self.partner_id}>"
+
+
+__all__ = ["RedemptionEvent"]
@@ -12,7 +12,7 @@ class SMSLog(db.Model):
     message_id = db.Column(db.String(50), nullable=True)
     cost = db.Column(db.String(20), nullable=True)
     currency = db.Column(db.String(10), nullable=True)
-    sent_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Optional: Link to user if available
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
@@ -9,12 +9,13 @@ class UsageCode(db.Model):
     """Represents a short-lived verification code issued by a partner."""
 
     __tablename__ = "usage_codes"
+    __table_args__ = (db.Index("ix_usage_codes_partner_expires", "partner_id", "expires_at"),)
 
     id = db.Column(db.Integer, primary_key=True)
     code = db.Column(db.String(5), nullable=False, index=True)
     partner_id = db.Column(db.Integer, db.ForeignKey("companies.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    expires_at = db.Column(db.DateTime, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)
     usage_count = db.Column(db.Integer, default=0, nullable=False)
     max_uses_per_window = db.Column(db.Integer, nullable=False)
 
@@ -22,7 +23,7 @@ class UsageCode(db.Model):
         "Company",
         foreign_keys=[partner_id],
         backref=db.backref("usage_codes", lazy="dynamic"),
-        lazy="joined",
+        lazy="select",
     )
 
     def is_expired(self) -> bool:
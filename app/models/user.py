@@ -88,7 +88,7 @@ class User(UserMixin, db.Model):
         backref=db.backref(
             "users", lazy="dynamic", foreign_keys="User.company_id"
         ),
-        lazy="joined",
+        lazy="select",
         foreign_keys=[company_id],
         doc="Company entity associated with the user when acting as a business account.",
     )
@@ -10,7 +10,7 @@ class VerificationCode(db.Model):
     code = db.Column(db.String(10), nullable=False)
     # Purpose: 'registration', 'login', 'reset_password', 'verification'
     purpose = db.Column(db.String(50), nullable=False, default='verification')
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_used = db.Column(db.Boolean, default=False)
 
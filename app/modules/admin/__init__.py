@@ -22,4 +22,5 @@ from .routes import (
     notifications_routes,
     reports_routes,
     analytics_routes,
+    profiles_routes,
 )
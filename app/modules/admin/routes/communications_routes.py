@@ -15,11 +15,12 @@ from flask import (
     Response,
     g,
 )
-from sqlalchemy import or_
+from sqlalchemy import case, or_
 
 from app.models import User, Company, Conversation, Message
 from app.services.access_control import admin_required
 from app.services.communication_service import CommunicationService
+from app.services.search_service import search_companies
 from .. import admin
 
 AUDIENCE_LABELS: Dict[str, str] = {
@@ -226,11 +227,10 @@ def communication_lookup() -> Response:
     results: List[Dict[str, object]] = []
 
     if lookup_type == "company":
-        base_query = Company.query
         if query_text:
-            pattern = f"%{query_text}%"
-            base_query = base_query.filter(Company.name.ilike(pattern))
-        companies = base_query.order_by(Company.name).limit(20).all()
+            companies = search_companies(query_text, limit=20)
+        else:
+            companies = Company.query.order_by(Company.name).limit(20).all()
         for company in companies:
             results.append(
                 {
@@ -241,6 +241,7 @@ def communication_lookup() -> Response:
             )
     else:
         base_query = User.query.filter(User.is_active.is_(True))
+        ordering = [User.username]
         if query_text:
             pattern = f"%{query_text}%"
             base_query = base_query.filter(
@@ -249,7 +250,9 @@ def communication_lookup() -> Response:
                     User.email.ilike(pattern),
                 )
             )
-        users = base_query.order_by(User.username).limit(20).all()
+            # Prefix matches first; the trigram indexes serve the ILIKE filter.
+            ordering.insert(0, case((User.username.ilike(f"{query_text}%"), 0), else_=1))
+        users = base_query.order_by(*ordering).limit(20).all()
         for user in users:
             results.append(
                 {
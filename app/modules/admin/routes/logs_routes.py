@@ -12,8 +12,10 @@ from flask import (
     abort,
     Response,
 )
+from sqlalchemy.orm import joinedload
 
 from app.core.database import db
+from app.core.read_replica import read_replica
 from app.models import User, Company, Offer, ActivityLog
 from app.services.access_control import admin_required
 
@@ -22,13 +24,16 @@ from .. import admin
 
 @admin.route("/activity-log", methods=["GET"], endpoint="activity_log")
 @admin_required
+@read_replica
 def activity_log() -> str:
     """Display admin activity log entries inside Admin Panel."""
 
     admin_id = request.args.get("admin_id", type=int)
     company_id = request.args.get("company_id", type=int)
 
-    query = ActivityLog.query.order_by(ActivityLog.timestamp.desc())
+    query = ActivityLog.query.options(
+        joinedload(ActivityLog.admin), joinedload(ActivityLog.company)
+    ).order_by(ActivityLog.timestamp.desc())
 
     if admin_id:
         query = query.filter(ActivityLog.admin_id == admin_id)
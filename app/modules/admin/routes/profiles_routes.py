@@ -0,0 +1,41 @@
+"""Admin routes: recent request profiles captured by the profiling hook."""
+
+from __future__ import annotations
+
+from flask import abort, current_app, render_template, send_file
+
+from app.core.profiling import (
+    PROFILE_HEADER,
+    PROFILE_QUERY_FLAG,
+    list_profiles,
+    profile_artifact_path,
+)
+from app.services.access_control import admin_required
+
+from .. import admin
+
+
+@admin.route("/profiles", methods=["GET"], endpoint="request_profiles")
+@admin_required
+def request_profiles() -> str:
+    """List the most recent request profiles with their top functions."""
+
+    return render_template(
+        "admin/dashboard/profiles.html",
+        profiles=list_profiles(),
+        profiler_enabled=bool(current_app.config.get("PROFILER_ENABLED", False)),
+        sample_rate=float(current_app.config.get("PROFILER_SAMPLE_RATE", 0.0) or 0.0),
+        profile_header=PROFILE_HEADER,
+        profile_query_flag=PROFILE_QUERY_FLAG,
+    )
+
+
+@admin.route("/profiles/<artifact_id>.prof", methods=["GET"], endpoint="download_request_profile")
+@admin_required
+def download_request_profile(artifact_id: str):
+    """Download the raw ``.prof`` artifact for offline analysis."""
+
+    path = profile_artifact_path(artifact_id)
+    if path is None:
+        abort(404)
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True)
@@ -18,6 +18,7 @@ from flask import (
     g,
 )
 
+from app.core.read_replica import read_replica
 from app.models import User, Company, Offer, SMSLog
 from app.services.access_control import admin_required
 
@@ -147,6 +148,7 @@ def export_pdf() -> Any:
 
 @admin.route("/reports/sms-logs", endpoint="sms_logs")
 @admin_required
+@read_replica
 def sms_logs() -> str:
     """Render the SMS messages log report."""
     page = request.args.get('page', 1, type=int)
@@ -10,9 +10,11 @@ from typing import Dict, List
 from sqlalchemy import func
 
 from app.core.database import db
+from app.core.read_replica import read_replica
 from app.models import Company, Offer, User
 
 
+@read_replica
 def get_user_summary() -> Dict[str, object]:
     """Return aggregated statistics for users."""
 
@@ -32,6 +34,7 @@ def get_user_summary() -> Dict[str, object]:
     }
 
 
+@read_replica
 def get_company_summary() -> Dict[str, object]:
     """Return aggregated statistics for partner companies."""
 
@@ -51,6 +54,7 @@ def get_company_summary() -> Dict[str, object]:
     }
 
 
+@read_replica
 def get_offer_summary() -> Dict[str, object]:
     """Return aggregated statistics for offers and discounts."""
 
@@ -116,6 +120,7 @@ def get_offer_summary() -> Dict[str, object]:
 
 
 
+@read_replica
 def get_recent_activity(days: int = 7) -> Dict[str, List[Dict[str, object]]]:
     """Return a chronological list of registrations within the supplied window."""
 
@@ -143,6 +148,7 @@ def get_recent_activity(days: int = 7) -> Dict[str, List[Dict[str, object]]]:
     return {"timeline": timeline}
 
 
+@read_replica
 def get_membership_distribution() -> Dict[str, List[object]]:
     """Return distribution of users by status (Active vs Inactive).
     
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+from app.core.read_replica import read_replica
 from app.services.analytics_service import (
     active_members_count,
     active_partners_count,
@@ -13,6 +14,7 @@ from app.services.analytics_service import (
 )
 
 
+@read_replica
 def get_analytics_summary(
     *, date_from: datetime | None = None, date_to: datetime | None = None
 ) -> dict[str, object]:
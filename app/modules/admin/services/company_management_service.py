@@ -8,12 +8,7 @@ from flask import url_for
 
 from app.core.database import db
 from app.models import Company
-from app.services.mailer import (
-    send_company_approval_email,
-    send_company_correction_email,
-    send_company_reactivation_email,
-    send_company_suspension_email,
-)
+from app.services.outbox_service import enqueue_company_email
 
 
 def fetch_companies_by_status(status: str) -> tuple[list[Company], Dict[str, int]]:
@@ -80,12 +75,12 @@ def delete_company(company: Company) -> None:
 
 
 def approve_company(company: Company) -> None:
-    """Mark the company as approved and send notification."""
+    """Mark the company as approved and queue the notification email."""
 
     company.status = "approved"
     _set_company_users_active(company, active=True)
+    enqueue_company_email(company, "approved")
     db.session.commit()
-    send_company_approval_email(company)
 
 
 def suspend_company(company: Company) -> None:
@@ -93,8 +88,8 @@ def suspend_company(company: Company) -> None:
 
     company.status = "suspended"
     _set_company_users_active(company, active=False)
+    enqueue_company_email(company, "suspended")
     db.session.commit()
-    send_company_suspension_email(company)
 
 
 def reactivate_company(company: Company) -> None:
@@ -102,23 +97,24 @@ def reactivate_company(company: Company) -> None:
 
     company.status = "approved"
     _set_company_users_active(company, active=True)
+    enqueue_company_email(company, "reactivated")
     db.session.commit()
-    send_company_reactivation_email(company)
 
 
 def request_correction(
     company: Company, notes: str | None = None, correction_link: str | None = None
 ) -> None:
-    """Move a company into correction status and send guidance email."""
+    """Move a company into correction status and queue the guidance email."""
 
     company.status = "correction"
     company.admin_notes = notes or company.admin_notes
     _set_company_users_active(company, active=True)
-    db.session.commit()
 
+    # Resolved now: the dispatcher has no request to build an external URL from.
     resolved_link = correction_link or url_for(
         "company_portal.complete_registration",
         company_id=company.id,
         _external=True,
     )
-    send_company_correction_email(company, notes or "", resolved_link)
+    enqueue_company_email(company, "correction", notes=notes or "", link=resolved_link)
+    db.session.commit()
@@ -11,7 +11,7 @@ from flask import current_app, flash, g, jsonify, redirect, render_template, req
 from werkzeug.utils import secure_filename
 
 from app.core.database import db
-from app.models import ActivityLog, Offer
+from app.models import Offer
 from app.models.offer import OFFER_CLASSIFICATION_TYPES, OfferClassification
 from app.modules.members.services.member_notifications_service import (
     broadcast_new_offer,
@@ -19,6 +19,8 @@ from app.modules.members.services.member_notifications_service import (
 )
 from app.modules.admin.services import admin_settings_service
 from app.services.access_control import can_access, company_required
+from app.services.image_processing_service import queue_offer_image_processing
+from app.services.redemption_ledger_service import usage_attempts
 from . import company_portal
 from app.utils.company_context import _current_company
 
@@ -258,11 +260,7 @@ def company_offers_list() -> str:
         .count()
     )
     inactive_offers = max(len(offers) - active_offers, 0)
-    total_activations = (
-        ActivityLog.query.filter_by(
-            action="usage_code_attempt", result="valid", partner_id=company.id
-        ).count()
-    )
+    total_activations = usage_attempts(["valid"]).filter_by(partner_id=company.id).count()
     return render_template(
         "companies/offers_list.html",
         company=company,
@@ -347,6 +345,7 @@ def offer_create():
     )
     db.session.add(offer)
     db.session.flush()
+    original_image_url = None
 
     _apply_classifications(offer, payload["classifications"])
 
@@ -360,11 +359,18 @@ def offer_create():
         flash(error_message, "danger")
         return redirect(url_for("company_portal.company_offers_list"))
 
-    if image_url and image_url != offer.image_url:
+    if image_url:
         offer.image_url = image_url
+    # Covers both a new upload and an image URL set in the payload.
+    image_changed = offer.image_url != original_image_url
+    if image_changed:
+        offer.image_renditions = None
 
     db.session.commit()
 
+    if image_changed:
+        queue_offer_image_processing(offer)
+
     if payload["send_notifications"]:
         broadcast_new_offer(offer.id)
 
@@ -452,6 +458,7 @@ def offer_update(offer_id: int):
     offer.start_date = payload["start_date"]
     offer.status = payload["status"]
     offer.valid_until = payload["valid_until"]
+    original_image_url = offer.image_url
     offer.image_url = payload["image_url"]
 
     _apply_classifications(offer, payload["classifications"])
@@ -466,11 +473,18 @@ def offer_update(offer_id: int):
         flash(error_message, "danger")
         return redirect(url_for("company_portal.company_offers_list"))
 
-    if image_url and image_url != offer.image_url:
+    if image_url:
         offer.image_url = image_url
+    # Covers both a new upload and an image URL set in the payload.
+    image_changed = offer.image_url != original_image_url
+    if image_changed:
+        offer.image_renditions = None
 
     db.session.commit()
 
+    if image_changed:
+        queue_offer_image_processing(offer)
+
     if payload["send_notifications"]:
         broadcast_new_offer(offer.id)
 
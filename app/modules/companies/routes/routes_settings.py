@@ -21,6 +21,7 @@ from werkzeug.utils import secure_filename
 
 from app.core.database import db
 from app.services.access_control import company_required
+from app.services.image_processing_service import queue_company_logo_processing
 from app.modules.companies.routes.permissions import guard_company_staff_only_tabs
 from app.modules.companies.services.company_profile_service import (
     get_notification_preferences,
@@ -149,7 +150,10 @@ def company_settings():
             return redirect(url_for("company_portal.company_settings"))
 
         company.description = description or None
-        company.logo_url = saved_logo_url or company.logo_url
+        logo_changed = bool(saved_logo_url) and saved_logo_url != company.logo_url
+        if logo_changed:
+            company.logo_url = saved_logo_url
+            company.logo_renditions = None
         
         # Merge notification preferences to avoid wiping out other data like industry/phone
         prefs = get_notification_preferences(company)
@@ -159,6 +163,9 @@ def company_settings():
         company.notification_preferences = updated_prefs
         db.session.commit()
 
+        if logo_changed:
+            queue_company_logo_processing(company)
+
         success_message = "تم حفظ التغييرات بنجاح."
         if _wants_json(request):
             return jsonify({"ok": True, "message": success_message, "logo_url": company.logo_url})
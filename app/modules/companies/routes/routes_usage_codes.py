@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
-from datetime import datetime
 from http import HTTPStatus
 
-from flask import flash, g, jsonify, redirect, render_template, request, url_for
-from sqlalchemy import or_
+from flask import Response, current_app, flash, g, jsonify, redirect, render_template, request, url_for
+from redis.exceptions import RedisError
 
-from app.models import UsageCode
 from app.services.access_control import can_access, company_required
-from app.services.usage_code_service import generate_usage_code, get_usage_code_settings
+from app.services.usage_code_service import (
+    generate_usage_code,
+    get_active_usage_code,
+    get_usage_code_settings,
+)
+from app.services.usage_code_stream_service import (
+    StreamSettings,
+    iter_events,
+    mark_screen_open,
+    snapshot,
+    subscribe,
+)
 from app.utils.company_context import _current_company
 from .. import company_portal
 
@@ -30,18 +39,13 @@ def company_usage_codes() -> str:
         return redirect(url_for("company_portal.company_users"))
     company = _current_company()
     settings = get_usage_code_settings()
-    now = datetime.utcnow()
-    active_code = (
-        UsageCode.query.filter_by(partner_id=company.id)
-        .filter(or_(UsageCode.expires_at.is_(None), UsageCode.expires_at > now))
-        .order_by(UsageCode.created_at.desc())
-        .first()
-    )
+    active_code = get_active_usage_code(company.id)
     return render_template(
         "companies/usage_codes.html",
         company=company,
         active_code=active_code,
         settings=settings,
+        stream_enabled=current_app.config.get("USAGE_CODE_STREAM_ENABLED", True),
     )
 
 
@@ -71,19 +75,7 @@ def company_usage_codes_generate():
             HTTPStatus.FORBIDDEN,
         )
     usage_code = generate_usage_code(company.id)
-    return (
-        jsonify(
-            {
-                "code": usage_code.code,
-                "expires_at": usage_code.expires_at.isoformat()
-                if usage_code.expires_at
-                else None,
-                "usage_count": usage_code.usage_count,
-                "max_uses_per_window": usage_code.max_uses_per_window,
-            }
-        ),
-        HTTPStatus.CREATED,
-    )
+    return jsonify(snapshot(usage_code)), HTTPStatus.CREATED
 
 
 @company_portal.route(
@@ -93,7 +85,12 @@ def company_usage_codes_generate():
 )
 @company_required
 def company_usage_codes_current():
-    """Fetch the current usage code for the authenticated partner."""
+    """Fetch the current usage code for the authenticated partner.
+
+    Polling fallback for screens without the event stream. It never generates
+    a code: the rotation job does that for open screens (this call counts as
+    one), and ``code`` is ``null`` until it has.
+    """
 
     if not can_access(getattr(g, "current_user", None), "manage_usage_codes"):
         return (
@@ -112,31 +109,61 @@ def company_usage_codes_current():
             HTTPStatus.FORBIDDEN,
         )
 
-    now = datetime.utcnow()
-    active_code = (
-        UsageCode.query.filter_by(partner_id=company.id)
-        .filter(or_(UsageCode.expires_at.is_(None), UsageCode.expires_at > now))
-        .order_by(UsageCode.created_at.desc())
-        .first()
-    )
+    mark_screen_open(company.id)
+    return jsonify(snapshot(get_active_usage_code(company.id)))
 
-    if active_code is None:
-        active_code = generate_usage_code(company.id)
-
-    return jsonify(
-        {
-            "code": active_code.code,
-            "expires_at": active_code.expires_at.isoformat()
-            if active_code.expires_at
-            else None,
-            "usage_count": active_code.usage_count,
-            "max_uses_per_window": active_code.max_uses_per_window,
-        }
-    )
+
+@company_portal.route(
+    "/usage-codes/stream",
+    methods=["GET"],
+    endpoint="company_usage_codes_stream",
+)
+@company_required
+def company_usage_codes_stream():
+    """Server-sent events carrying the partner's code rotations and usage counts."""
+
+    if not current_app.config.get("USAGE_CODE_STREAM_ENABLED", True):
+        return jsonify({"ok": False, "message": "البث المباشر غير مفعل."}), HTTPStatus.NOT_FOUND
+    if not can_access(getattr(g, "current_user", None), "manage_usage_codes"):
+        return (
+            jsonify({"ok": False, "message": "ليس لديك صلاحية إدارة أكواد الاستخدام."}),
+            HTTPStatus.FORBIDDEN,
+        )
+    company = _current_company()
+    if company.status == "correction":
+        return (
+            jsonify(
+                {
+                    "error": "Account suspended",
+                    "message": "الحساب معلق جزئيا. فضلا استكمال الاجرائات المطلوبه لتفعيل الحساب",
+                }
+            ),
+            HTTPStatus.FORBIDDEN,
+        )
+
+    partner_id = company.id
+    try:
+        # Subscribe before reading the snapshot so no rotation falls in between.
+        pubsub = subscribe(partner_id)
+    except RedisError:
+        return (
+            jsonify({"ok": False, "message": "البث المباشر غير متاح حالياً."}),
+            HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+    mark_screen_open(partner_id)
+    initial = snapshot(get_active_usage_code(partner_id))
+    # iter_events runs after the request context (and its database session) is gone.
+    settings = StreamSettings.from_config(current_app.config)
+    response = Response(iter_events(pubsub, partner_id, initial, settings), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.call_on_close(pubsub.close)
+    return response
 
 
 __all__ = [
     "company_usage_codes",
     "company_usage_codes_generate",
     "company_usage_codes_current",
+    "company_usage_codes_stream",
 ]
@@ -3,87 +3,209 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.models import Company, Offer, LookupChoice
+from app.core.database import db
+from app.models import Company, Offer, LookupChoice, OfferClassification
+from app.modules.companies.services.offer_catalog_service import (
+    CatalogOffer,
+    summarize_company as _summarize_company,
+    get_catalog_snapshot,
+)
 
 
-@dataclass
-class OfferCompanyBundle:
-    """Lightweight container exposing offer and company metadata for templates."""
+# Portal templates receive the shared catalogue records directly.
+OfferCompanyBundle = CatalogOffer
 
-    id: int
-    title: str
-    description: str | None
-    base_discount: float
-    valid_until: Optional[object]
-    membership_discount: float
-    company: Dict[str, object]
-    classification_values: List[str]
 
+def get_portal_offers_with_company(limit: Optional[int] = None, featured: bool = False) -> List[OfferCompanyBundle]:
+    """Return active offers with linked company data from the worker's catalogue snapshot.
 
-def _summarize_company(company: Optional[Company], *, length: int = 140) -> str:
-    """Return a compact summary of the company's description."""
+    ``featured`` lists the newest offers first, otherwise offers are ordered by
+    expiry. No catalogue SQL runs unless the snapshot has to be rebuilt.
+    """
 
-    if company is None:
-        return ""
-    description = (company.description or "").strip()
-    if not description:
-        return ""
-    if len(description) <= length:
-        return description
-    return f"{description[:length].rstrip()}…"
+    snapshot = get_catalog_snapshot()
+    offers = snapshot.featured if featured else snapshot.by_expiry
+    if limit:
+        offers = offers[:limit]
+    return list(offers)
 
 
-def get_portal_offers_with_company(limit: Optional[int] = None, featured: bool = False) -> List[OfferCompanyBundle]:
-    """Return offer records enriched with linked company data for the portal."""
-    # Pre-fetch industry icons to avoid multiple DB queries
-    industry_icons = {
-        row.name: row.icon 
-        for row in LookupChoice.query.filter_by(list_type="industries").all()
+def get_industry_icon_map() -> Dict[str, Optional[str]]:
+    """Return active industry names mapped to their icon filenames in one query."""
+
+    return {
+        row.name: row.icon
+        for row in LookupChoice.query.filter_by(list_type="industries", active=True).all()
     }
 
-    query = Offer.query.options(joinedload(Offer.company), joinedload(Offer.classifications)).filter(Offer.status == "active")
-    
-    if featured:
-        query = query.order_by(Offer.created_at.desc())
-    else:
-        query = query.order_by(Offer.valid_until.asc())
 
-    if limit:
-        query = query.limit(limit)
-
-    offers: Iterable[Offer] = query.all()
-
-    results: List[OfferCompanyBundle] = []
-    for offer in offers:
-        company = offer.company
-        industry_name = company.industry if company else None
-        industry_icon = industry_icons.get(industry_name) if industry_name else None
-        
-        bundle = OfferCompanyBundle(
-            id=offer.id,
-            title=offer.title,
-            description=offer.description,
-            base_discount=float(offer.base_discount or 0.0),
-            valid_until=offer.valid_until,
-            membership_discount=float(offer.base_discount or 0.0),
-            company={
-                "id": company.id if company else "",
-                "name": company.name if company else "شريك ELITE",
-                "summary": _summarize_company(company),
-                "description": (company.description or "") if company else "",
-                "logo_url": company.logo_url if company else None,
-                "industry": industry_name,
-                "industry_icon": industry_icon,
-            },
-            classification_values=offer.classification_values,
+def list_offers_page(
+    *,
+    after_id: Optional[int] = None,
+    limit: int = 50,
+    status: Optional[str] = None,
+    company_id: Optional[int] = None,
+    classification: Optional[str] = None,
+) -> tuple[List[Offer], Optional[int]]:
+    """Return one keyset page of offers ordered by id plus the id to resume after.
+
+    Companies are joined and classifications are loaded in a single extra
+    ``SELECT ... IN`` so serializing the page issues a fixed number of queries.
+    """
+
+    query = Offer.query.options(
+        joinedload(Offer.company), selectinload(Offer.classifications)
+    )
+    if after_id is not None:
+        query = query.filter(Offer.id > after_id)
+    if status:
+        query = query.filter(Offer.status == status)
+    if company_id is not None:
+        query = query.filter(Offer.company_id == company_id)
+    if classification:
+        query = query.filter(
+            Offer.classifications.any(OfferClassification.classification == classification)
         )
-        results.append(bundle)
-    return results
+
+    rows = query.order_by(Offer.id.asc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    page = rows[:limit]
+    next_after_id = page[-1].id if has_more and page else None
+    return page, next_after_id
+
+
+@dataclass
+class OfferFacetResult:
+    """Filtered active offers plus facet counts for the offers filter sheet."""
+
+    offers: List[Offer]
+    total: int
+    offer_ids: List[int] = field(default_factory=list)
+    cities: Dict[str, int] = field(default_factory=dict)
+    industries: Dict[str, int] = field(default_factory=dict)
+    classifications: Dict[str, int] = field(default_factory=dict)
+
+
+def _facet_conditions(
+    *,
+    city: Optional[str],
+    industry: Optional[str],
+    classification: Optional[str],
+    skip: Optional[str] = None,
+) -> list:
+    conditions = [Offer.status == "active"]
+    if city and skip != "city":
+        conditions.append(Company.city == city)
+    if industry and skip != "industry":
+        conditions.append(Company.industry == industry)
+    if classification and skip != "classification":
+        conditions.append(
+            Offer.classifications.any(OfferClassification.classification == classification)
+        )
+    return conditions
+
+
+def query_offer_facets(
+    *,
+    city: Optional[str] = None,
+    industry: Optional[str] = None,
+    classification: Optional[str] = None,
+    limit: Optional[int] = None,
+    ids_only: bool = False,
+) -> OfferFacetResult:
+    """Return filtered active offers with per-city/industry/classification counts.
+
+    Each facet is counted with every *other* selected filter applied so the
+    filter sheet can show how many offers switching that facet would yield.
+    All facet counts and the total come back from a single UNION ALL statement.
+    With ``ids_only`` the matching offers are read as bare ids into
+    ``offer_ids`` and ``offers`` stays empty; only callers rendering offer
+    cards need the ORM rows and their company and classifications.
+    """
+
+    filters = {"city": city, "industry": industry, "classification": classification}
+    company_join = (Company, Offer.company_id == Company.id)
+
+    def _grouped(facet: str, column, *, via_classifications: bool = False):
+        query = select(
+            literal(facet).label("facet"),
+            column.label("value"),
+            func.count(Offer.id.distinct()).label("total"),
+        ).select_from(Offer).join(*company_join)
+        if via_classifications:
+            query = query.join(OfferClassification, OfferClassification.offer_id == Offer.id)
+        return (
+            query.where(*_facet_conditions(**filters, skip=facet))
+            .where(column.is_not(None))
+            .group_by(column)
+        )
+
+    total_query = (
+        select(
+            literal("total").label("facet"),
+            literal(None).label("value"),
+            func.count(Offer.id).label("total"),
+        )
+        .select_from(Offer)
+        .join(*company_join)
+        .where(*_facet_conditions(**filters))
+    )
+    statement = union_all(
+        total_query,
+        _grouped("city", Company.city),
+        _grouped("industry", Company.industry),
+        _grouped("classification", OfferClassification.classification, via_classifications=True),
+    )
+
+    buckets: Dict[str, Dict[str, int]] = {"city": {}, "industry": {}, "classification": {}}
+    total = 0
+    for facet, value, count in db.session.execute(statement):
+        if facet == "total":
+            total = int(count)
+        else:
+            buckets[facet][value] = int(count)
+
+    ordering = (Offer.valid_until.asc(), Offer.id.asc())
+    if ids_only:
+        ids_query = (
+            select(Offer.id)
+            .join(*company_join)
+            .where(*_facet_conditions(**filters))
+            .order_by(*ordering)
+        )
+        if limit:
+            ids_query = ids_query.limit(limit)
+        offers: List[Offer] = []
+        offer_ids = list(db.session.scalars(ids_query))
+    else:
+        offers_query = (
+            Offer.query.join(*company_join)
+            .options(joinedload(Offer.company), selectinload(Offer.classifications))
+            .filter(*_facet_conditions(**filters))
+            .order_by(*ordering)
+        )
+        if limit:
+            offers_query = offers_query.limit(limit)
+        offers = offers_query.all()
+        offer_ids = [offer.id for offer in offers]
+
+    def _sorted(counts: Dict[str, int]) -> Dict[str, int]:
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    return OfferFacetResult(
+        offers=offers,
+        total=total,
+        offer_ids=offer_ids,
+        cities=_sorted(buckets["city"]),
+        industries=_sorted(buckets["industry"]),
+        classifications=_sorted(buckets["classification"]),
+    )
 
 
 def get_company_brief(company_id: int) -> Optional[Dict[str, object]]:
@@ -98,6 +220,7 @@ def get_company_brief(company_id: int) -> Optional[Dict[str, object]]:
         "description": company.description or "",
         "summary": _summarize_company(company, length=220),
         "logo_url": company.logo_url,
+        "logo_renditions": company.logo_renditions,
         "industry": company.industry,
     }
 
@@ -115,8 +238,12 @@ def list_company_offers(company_id: int) -> List[Offer]:
 
 __all__ = [
     "OfferCompanyBundle",
+    "OfferFacetResult",
     "get_portal_offers_with_company",
     "get_company_brief",
+    "get_industry_icon_map",
     "list_company_offers",
+    "list_offers_page",
+    "query_offer_facets",
 ]
 
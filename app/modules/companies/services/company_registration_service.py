@@ -13,12 +13,12 @@ from sqlalchemy.exc import IntegrityError
 
 from app.core.database import db
 from app.logging.context import build_logging_context
-from app.models import Company, User
-from app.services.mailer import send_company_welcome_email, send_email
+from app.models import Company, Notification, User
 from app.core.choices import get_cities, get_industries, validate_choice
-from app.modules.members.services.member_notifications_service import (
-    push_admin_notification,
-    queue_notification,
+from app.services.outbox_service import (
+    enqueue_admin_notification,
+    enqueue_company_email,
+    enqueue_email,
 )
 
 
@@ -149,7 +149,7 @@ def register_company_account(payload: Dict[str, str]) -> Tuple[Dict[str, object]
             HTTPStatus.BAD_REQUEST,
         )
 
-    company = Company(name=company_name, description=description)
+    company = Company(name=company_name, description=description, industry=industry, city=city)
     company.status = "pending"
     company.admin_notes = None
 
@@ -163,8 +163,6 @@ def register_company_account(payload: Dict[str, str]) -> Tuple[Dict[str, object]
     owner.company = company
     company.notification_preferences = {
         "contact_phone": phone_number,
-        "industry": industry,
-        "city": city,
         "website_url": website_url or None,
         "social_url": social_url,
         "submitted_at": datetime.utcnow().isoformat() + "Z",
@@ -174,6 +172,25 @@ def register_company_account(payload: Dict[str, str]) -> Tuple[Dict[str, object]
     db.session.add(company)
 
     try:
+        db.session.flush()
+        # Notifications and emails go through the outbox in the same transaction,
+        # so they are delivered exactly when the registration is committed.
+        enqueue_admin_notification(
+            "company.new_application",
+            "New Company Application",
+            f"A new company '{company.name}' submitted an application.",
+            "/admin/companies?status=pending",
+            company_id=company.id,
+            actor_id=getattr(current_user, "id", None),
+        )
+        notify_admin_of_company_request(
+            company=company,
+            owner=owner,
+            phone_number=phone_number,
+            industry=industry,
+            city=city,
+        )
+        enqueue_company_email(company, "welcome")
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
@@ -182,25 +199,6 @@ def register_company_account(payload: Dict[str, str]) -> Tuple[Dict[str, object]
             HTTPStatus.BAD_REQUEST,
         )
 
-    push_admin_notification(
-        event_type="company.new_application",
-        title="New Company Application",
-        message=f"A new company '{company.name}' submitted an application.",
-        link="/admin/companies?status=pending",
-        company_id=company.id,
-        actor_id=getattr(current_user, "id", None),
-    )
-
-    notify_admin_of_company_request(
-        company=company,
-        owner=owner,
-        phone_number=phone_number,
-        industry=industry,
-        city=city,
-    )
-
-    send_company_welcome_email(owner=owner, company_name=company.name)
-
     response = {
         "company": {
             "id": company.id,
@@ -231,7 +229,10 @@ def notify_admin_of_company_request(
     industry: str,
     city: str,
 ) -> None:
-    """Send admin notifications and email summarizing the company request."""
+    """Add admin notifications and queue an email summarizing the company request.
+
+    Nothing is committed here; the caller commits with the registration.
+    """
 
     admin_users = (
         User.query.filter(
@@ -259,12 +260,14 @@ def notify_admin_of_company_request(
             "owner_email": owner.email,
         }
         for admin in admin_users:
-            queue_notification(
-                admin.id,
-                type="new_company_request",
-                title="طلب تسجيل شركة جديد",
-                message=message,
-                metadata=metadata,
+            db.session.add(
+                Notification(
+                    user_id=admin.id,
+                    type="new_company_request",
+                    title="طلب تسجيل شركة جديد",
+                    message=message,
+                    metadata_json=metadata,
+                )
             )
 
     admin_email = (
@@ -292,7 +295,7 @@ def notify_admin_of_company_request(
 
     message_html = "<br>".join(message_lines)
     context = {"subject": subject, "message_html": message_html}
-    send_email(admin_email, subject, "core/emails/admin_broadcast.html", context)
+    enqueue_email(admin_email, subject, "core/emails/admin_broadcast.html", context)
 
 
 __all__ = ["register_company_account", "notify_admin_of_company_request"]
@@ -0,0 +1,214 @@
+"""Per-worker in-memory read model of the active offer catalogue.
+
+Portal pages read offers from an immutable :class:`CatalogSnapshot` instead of
+querying ``offers``/``companies``/``lookup_choices`` on every view. Each worker
+process keeps one snapshot and rebuilds it only when the Redis catalogue
+version (see :mod:`app.services.catalog_version_service`) moves; the rebuilt
+snapshot replaces the old one in a single reference assignment so concurrent
+readers always see a complete catalogue.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Company, LookupChoice, Offer
+from app.services.catalog_version_service import get_catalog_version
+
+# Without Redis there is no version to compare, so snapshots expire instead.
+FALLBACK_TTL_SECONDS = 30.0
+
+_DEFAULT_COMPANY_NAME = "شريك ELITE"
+
+
+def _fingerprint(*values: object) -> str:
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class CatalogCompany:
+    """Company fields shown next to offers; one instance is shared per company."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "summary",
+        "description",
+        "logo_url",
+        "logo_renditions",
+        "industry",
+        "industry_icon",
+        "version",
+    )
+
+    def __init__(self, company: Optional[Company], industry_icons: Dict[str, Optional[str]]):
+        industry = company.industry if company else None
+        self.id = company.id if company else ""
+        self.name = company.name if company else _DEFAULT_COMPANY_NAME
+        self.summary = summarize_company(company)
+        self.description = (company.description or "") if company else ""
+        self.logo_url = company.logo_url if company else None
+        self.logo_renditions = company.logo_renditions if company else None
+        self.industry = industry
+        self.industry_icon = industry_icons.get(industry) if industry else None
+        self.version = _fingerprint(
+            self.id, self.name, self.description, self.logo_url, self.logo_renditions, industry, self.industry_icon
+        )
+
+
+class CatalogOffer:
+    """Read-only offer record exposing the attributes used by portal templates."""
+
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "base_discount",
+        "valid_until",
+        "membership_discount",
+        "image_url",
+        "image_renditions",
+        "company",
+        "company_id",
+        "classification_values",
+        "created_at",
+        "version",
+    )
+
+    def __init__(self, offer: Offer, company: CatalogCompany):
+        discount = float(offer.base_discount or 0.0)
+        self.id = offer.id
+        self.title = offer.title
+        self.description = offer.description
+        self.base_discount = discount
+        self.valid_until = offer.valid_until
+        self.membership_discount = discount
+        self.image_url = offer.image_url
+        self.image_renditions = offer.image_renditions
+        self.company = company
+        self.company_id = offer.company_id
+        self.classification_values = tuple(offer.classification_values)
+        self.created_at = offer.created_at
+        # Changes whenever anything an offer card renders changes (fragment cache key).
+        self.version = _fingerprint(
+            self.id,
+            self.title,
+            self.description,
+            discount,
+            self.valid_until,
+            self.image_url,
+            self.image_renditions,
+            self.classification_values,
+            company.version,
+        )
+
+
+class CatalogSnapshot:
+    """Immutable catalogue of active offers with pre-sorted views."""
+
+    __slots__ = ("version", "built_at", "featured", "by_expiry", "by_id")
+
+    def __init__(self, version: Optional[str], offers: List[CatalogOffer]):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.featured: Tuple[CatalogOffer, ...] = tuple(
+            sorted(offers, key=lambda item: item.created_at or datetime.min, reverse=True)
+        )
+        # Open-ended offers are listed after every dated one.
+        self.by_expiry: Tuple[CatalogOffer, ...] = tuple(
+            sorted(
+                offers,
+                key=lambda item: (item.valid_until is None, item.valid_until or datetime.min),
+            )
+        )
+        self.by_id: Dict[int, CatalogOffer] = {item.id: item for item in offers}
+
+    def is_current(self, version: Optional[str]) -> bool:
+        if version is None:
+            return (time.monotonic() - self.built_at) < FALLBACK_TTL_SECONDS
+        return version == self.version
+
+
+def summarize_company(company: Optional[Company], *, length: int = 140) -> str:
+    """Return a compact summary of the company's description."""
+
+    if company is None:
+        return ""
+    description = (company.description or "").strip()
+    if not description:
+        return ""
+    if len(description) <= length:
+        return description
+    return f"{description[:length].rstrip()}…"
+
+
+def build_catalog_snapshot(version: Optional[str]) -> CatalogSnapshot:
+    """Load every active offer once and wrap it in a :class:`CatalogSnapshot`."""
+
+    industry_icons = {
+        row.name: row.icon
+        for row in LookupChoice.query.filter_by(list_type="industries").all()
+    }
+    offers = (
+        Offer.query.options(joinedload(Offer.company), selectinload(Offer.classifications))
+        .filter(Offer.status == "active")
+        .all()
+    )
+
+    companies: Dict[Optional[int], CatalogCompany] = {}
+    records: List[CatalogOffer] = []
+    for offer in offers:
+        company = companies.get(offer.company_id)
+        if company is None:
+            company = CatalogCompany(offer.company, industry_icons)
+            companies[offer.company_id] = company
+        records.append(CatalogOffer(offer, company))
+    return CatalogSnapshot(version, records)
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_build_lock = threading.Lock()
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    """Return the worker's catalogue snapshot, rebuilding it when stale."""
+
+    global _snapshot
+
+    # Read the version before loading rows: a bump that lands mid-build leaves
+    # the snapshot tagged with the older version so the next call rebuilds it.
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.is_current(version):
+        return snapshot
+
+    with _build_lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.is_current(version):
+            return snapshot
+        snapshot = build_catalog_snapshot(version)
+        _snapshot = snapshot
+    return snapshot
+
+
+def reset_catalog_snapshot() -> None:
+    """Drop the cached snapshot so the next read rebuilds it."""
+
+    global _snapshot
+    _snapshot = None
+
+
+__all__ = [
+    "CatalogCompany",
+    "CatalogOffer",
+    "CatalogSnapshot",
+    "build_catalog_snapshot",
+    "get_catalog_snapshot",
+    "reset_catalog_snapshot",
+    "summarize_company",
+]
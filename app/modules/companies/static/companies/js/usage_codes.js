@@ -8,6 +8,11 @@ document.addEventListener("DOMContentLoaded", () => {
         return;
     }
 
+    const streamUrl = codeValue.dataset.usageCodeStream;
+    const POLL_INTERVAL_MS = 10000;
+    let pollTimer = null;
+    let requestedCode = false;
+
     const formatDateTime = (isoString) => {
         if (!isoString) {
             return "مفتوحة";
@@ -33,6 +38,39 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     };
 
+    const requestUsageCode = async () => {
+        const response = await fetch("/company/usage-codes/generate", {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "X-Requested-With": "XMLHttpRequest",
+            },
+            credentials: "include",
+            body: JSON.stringify({}),
+        });
+        const payload = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            throw new Error(payload.error || "Unable to generate code.");
+        }
+        return payload;
+    };
+
+    // Codes rotate on the server; a screen only asks for one when the partner has none yet.
+    const showUsageCode = (payload) => {
+        updateUsageCode(payload);
+        if (payload.code) {
+            requestedCode = false;
+            return;
+        }
+        if (requestedCode) {
+            return;
+        }
+        requestedCode = true;
+        requestUsageCode()
+            .then(updateUsageCode)
+            .catch((error) => console.error("Usage code generation failed", error));
+    };
+
     const fetchCurrentCode = async () => {
         try {
             const response = await fetch("/company/usage-codes/current", {
@@ -44,37 +82,46 @@ document.addEventListener("DOMContentLoaded", () => {
             });
             const payload = await response.json().catch(() => ({}));
             if (!response.ok) {
-                throw new Error(payload.error || "Unable to generate code.");
+                throw new Error(payload.error || "Unable to load code.");
             }
 
-            updateUsageCode(payload);
+            showUsageCode(payload);
         } catch (error) {
-            console.error("Usage code generation failed", error);
-            if (generateButton) {
-                generateButton.disabled = false;
-            }
+            console.error("Usage code refresh failed", error);
         }
     };
 
+    const startPolling = () => {
+        if (pollTimer) {
+            return;
+        }
+        fetchCurrentCode();
+        pollTimer = window.setInterval(fetchCurrentCode, POLL_INTERVAL_MS);
+    };
+
+    const startStream = () => {
+        const source = new EventSource(streamUrl, { withCredentials: true });
+        const handle = (event) => {
+            try {
+                showUsageCode(JSON.parse(event.data));
+            } catch (error) {
+                console.error("Invalid usage code event", error);
+            }
+        };
+        ["snapshot", "rotated", "redeemed"].forEach((name) => source.addEventListener(name, handle));
+        source.addEventListener("error", () => {
+            // The browser reconnects by itself unless the server refused the stream.
+            if (source.readyState === EventSource.CLOSED) {
+                startPolling();
+            }
+        });
+    };
+
     if (generateButton) {
         generateButton.addEventListener("click", async () => {
             generateButton.disabled = true;
             try {
-                const response = await fetch("/company/usage-codes/generate", {
-                    method: "POST",
-                    headers: {
-                        "Content-Type": "application/json",
-                        "X-Requested-With": "XMLHttpRequest",
-                    },
-                    credentials: "include",
-                    body: JSON.stringify({}),
-                });
-                const payload = await response.json().catch(() => ({}));
-                if (!response.ok) {
-                    throw new Error(payload.error || "Unable to generate code.");
-                }
-
-                updateUsageCode(payload);
+                updateUsageCode(await requestUsageCode());
             } catch (error) {
                 console.error("Usage code generation failed", error);
                 alert(error.message || "Unable to generate usage code.");
@@ -84,6 +131,9 @@ document.addEventListener("DOMContentLoaded", () => {
         });
     }
 
-    fetchCurrentCode();
-    window.setInterval(fetchCurrentCode, 10000);
+    if (streamUrl && "EventSource" in window) {
+        startStream();
+    } else {
+        startPolling();
+    }
 });
@@ -11,6 +11,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 from http import HTTPStatus
 from functools import lru_cache
 from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
@@ -31,13 +32,15 @@ from flask_login import current_user, login_user
 from sqlalchemy import or_
 
 from flask_sqlalchemy import SQLAlchemy
-from app.services.mailer import send_email, send_member_welcome_email
+from app.services.mailer import send_member_welcome_email
 from app.modules.members.services.member_notifications_service import (
     send_welcome_notification,
 )
-from app.services.sms_service import SMSService
+from app.services.outbox_service import enqueue_email, enqueue_sms
+from app.services.sms_service import SMSService, queue_otp, queue_welcome
 from .utils import (
     AUTH_COOKIE_NAME,
+    CONFIRM_TOKEN_MAX_AGE,
     clear_auth_cookie,
     confirm_token,
     create_token,
@@ -138,12 +141,10 @@ def _register_member_from_payload(payload: Dict[str, str]) -> Tuple[Response, in
 
     db = _get_db()
     db.session.add(user)
+    # The OTP SMS is delivered by the outbox dispatcher once this commits.
+    queue_otp(phone, purpose='registration')
     db.session.commit()
 
-    # Send OTP
-    sms_service = SMSService()
-    sms_service.send_otp(phone, purpose='registration')
-
     response = {
         "id": user.id,
         "username": user.username,
@@ -243,12 +244,10 @@ def api_verify_otp():
         user = User.query.filter_by(phone_number=phone).first()
         if user:
             user.is_phone_verified = True
+            queue_welcome(phone)
             db = _get_db()
             db.session.commit()
             
-            # Send welcome SMS
-            sms_service.send_welcome(phone)
-            
             # Auto login after verification
             login_user(user)
             token = create_token(user.id)
@@ -274,8 +273,8 @@ def api_resend_otp():
     if not phone:
         return jsonify({"message": "رقم الجوال مطلوب."}), HTTPStatus.BAD_REQUEST
 
-    sms_service = SMSService()
-    sms_service.send_otp(phone, purpose='registration')
+    queue_otp(phone, purpose='registration')
+    _get_db().session.commit()
     return jsonify({"message": "تم إرسال الرمز بنجاح."}), HTTPStatus.OK
 
 
@@ -311,12 +310,10 @@ def api_link_phone():
 
     user.phone_number = phone
     user.is_phone_verified = False
+    queue_otp(phone, purpose='registration')
     db = _get_db()
     db.session.commit()
 
-    sms_service = SMSService()
-    sms_service.send_otp(phone, purpose='registration')
-
     return jsonify({"message": "تم ربط الرقم، يرجى التحقق."}), HTTPStatus.OK
 
 
@@ -548,22 +545,28 @@ def request_password_reset():
     # Issue a password reset token
     token = generate_token(user.email or user.phone_number) # generate_token usually takes an identifier
     reset_url = f"{request.host_url}reset-password/{token}"
+    # A link delivered after the token expired would only lead to an error page.
+    link_expires_at = datetime.utcnow() + timedelta(seconds=CONFIRM_TOKEN_MAX_AGE)
     
-    # Determine delivery method
+    # Determine delivery method; the outbox dispatcher sends it after the commit
     if user.phone_number == identifier or (not user.email and user.phone_number):
         # Send via SMS
-        sms_service = SMSService()
-        message = f"رابط إعادة تعيين كلمة المرور لـ ELITE: {reset_url}"
-        sms_service.send_sms(user.phone_number, message)
+        enqueue_sms(
+            user.phone_number,
+            f"رابط إعادة تعيين كلمة المرور لـ ELITE: {reset_url}",
+            expires_at=link_expires_at,
+        )
     else:
         # Send via Email
-        send_email(
+        enqueue_email(
             user.email,
             "Reset Your Elite Discounts Password",
             "core/emails/password_reset.html",
             {"reset_url": reset_url, "recipient_name": user.username or user.email},
+            expires_at=link_expires_at,
         )
-        
+    _get_db().session.commit()
+
     return jsonify({"message": success_msg}), HTTPStatus.OK
 
 
@@ -57,6 +57,7 @@ def create_token(user_id: int) -> str:
 # Default cookie configuration for issued authentication tokens.
 AUTH_COOKIE_NAME = "elite_token"
 AUTH_COOKIE_MAX_AGE = 60 * 60 * 24  # 24 hours
+CONFIRM_TOKEN_MAX_AGE = 60 * 60  # 1 hour
 
 
 def _auth_cookie_parameters() -> dict[str, Any]:
@@ -140,7 +141,7 @@ def generate_token(email: str) -> str:
     return serializer.dumps(email, salt="email-confirm")
 
 
-def confirm_token(token: str, expiration: int = 3600) -> Optional[str]:
+def confirm_token(token: str, expiration: int = CONFIRM_TOKEN_MAX_AGE) -> Optional[str]:
     """Validate a confirmation token and return the original email when valid."""
 
     serializer = URLSafeTimedSerializer(current_app.config["SECRET_KEY"])
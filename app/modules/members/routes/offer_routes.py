@@ -1,24 +1,45 @@
 # LINKED: Shared Offers & Redemptions Integration (no schema changes)
 """Offer CRUD blueprint providing JSON endpoints."""
 
+import base64
+import binascii
 from datetime import datetime
 
-from flask import Blueprint, jsonify, request
-from sqlalchemy.orm import joinedload
+from flask import Blueprint, current_app, jsonify, request
 
 from app.core.database import db
 from app.models import Company, Offer
+from app.modules.companies.services.company_offers_service import (
+    get_industry_icon_map,
+    list_offers_page,
+)
 from app.modules.members.services.member_notifications_service import (
     broadcast_new_offer,
 )
 from app.services.access_control import require_role
+from app.services.catalog_version_service import get_catalog_version
 
 
 offers = Blueprint("offers", __name__)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+_MISSING = object()
+
+
+def _serialize_offer(offer: Offer, membership_level: str, industry_icons: dict | None = None) -> dict:
+    """Return a dictionary representation of an offer.
 
-def _serialize_offer(offer: Offer, membership_level: str) -> dict:
-    """Return a dictionary representation of an offer."""
+    ``industry_icons`` is an optional preloaded industry → icon map used to
+    avoid one lookup query per offer when serializing a list.
+    """
+
+    if offer.company is None:
+        industry_icon = None
+    elif industry_icons is not None:
+        industry_icon = industry_icons.get(offer.company.industry)
+    else:
+        industry_icon = offer.company.industry_icon
 
     # TODO: Incentives will be calculated based on verified usage.
     dynamic_discount = offer.base_discount
@@ -30,12 +51,14 @@ def _serialize_offer(offer: Offer, membership_level: str) -> dict:
         "discount_percent": dynamic_discount,
         "valid_until": offer.valid_until.isoformat() if offer.valid_until else None,
         "image_url": offer.image_url or "",
+        "image_renditions": offer.image_renditions or {},
         "company_id": offer.company_id,
         "company": offer.company.name if offer.company else None,
         "company_summary": (offer.company.description or "")[:140] if offer.company else "",
         "company_description": (offer.company.description or "") if offer.company else "",
         "company_logo_url": offer.company.logo_url if offer.company else "",
-        "industry_icon": offer.company.industry_icon if offer.company else None,
+        "company_logo_renditions": (offer.company.logo_renditions or {}) if offer.company else {},
+        "industry_icon": industry_icon,
         "classification_values": offer.classification_values,
         "created_at": offer.created_at.isoformat() if offer.created_at else None,
     }
@@ -52,15 +75,120 @@ def _parse_datetime(value):
         return None
 
 
+OFFER_FIELDS = frozenset(
+    {
+        "id",
+        "title",
+        "description",
+        "base_discount",
+        "discount_percent",
+        "valid_until",
+        "image_url",
+        "image_renditions",
+        "company_id",
+        "company",
+        "company_summary",
+        "company_description",
+        "company_logo_url",
+        "company_logo_renditions",
+        "industry_icon",
+        "classification_values",
+        "created_at",
+    }
+)
+
+
+def _encode_cursor(offer_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{offer_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    """Return the offer id encoded in ``cursor`` or ``_MISSING`` when malformed."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, _, value = base64.urlsafe_b64decode(padded.encode()).decode().partition(":")
+        if prefix != "id":
+            return _MISSING
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return _MISSING
+
+
 @offers.route("/", methods=["GET"], endpoint="list_offers")
 def list_offers():
-    """Return all offers provided by registered companies."""
+    """Return one cursor-paginated page of offers.
+
+    Query parameters: ``cursor`` (opaque, from ``next_cursor``), ``limit``
+    (1-200), ``status``, ``company_id``, ``classification`` and ``fields``
+    (comma separated subset of the offer keys). Responses carry a weak ETag
+    derived from the catalogue version so unchanged pages revalidate with 304.
+    """
 
     # TODO: Incentives will be calculated based on verified usage.
     membership_level = ""
 
-    offers = Offer.query.options(joinedload(Offer.company)).order_by(Offer.id).all()
-    return jsonify([_serialize_offer(offer, membership_level) for offer in offers]), 200
+    args = request.args
+    after_id = None
+    if args.get("cursor"):
+        after_id = _decode_cursor(args["cursor"])
+        if after_id is _MISSING:
+            return jsonify({"error": "invalid_cursor"}), 400
+
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    company_id = args.get("company_id")
+    if company_id is not None:
+        try:
+            company_id = int(company_id)
+        except ValueError:
+            return jsonify({"error": "company_id must be an integer."}), 400
+
+    fields = None
+    if args.get("fields"):
+        fields = [name.strip() for name in args["fields"].split(",") if name.strip()]
+        unknown = sorted(set(fields) - OFFER_FIELDS)
+        if unknown:
+            return jsonify({"error": "invalid_fields", "invalid_fields": unknown}), 400
+
+    catalog_version = get_catalog_version()
+    etag = f"catalog-{catalog_version}" if catalog_version is not None else None
+    if etag and request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "public, no-cache"
+        return response
+
+    page, next_after_id = list_offers_page(
+        after_id=after_id,
+        limit=limit,
+        status=args.get("status") or None,
+        company_id=company_id,
+        classification=args.get("classification") or None,
+    )
+    industry_icons = get_industry_icon_map()
+    items = []
+    for offer in page:
+        data = _serialize_offer(offer, membership_level, industry_icons)
+        if fields:
+            data = {name: data[name] for name in fields}
+        items.append(data)
+
+    response = jsonify(
+        {
+            "items": items,
+            "next_cursor": _encode_cursor(next_after_id) if next_after_id else None,
+            "catalog_version": catalog_version,
+        }
+    )
+    if etag:
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "public, no-cache"
+    return response, 200
 
 
 @offers.route("/", methods=["POST"], endpoint="create_offer")
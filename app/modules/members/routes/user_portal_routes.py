@@ -12,9 +12,11 @@ from typing import Dict, Optional, Tuple
 from urllib.parse import quote
 
 from flask import Blueprint, Response, jsonify, redirect, render_template, request, url_for
+from sqlalchemy.orm import joinedload
 
 from app.core.database import db
-from app.models import ActivityLog, Notification, Offer, User
+from app.models import Notification, Offer, RedemptionEvent, User
+from app.modules.admin.services.admin_settings_service import get_admin_settings
 from app.modules.members.auth.utils import AUTH_COOKIE_NAME, get_user_from_token
 from app.modules.members.services.member_notifications_service import (
     notify_offer_feedback,
@@ -23,10 +25,13 @@ from app.modules.companies.services.company_offers_service import (
     OfferCompanyBundle,
     get_company_brief,
     get_portal_offers_with_company,
+    query_offer_facets,
 )
 
 from app.services.activity_evaluation_service import is_member_active
 from app.services.incentive_eligibility_service import get_offer_runtime_flags
+from app.services.redemption_ledger_service import usage_attempts
+from app.services.search_service import MAX_RESULTS, search_offers
 
 portal = Blueprint(
     "portal",
@@ -113,7 +118,7 @@ def _membership_card_payload(user: Optional[User]) -> Dict[str, str]:
     }
 
 
-def _activity_label(entry: ActivityLog) -> str:
+def _activity_label(entry: RedemptionEvent) -> str:
     result = (entry.result or "").strip().lower()
     labels = {
         "valid": "تم التفعيل بنجاح",
@@ -129,7 +134,7 @@ def _activity_label(entry: ActivityLog) -> str:
     return labels.get(result, "محاولة تفعيل")
 
 
-def _activity_status(entry: ActivityLog) -> str:
+def _activity_status(entry: RedemptionEvent) -> str:
     result = (entry.result or "").strip().lower()
     if result in {"valid", "success"}:
         return "success"
@@ -142,8 +147,10 @@ def _activity_status(entry: ActivityLog) -> str:
 
 def _member_activity_entries(user: User, limit: int = 12) -> list[dict]:
     entries = (
-        ActivityLog.query.filter_by(member_id=user.id, action="usage_code_attempt")
-        .order_by(ActivityLog.created_at.desc())
+        usage_attempts()
+        .options(joinedload(RedemptionEvent.offer), joinedload(RedemptionEvent.partner))
+        .filter_by(member_id=user.id)
+        .order_by(RedemptionEvent.created_at.desc())
         .limit(limit)
         .all()
     )
@@ -217,8 +224,9 @@ def member_portal_offers():
     if user is None:
         return _redirect_to_login()
     offers_data = get_portal_offers_with_company()
+    settings = get_admin_settings()
     offer_runtime_flags = {
-        offer.id: get_offer_runtime_flags(user.id if user else None, offer.id)
+        offer.id: get_offer_runtime_flags(user.id if user else None, offer.id, offer=offer, settings=settings)
         for offer in offers_data
     }
     return render_template(
@@ -280,6 +288,45 @@ def offer_feedback(offer_id: int):
     return jsonify({"ok": True, "action": action})
 
 
+@portal.route("/api/search", methods=["GET"], endpoint="search")
+def search():
+    """Return active offers matching the member's search box query."""
+
+    user = _resolve_user_context()
+    if user is None:
+        return jsonify({"error": "Unauthorized"}), 401
+    query_text = (request.args.get("q") or "").strip()
+    limit = request.args.get("limit", 20, type=int) or 20
+    results = search_offers(query_text, limit=min(limit, MAX_RESULTS))
+    return jsonify({"query": query_text, "results": results})
+
+
+@portal.route("/api/offers/facets", methods=["GET"], endpoint="offer_facets")
+def offer_facets():
+    """Return matching offer ids and facet counts for the offers filter sheet."""
+
+    user = _resolve_user_context()
+    if user is None:
+        return jsonify({"error": "Unauthorized"}), 401
+    result = query_offer_facets(
+        city=(request.args.get("city") or "").strip() or None,
+        industry=(request.args.get("industry") or "").strip() or None,
+        classification=(request.args.get("classification") or "").strip() or None,
+        ids_only=True,
+    )
+    return jsonify(
+        {
+            "total": result.total,
+            "offer_ids": result.offer_ids,
+            "facets": {
+                "city": result.cities,
+                "industry": result.industries,
+                "classification": result.classifications,
+            },
+        }
+    )
+
+
 @portal.route(
     "/companies/<int:company_id>", methods=["GET"], endpoint="company_brief"
 )
@@ -7,17 +7,18 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 
 from flask import url_for
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func
 
 from app import celery, redis_client
+from app.core import json_provider
+from app.core.metrics import track_redis
 from app.core.database import db
 from app.models import Notification
-from app.models import Offer, User
+from app.models import Offer, OfferFeedback, User
 
 
 # Redis-backed admin notification keys and defaults
@@ -283,6 +284,28 @@ def _company_recipient_ids(company_id: int) -> List[int]:
 
 
 
+def record_offer_feedback(
+    *,
+    company_id: int,
+    offer_id: int,
+    user_id: Optional[int],
+    action: str,
+    note: Optional[str] = None,
+) -> OfferFeedback:
+    """Persist a single feedback event in the ``offer_feedback`` fact table."""
+
+    feedback = OfferFeedback(
+        company_id=company_id,
+        offer_id=offer_id,
+        user_id=user_id,
+        action=action,
+        note=note,
+    )
+    db.session.add(feedback)
+    db.session.commit()
+    return feedback
+
+
 def notify_offer_feedback(
     *,
     company_id: int,
@@ -291,7 +314,15 @@ def notify_offer_feedback(
     action: str,
     note: Optional[str] = None,
 ) -> None:
-    """Send a lightweight feedback notification to company recipients."""
+    """Record the feedback event and send a lightweight notification to company recipients."""
+
+    record_offer_feedback(
+        company_id=company_id,
+        offer_id=offer_id,
+        user_id=user_id,
+        action=action,
+        note=note,
+    )
 
     metadata = {
         "offer_id": offer_id,
@@ -316,33 +347,26 @@ def notify_offer_feedback(
             continue
 
 
-def fetch_offer_feedback_counts(company_id: int) -> Dict[int, int]:
-    """Return aggregated feedback counts per offer for the company."""
+def fetch_offer_feedback_counts(
+    company_id: int, *, action: Optional[str] = None
+) -> Dict[int, int]:
+    """Return aggregated feedback counts per offer for the company.
+
+    Counts are computed with a single ``GROUP BY`` over the ``offer_feedback``
+    fact table; pass ``action`` to restrict the totals to one interaction type.
+    """
 
     if not company_id:
         return {}
 
-    notifications: Sequence[Notification] = (
-        Notification.query.options(joinedload(Notification.user))
-        .join(User, User.id == Notification.user_id)
-        .filter(
-            Notification.type == "offer_feedback",
-            User.is_active.is_(True),
-            (User.company_id == company_id)
-            | (User.owned_companies.any(id=company_id)),
-        )
-        .order_by(Notification.created_at.desc())
-        .all()
-    )
+    query = db.session.query(
+        OfferFeedback.offer_id, func.count(OfferFeedback.id)
+    ).filter(OfferFeedback.company_id == company_id)
+    if action:
+        query = query.filter(OfferFeedback.action == action)
 
-    counts: Dict[int, int] = {}
-    for notification in notifications:
-        metadata = notification.metadata_json or {}
-        offer_id = metadata.get("offer_id")
-        if not offer_id:
-            continue
-        counts[offer_id] = counts.get(offer_id, 0) + 1
-    return counts
+    rows = query.group_by(OfferFeedback.offer_id).all()
+    return {offer_id: int(total) for offer_id, total in rows}
 
 
 @celery.task(name="notifications.create")
@@ -392,7 +416,6 @@ def broadcast_offer_task(offer_id: int, batch_size: int = 100):
                 link_url=url_for("portal.member_portal_offers"),
                 metadata_json={
                     "offer_id": offer.id,
-                    "membership_level": user.membership_level,
                     "base_discount": offer.base_discount,
                 },
             )
@@ -434,20 +457,23 @@ def push_admin_notification(
         "company_id": company_id,
         "ttl_days": ttl_days,
     }
-    redis_client.lpush(ADMIN_NOTIF_LIST_KEY, json.dumps(payload))
-    redis_client.ltrim(ADMIN_NOTIF_LIST_KEY, 0, MAX_LIST_SIZE - 1)
+    with track_redis("lpush"):
+        redis_client.lpush(ADMIN_NOTIF_LIST_KEY, json_provider.dumps(payload))
+    with track_redis("ltrim"):
+        redis_client.ltrim(ADMIN_NOTIF_LIST_KEY, 0, MAX_LIST_SIZE - 1)
 
 
 def list_admin_notifications(limit: int = 20) -> List[Dict[str, Any]]:
     """Return the most recent, non-expired admin notification payloads."""
 
-    raw_items = redis_client.lrange(ADMIN_NOTIF_LIST_KEY, 0, limit - 1) or []
+    with track_redis("lrange"):
+        raw_items = redis_client.lrange(ADMIN_NOTIF_LIST_KEY, 0, limit - 1) or []
     items: List[Dict[str, Any]] = []
     now = datetime.utcnow()
 
     for raw in raw_items:
         try:
-            obj = json.loads(raw)
+            obj = json_provider.loads(raw)
         except Exception:  # pragma: no cover - guard against malformed payloads
             continue
 
@@ -469,7 +495,8 @@ def list_admin_notifications(limit: int = 20) -> List[Dict[str, Any]]:
 def get_unread_count(user_id: int, sample_limit: int = 50) -> int:
     """Return the number of unread notifications since the user's last seen timestamp."""
 
-    last_seen = redis_client.get(ADMIN_NOTIF_LAST_SEEN_KEY.format(user_id=user_id))
+    with track_redis("get"):
+        last_seen = redis_client.get(ADMIN_NOTIF_LAST_SEEN_KEY.format(user_id=user_id))
     if not last_seen:
         return len(list_admin_notifications(sample_limit))
 
@@ -523,7 +550,8 @@ def get_notifications_for_user(user_id: int, limit: int = 20) -> list[dict]:
 def mark_all_read(user_id: int) -> None:
     """Mark all admin notifications as read for the specified administrator."""
 
-    redis_client.set(ADMIN_NOTIF_LAST_SEEN_KEY.format(user_id=user_id), _now_iso())
+    with track_redis("set"):
+        redis_client.set(ADMIN_NOTIF_LAST_SEEN_KEY.format(user_id=user_id), _now_iso())
 
 
 __all__ = [
@@ -534,6 +562,7 @@ __all__ = [
     "ensure_welcome_notification",
     "notify_membership_upgrade",
 
+    "record_offer_feedback",
     "notify_offer_feedback",
     "fetch_offer_feedback_counts",
     "create_notification_task",
@@ -272,12 +272,13 @@
             return;
         }
         try {
-            const response = await fetch("/api/offers/", { credentials: "include" });
+            const response = await fetch("/api/offers/?limit=6&status=active", { credentials: "include" });
             if (!response.ok) {
                 throw new Error("Unable to fetch offers");
             }
-            const offers = await response.json();
-            if (!Array.isArray(offers) || offers.length === 0) {
+            const payload = await response.json();
+            const offers = payload && Array.isArray(payload.items) ? payload.items : [];
+            if (offers.length === 0) {
                 return;
             }
             track.dataset.hydrated = "true";
@@ -294,7 +295,8 @@
                 card.dataset.offerDescription = offer.description || "";
                 card.dataset.offerDiscount = Math.round(offer.discount_percent || offer.base_discount || 0);
                 card.dataset.offerValid = offer.valid_until ? offer.valid_until.split("T")[0] : "مستمر";
-                card.dataset.offerImage = offer.image_url || "";
+                const modalRendition = (offer.image_renditions || {}).modal || {};
+                card.dataset.offerImage = modalRendition.jpeg || offer.image_url || "";
                 card.dataset.offerCompanyLogo = offer.company_logo_url || "";
                 card.dataset.offerClassifications = (offer.classification_values || []).join(",");
                 const industryIcon = offer.industry_icon || 'fix.png';
@@ -1358,6 +1360,10 @@
         const cards = viewContainer.querySelectorAll(".offers-grid .offer-card");
 
         let selectedCategories = [];
+        // Offer ids returned by the server-side (Arabic-normalized) search.
+        let serverMatches = null;
+        let searchTimer = null;
+        let searchSequence = 0;
 
         function applyFilters() {
             const query = searchInput ? searchInput.value.toLowerCase().trim() : "";
@@ -1367,7 +1373,9 @@
                 const company = (card.dataset.companyName || "").toLowerCase();
                 const cardCategory = card.dataset.category || "";
 
-                const matchesSearch = !query || title.includes(query) || company.includes(query);
+                const matchesSearch = !query || (serverMatches
+                    ? serverMatches.has(String(card.dataset.offerId))
+                    : title.includes(query) || company.includes(query));
                 const matchesCategory = selectedCategories.length === 0 || selectedCategories.includes(cardCategory);
 
                 if (matchesSearch && matchesCategory) {
@@ -1401,23 +1409,72 @@
             }
         }
 
+        async function runServerSearch(query, sequence) {
+            try {
+                const response = await fetch(`/portal/api/search?q=${encodeURIComponent(query)}&limit=200`, {
+                    credentials: "include",
+                });
+                if (!response.ok || sequence !== searchSequence) {
+                    return;
+                }
+                const payload = await response.json();
+                serverMatches = new Set((payload.results || []).map((item) => String(item.id)));
+                applyFilters();
+            } catch (error) {
+                console.warn("Offer search unavailable", error);
+            }
+        }
+
+        function handleSearchInput() {
+            serverMatches = null;
+            applyFilters();
+            const query = searchInput.value.trim();
+            searchSequence += 1;
+            window.clearTimeout(searchTimer);
+            if (query.length < 2) {
+                return;
+            }
+            const sequence = searchSequence;
+            searchTimer = window.setTimeout(() => runServerSearch(query, sequence), 200);
+        }
+
         if (searchInput) {
-            searchInput.addEventListener("input", applyFilters);
+            searchInput.addEventListener("input", handleSearchInput);
+            const initialQuery = new URLSearchParams(window.location.search).get("q");
+            if (initialQuery) {
+                searchInput.value = initialQuery;
+                handleSearchInput();
+            }
         }
 
         if (filterTrigger) {
-            filterTrigger.addEventListener("click", () => {
+            filterTrigger.addEventListener("click", async () => {
                 if (!modal || !modalBody || !modalTitle) return;
 
-                const categories = JSON.parse(filterTrigger.dataset.categories || "[]");
+                let categories = JSON.parse(filterTrigger.dataset.categories || "[]");
+                let industryCounts = {};
+                try {
+                    const response = await fetch("/portal/api/offers/facets", { credentials: "include" });
+                    if (response.ok) {
+                        const payload = await response.json();
+                        industryCounts = (payload.facets && payload.facets.industry) || {};
+                        const ranked = Object.keys(industryCounts);
+                        if (ranked.length) {
+                            categories = ranked;
+                        }
+                    }
+                } catch (error) {
+                    console.warn("Offer facets unavailable", error);
+                }
                 modalTitle.textContent = "تصفية العروض";
 
                 let html = '<div class="filter-category-list">';
                 categories.forEach(cat => {
                     const isChecked = selectedCategories.includes(cat);
+                    const count = industryCounts[cat];
                     html += `
                         <div class="filter-category-item" data-category-row>
-                            <label for="cat-${cat}">${cat}</label>
+                            <label for="cat-${cat}">${cat}${count ? ` (${count})` : ""}</label>
                             <input type="checkbox" id="cat-${cat}" value="${cat}" ${isChecked ? 'checked' : ''} data-filter-checkbox>
                         </div>
                     `;
@@ -1454,6 +1511,25 @@
         }
     }
 
+    /** Send home screen searches to the offers view, which runs the query. */
+    function bindHomeSearch() {
+        const homeInput = viewContainer.querySelector("#home-search-input");
+        if (!homeInput) {
+            return;
+        }
+        homeInput.addEventListener("keydown", (event) => {
+            if (event.key !== "Enter") {
+                return;
+            }
+            event.preventDefault();
+            const query = homeInput.value.trim();
+            if (!query) {
+                return;
+            }
+            fetchAndRender(`/portal/offers?q=${encodeURIComponent(query)}`, "offers", true);
+        });
+    }
+
     /** Attach listeners for inline navigation links. */
     function bindInlineNavigation() {
         viewContainer.querySelectorAll("[data-nav-link]").forEach((link) => {
@@ -1469,6 +1545,7 @@
         bindProfileActions();
         bindNotificationActions();
         bindOffersFilter();
+        bindHomeSearch();
         hydrateFeaturedCarousel();
     }
 
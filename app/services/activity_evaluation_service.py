@@ -7,8 +7,9 @@ from datetime import datetime, timedelta
 from sqlalchemy import func
 
 from app.core.database import db
-from app.models import ActivityLog
+from app.models import RedemptionEvent
 from app.modules.admin.services.admin_settings_service import get_admin_settings
+from app.services.redemption_ledger_service import usage_attempts
 
 
 def _get_activity_rules(setting_key: str) -> dict:
@@ -24,10 +25,7 @@ def _window_start(time_window_days: int | None) -> datetime:
 
 
 def _base_usage_query(window_start: datetime):
-    return (
-        ActivityLog.query.filter_by(action="usage_code_attempt", result="valid")
-        .filter(ActivityLog.created_at >= window_start)
-    )
+    return usage_attempts(["valid"]).filter(RedemptionEvent.created_at >= window_start)
 
 
 def is_member_active(member_id: int) -> bool:
@@ -62,8 +60,8 @@ def is_partner_active(partner_id: int) -> bool:
 
     if require_unique_customers:
         usage_count = (
-            base_query.filter(ActivityLog.member_id.isnot(None))
-            .with_entities(func.count(func.distinct(ActivityLog.member_id)))
+            base_query.filter(RedemptionEvent.member_id.isnot(None))
+            .with_entities(func.count(func.distinct(RedemptionEvent.member_id)))
             .scalar()
             or 0
         )
@@ -9,50 +9,55 @@ from sqlalchemy import func
 from sqlalchemy.orm import Query
 
 from app.core.database import db
-from app.models import ActivityLog
+from app.core.read_replica import read_replica
+from app.models import RedemptionEvent
 from app.modules.admin.services.admin_settings_service import get_admin_settings
+from app.services.redemption_ledger_service import applied_incentives, usage_attempts
 
 
 def _apply_date_range(
     query: Query, *, date_from: datetime | None, date_to: datetime | None
 ) -> Query:
     if date_from is not None:
-        query = query.filter(ActivityLog.created_at >= date_from)
+        query = query.filter(RedemptionEvent.created_at >= date_from)
     if date_to is not None:
-        query = query.filter(ActivityLog.created_at <= date_to)
+        query = query.filter(RedemptionEvent.created_at <= date_to)
     return query
 
 
+@read_replica
 def total_usage_attempts(
     *, date_from: datetime | None = None, date_to: datetime | None = None
 ) -> int:
     """Return total usage verification attempts within an optional date range."""
 
-    query = ActivityLog.query.filter_by(action="usage_code_attempt")
+    query = usage_attempts()
     query = _apply_date_range(query, date_from=date_from, date_to=date_to)
     return int(query.count())
 
 
+@read_replica
 def successful_usages(
     *, date_from: datetime | None = None, date_to: datetime | None = None
 ) -> int:
     """Return the count of successful usage attempts (result="valid")."""
 
-    query = ActivityLog.query.filter_by(action="usage_code_attempt", result="valid")
+    query = usage_attempts(["valid"])
     query = _apply_date_range(query, date_from=date_from, date_to=date_to)
     return int(query.count())
 
 
+@read_replica
 def incentives_applied(
     *, date_from: datetime | None = None, date_to: datetime | None = None
 ) -> Dict[str, int]:
     """Return counts of applied incentives grouped by incentive type."""
 
-    query = ActivityLog.query.filter_by(action="incentive_applied")
+    query = applied_incentives()
     query = _apply_date_range(query, date_from=date_from, date_to=date_to)
     results: Iterable[tuple[str | None, int]] = (
-        query.with_entities(ActivityLog.result, func.count(ActivityLog.id))
-        .group_by(ActivityLog.result)
+        query.with_entities(RedemptionEvent.result, func.count(RedemptionEvent.id))
+        .group_by(RedemptionEvent.result)
         .all()
     )
     return {str(result): int(count or 0) for result, count in results if result}
@@ -65,6 +70,7 @@ def _usage_window_start(time_window_days: int | None) -> datetime:
     return datetime.utcnow() - timedelta(days=days)
 
 
+@read_replica
 def active_members_count(
     *, date_from: datetime | None = None, date_to: datetime | None = None
 ) -> int:
@@ -78,15 +84,15 @@ def active_members_count(
         return 0
 
     window_start = _usage_window_start(time_window_days)
-    query = ActivityLog.query.filter_by(action="usage_code_attempt", result="valid")
-    query = query.filter(ActivityLog.created_at >= window_start)
-    query = query.filter(ActivityLog.member_id.isnot(None))
+    query = usage_attempts(["valid"])
+    query = query.filter(RedemptionEvent.created_at >= window_start)
+    query = query.filter(RedemptionEvent.member_id.isnot(None))
     query = _apply_date_range(query, date_from=date_from, date_to=date_to)
 
     active_members_subquery = (
-        query.with_entities(ActivityLog.member_id)
-        .group_by(ActivityLog.member_id)
-        .having(func.count(ActivityLog.id) >= required_usages)
+        query.with_entities(RedemptionEvent.member_id)
+        .group_by(RedemptionEvent.member_id)
+        .having(func.count(RedemptionEvent.id) >= required_usages)
         .subquery()
     )
 
@@ -94,6 +100,7 @@ def active_members_count(
     return int(count or 0)
 
 
+@read_replica
 def active_partners_count(
     *, date_from: datetime | None = None, date_to: datetime | None = None
 ) -> int:
@@ -108,20 +115,20 @@ def active_partners_count(
         return 0
 
     window_start = _usage_window_start(time_window_days)
-    query = ActivityLog.query.filter_by(action="usage_code_attempt", result="valid")
-    query = query.filter(ActivityLog.created_at >= window_start)
-    query = query.filter(ActivityLog.partner_id.isnot(None))
+    query = usage_attempts(["valid"])
+    query = query.filter(RedemptionEvent.created_at >= window_start)
+    query = query.filter(RedemptionEvent.partner_id.isnot(None))
     query = _apply_date_range(query, date_from=date_from, date_to=date_to)
 
     if require_unique_customers:
-        query = query.filter(ActivityLog.member_id.isnot(None))
-        count_expr = func.count(func.distinct(ActivityLog.member_id))
+        query = query.filter(RedemptionEvent.member_id.isnot(None))
+        count_expr = func.count(func.distinct(RedemptionEvent.member_id))
     else:
-        count_expr = func.count(ActivityLog.id)
+        count_expr = func.count(RedemptionEvent.id)
 
     active_partners_subquery = (
-        query.with_entities(ActivityLog.partner_id)
-        .group_by(ActivityLog.partner_id)
+        query.with_entities(RedemptionEvent.partner_id)
+        .group_by(RedemptionEvent.partner_id)
         .having(count_expr >= required_usages)
         .subquery()
     )
@@ -0,0 +1,111 @@
+"""Monotonic offer-catalogue version stored in Redis.
+
+Every committed transaction that touches an offer, its classifications, a
+company or a lookup choice bumps ``offers:catalog_version``. Readers use the
+value as a cheap change marker (HTTP ETags, cached catalogue snapshots) without
+querying the catalogue tables. When Redis is unreachable the version is
+reported as ``None`` and callers must fall back to uncached behaviour.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import app as app_module
+from app.logging.logger import get_logger
+from app.models import Company, LookupChoice, Offer, OfferClassification
+
+_LOGGER = get_logger(__name__)
+
+CATALOG_VERSION_KEY = "offers:catalog_version"
+_CATALOG_MODELS = (Offer, OfferClassification, Company, LookupChoice)
+_SESSION_FLAG = "catalog_changed"
+_HOOKS_INSTALLED = False
+
+
+def get_catalog_version() -> Optional[str]:
+    """Return the current catalogue version, or ``None`` when Redis is unavailable."""
+
+    client = app_module.redis_client
+    if client is None:
+        return None
+    try:
+        value = client.get(CATALOG_VERSION_KEY)
+        if value is None:
+            # Seed the key so every worker agrees on a starting version.
+            client.setnx(CATALOG_VERSION_KEY, 1)
+            value = client.get(CATALOG_VERSION_KEY)
+    except RedisError:
+        return None
+    return str(value) if value is not None else None
+
+
+def bump_catalog_version() -> Optional[str]:
+    """Advance the catalogue version after a committed catalogue change."""
+
+    client = app_module.redis_client
+    if client is None:
+        return None
+    try:
+        return str(client.incr(CATALOG_VERSION_KEY))
+    except RedisError:
+        _LOGGER.warning(
+            "catalog_version_bump_failed",
+            extra={"log_payload": {"event": "catalog_version_bump_failed", "key": CATALOG_VERSION_KEY}},
+        )
+        return None
+
+
+def _touches_catalog(session: Session) -> bool:
+    for collection in (session.new, session.dirty, session.deleted):
+        for instance in collection:
+            if isinstance(instance, _CATALOG_MODELS):
+                return True
+    return False
+
+
+def _mark_catalog_changes(session: Session, flush_context, instances) -> None:
+    if not session.info.get(_SESSION_FLAG) and _touches_catalog(session):
+        session.info[_SESSION_FLAG] = True
+
+
+def _mark_bulk_catalog_changes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _CATALOG_MODELS):
+        orm_execute_state.session.info[_SESSION_FLAG] = True
+
+
+def _bump_after_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        bump_catalog_version()
+
+
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
+
+
+def register_catalog_version_hooks() -> None:
+    """Install the session hooks that bump the version on catalogue commits."""
+
+    global _HOOKS_INSTALLED
+    if _HOOKS_INSTALLED:
+        return
+    event.listen(Session, "before_flush", _mark_catalog_changes)
+    event.listen(Session, "do_orm_execute", _mark_bulk_catalog_changes)
+    event.listen(Session, "after_commit", _bump_after_commit)
+    event.listen(Session, "after_rollback", _clear_after_rollback)
+    _HOOKS_INSTALLED = True
+
+
+__all__ = [
+    "CATALOG_VERSION_KEY",
+    "get_catalog_version",
+    "bump_catalog_version",
+    "register_catalog_version_hooks",
+]
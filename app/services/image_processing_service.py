@@ -0,0 +1,243 @@
+"""Background image processing for offer images and company logos.
+
+Uploads are stored unmodified by the company portal so the request can return
+immediately; the Celery tasks below then strip metadata and produce resized
+WebP/JPEG renditions with content-hashed filenames. The rendition map is saved
+on ``Offer.image_renditions`` / ``Company.logo_renditions`` so templates can
+emit ``srcset`` attributes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from typing import Dict, Optional
+
+from flask import current_app
+
+from app import celery
+from app.core.database import db
+from app.logging.logger import get_logger
+from app.models import Company, Offer
+
+_LOGGER = get_logger(__name__)
+
+# Fixed rendition widths tuned for the 420px mobile portal shell.
+OFFER_RENDITION_WIDTHS: Dict[str, int] = {"thumb": 160, "card": 420, "modal": 840}
+LOGO_RENDITION_WIDTHS: Dict[str, int] = {"thumb": 64, "card": 128}
+RENDITION_FORMATS = ("webp", "jpeg")
+_SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+_RASTER_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
+_STATIC_URL_PREFIX = "/static/companies/"
+
+
+def _companies_static_root() -> str:
+    return os.path.join(current_app.root_path, "modules", "companies", "static", "companies")
+
+
+def resolve_upload_path(public_url: Optional[str]) -> Optional[str]:
+    """Map a public companies upload URL to its path on disk."""
+
+    if not public_url or not public_url.startswith(_STATIC_URL_PREFIX):
+        return None
+    relative = public_url.split("?", 1)[0][len(_STATIC_URL_PREFIX):]
+    root = _companies_static_root()
+    candidate = os.path.normpath(os.path.join(root, relative))
+    if not candidate.startswith(root + os.sep):
+        return None
+    return candidate
+
+
+def _public_url(path: str) -> str:
+    relative = os.path.relpath(path, _companies_static_root()).replace(os.sep, "/")
+    return f"{_STATIC_URL_PREFIX}{relative}"
+
+
+def _load_clean_image(source_path: str):
+    """Open an image, apply EXIF orientation and drop every metadata block."""
+
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as original:
+        oriented = ImageOps.exif_transpose(original)
+        has_alpha = oriented.mode in {"RGBA", "LA"} or (
+            oriented.mode == "P" and "transparency" in oriented.info
+        )
+        mode = "RGBA" if has_alpha else "RGB"
+        # Copying pixel data into a fresh image leaves EXIF/XMP/ICC info behind.
+        clean = Image.new(mode, oriented.size)
+        clean.paste(oriented.convert(mode))
+    return clean
+
+
+def _encode(image, fmt: str) -> bytes:
+    from PIL import Image
+
+    if fmt == "jpeg" and image.mode != "RGB":
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A") if "A" in image.mode else None)
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, **_SAVE_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def build_renditions(source_path: str, target_dir: str, prefix: str, widths: Dict[str, int]) -> Dict[str, Dict[str, object]]:
+    """Write metadata-free renditions for ``source_path`` and return their public URLs.
+
+    The result maps each rendition name to its pixel width and one URL per
+    format, e.g. ``{"card": {"width": 420, "webp": "...", "jpeg": "..."}}``.
+    Widths larger than the source are clamped so images are never upscaled.
+    """
+
+    from PIL import Image
+
+    clean = _load_clean_image(source_path)
+    os.makedirs(target_dir, exist_ok=True)
+
+    renditions: Dict[str, Dict[str, object]] = {}
+    for name, width in sorted(widths.items(), key=lambda item: item[1]):
+        target_width = min(width, clean.width)
+        target_height = max(1, round(clean.height * target_width / clean.width))
+        resized = clean if target_width == clean.width else clean.resize(
+            (target_width, target_height), Image.LANCZOS
+        )
+
+        entry: Dict[str, object] = {"width": target_width}
+        for fmt in RENDITION_FORMATS:
+            payload = _encode(resized, fmt)
+            digest = hashlib.sha256(payload).hexdigest()[:16]
+            extension = "jpg" if fmt == "jpeg" else fmt
+            filename = f"{prefix}-{name}-{digest}.{extension}"
+            path = os.path.join(target_dir, filename)
+            if not os.path.exists(path):
+                with open(path, "wb") as handle:
+                    handle.write(payload)
+            entry[fmt] = _public_url(path)
+        renditions[name] = entry
+    return renditions
+
+
+def build_srcset(renditions: Optional[Dict[str, Dict[str, object]]], fmt: str = "webp") -> str:
+    """Return a ``srcset`` attribute value for the given rendition map."""
+
+    if not renditions:
+        return ""
+    candidates = sorted(
+        (entry for entry in renditions.values() if isinstance(entry, dict) and entry.get(fmt)),
+        key=lambda entry: int(entry.get("width") or 0),
+    )
+    return ", ".join(f"{entry[fmt]} {int(entry['width'])}w" for entry in candidates)
+
+
+def pick_rendition(
+    renditions: Optional[Dict[str, Dict[str, object]]], name: str, fmt: str = "jpeg"
+) -> Optional[str]:
+    """Return the URL of a single named rendition when available."""
+
+    if not renditions:
+        return None
+    entry = renditions.get(name)
+    if not isinstance(entry, dict):
+        return None
+    return entry.get(fmt)  # type: ignore[return-value]
+
+
+def _is_raster(path: Optional[str]) -> bool:
+    if not path or not os.path.isfile(path):
+        return False
+    return path.rsplit(".", 1)[-1].lower() in _RASTER_EXTENSIONS
+
+
+def queue_offer_image_processing(offer: Offer) -> None:
+    """Schedule rendition generation for the offer's current image."""
+
+    if not _is_raster(resolve_upload_path(offer.image_url)):
+        return
+    try:
+        process_offer_image_task.delay(offer_id=offer.id, image_url=offer.image_url)
+    except Exception:  # pragma: no cover - broker outages must not break uploads
+        _LOGGER.warning(
+            "image_processing_queue_failed",
+            extra={"log_payload": {"event": "image_processing_queue_failed", "offer_id": offer.id}},
+            exc_info=True,
+        )
+
+
+def queue_company_logo_processing(company: Company) -> None:
+    """Schedule rendition generation for the company's current logo."""
+
+    if not _is_raster(resolve_upload_path(company.logo_url)):
+        return
+    try:
+        process_company_logo_task.delay(company_id=company.id, logo_url=company.logo_url)
+    except Exception:  # pragma: no cover - broker outages must not break uploads
+        _LOGGER.warning(
+            "image_processing_queue_failed",
+            extra={"log_payload": {"event": "image_processing_queue_failed", "company_id": company.id}},
+            exc_info=True,
+        )
+
+
+@celery.task(name="media.process_offer_image")
+def process_offer_image_task(offer_id: int, image_url: str):
+    """Generate renditions for an offer image unless it was replaced meanwhile."""
+
+    offer = Offer.query.get(offer_id)
+    if offer is None or offer.image_url != image_url:
+        return None
+
+    source_path = resolve_upload_path(image_url)
+    if not _is_raster(source_path):
+        return None
+
+    renditions = build_renditions(
+        source_path,
+        os.path.join(os.path.dirname(source_path), "renditions"),
+        f"offer-{offer.id}",
+        OFFER_RENDITION_WIDTHS,
+    )
+    offer.image_renditions = renditions
+    db.session.commit()
+    return renditions
+
+
+@celery.task(name="media.process_company_logo")
+def process_company_logo_task(company_id: int, logo_url: str):
+    """Generate renditions for a company logo unless it was replaced meanwhile."""
+
+    company = Company.query.get(company_id)
+    if company is None or company.logo_url != logo_url:
+        return None
+
+    source_path = resolve_upload_path(logo_url)
+    if not _is_raster(source_path):
+        return None
+
+    renditions = build_renditions(
+        source_path,
+        os.path.join(os.path.dirname(source_path), "renditions"),
+        "logo",
+        LOGO_RENDITION_WIDTHS,
+    )
+    company.logo_renditions = renditions
+    db.session.commit()
+    return renditions
+
+
+__all__ = [
+    "OFFER_RENDITION_WIDTHS",
+    "LOGO_RENDITION_WIDTHS",
+    "build_renditions",
+    "build_srcset",
+    "pick_rendition",
+    "resolve_upload_path",
+    "queue_offer_image_processing",
+    "queue_company_logo_processing",
+    "process_offer_image_task",
+    "process_company_logo_task",
+]
@@ -6,9 +6,10 @@ from datetime import datetime, time, timedelta
 
 from sqlalchemy.orm import lazyload
 from app.core.database import db
-from app.models import ActivityLog, Offer
+from app.models import Offer, RedemptionEvent
 from app.modules.admin.services.admin_settings_service import get_admin_settings
 from app.services.incentive_eligibility_service import evaluate_offer_eligibility
+from app.services.redemption_ledger_service import INCENTIVE_APPLIED, applied_incentives, record_event
 
 
 def _end_of_next_week(now: datetime) -> datetime:
@@ -60,26 +61,17 @@ def _has_recent_incentive(
     window_end: datetime | None,
     for_update: bool = False,
 ) -> bool:
-    query = (
-        ActivityLog.query.options(
-            lazyload(ActivityLog.admin),
-            lazyload(ActivityLog.company),
-            lazyload(ActivityLog.member),
-            lazyload(ActivityLog.partner),
-            lazyload(ActivityLog.offer),
-        ).filter_by(
-            action="incentive_applied",
-            member_id=member_id,
-            offer_id=offer_id,
-            result=incentive_result,
-        )
+    query = applied_incentives().filter_by(
+        member_id=member_id,
+        offer_id=offer_id,
+        result=incentive_result,
     )
     if for_update:
         query = query.with_for_update()
     if window_start is not None:
-        query = query.filter(ActivityLog.created_at >= window_start)
+        query = query.filter(RedemptionEvent.created_at >= window_start)
     if window_end is not None:
-        query = query.filter(ActivityLog.created_at <= window_end)
+        query = query.filter(RedemptionEvent.created_at <= window_end)
     return query.first() is not None
 
 
@@ -150,20 +142,14 @@ def apply_incentive(
                         else None,
                     }
 
-                log_entry = ActivityLog(
-                    admin_id=None,
-                    company_id=None,
-                    action="incentive_applied",
-                    details=f"Incentive applied result: {incentive_type}",
+                record_event(
+                    INCENTIVE_APPLIED,
                     member_id=member_id,
                     partner_id=offer.company_id if offer else None,
                     offer_id=offer_id,
-                    code_used=None,
                     result=incentive_type,
                     created_at=now,
-                    timestamp=now,
                 )
-                db.session.add(log_entry)
                 applied = True
 
     return {
@@ -5,9 +5,10 @@ from __future__ import annotations
 from sqlalchemy import func
 
 from app.core.database import db
-from app.models import ActivityLog, Offer
+from app.models import Offer
 from app.modules.admin.services.admin_settings_service import get_admin_settings
 from app.services.activity_evaluation_service import is_member_active, is_partner_active
+from app.services.redemption_ledger_service import usage_attempts
 
 
 def _partner_rules_enabled(settings: dict) -> bool:
@@ -35,12 +36,8 @@ def _has_used_offer(member_id: int, offer_id: int) -> bool:
         return False
     
     count = (
-        ActivityLog.query.filter_by(
-            action="usage_code_attempt",
-            member_id=member_id,
-            offer_id=offer_id
-        )
-        .filter(ActivityLog.result.in_(["valid", "success"]))
+        usage_attempts(["valid", "success"])
+        .filter_by(member_id=member_id, offer_id=offer_id)
         .count()
     )
     return count > 0
@@ -52,21 +49,25 @@ def _get_partner_redemption_count(member_id: int, partner_id: int) -> int:
         return 0
 
     return (
-        ActivityLog.query.filter_by(
-            action="usage_code_attempt",
-            member_id=member_id,
-            partner_id=partner_id
-        )
-        .filter(ActivityLog.result.in_(["valid", "success"]))
+        usage_attempts(["valid", "success"])
+        .filter_by(member_id=member_id, partner_id=partner_id)
         .count()
     )
 
 
-def evaluate_offer_eligibility(member_id: int | None, offer_id: int) -> dict:
-    """Return eligibility for a member/offer pair based on admin settings."""
+def evaluate_offer_eligibility(member_id: int | None, offer_id: int, offer=None, settings=None) -> dict:
+    """Return eligibility for a member/offer pair based on admin settings.
 
-    offer = Offer.query.get(offer_id)
-    settings = get_admin_settings()
+    ``offer`` may be a pre-loaded offer (or catalogue snapshot record) exposing
+    ``id``, ``company_id`` and ``classification_values`` to skip the lookup.
+    Pages evaluating many offers pass ``settings`` from one
+    :func:`get_admin_settings` call instead of reloading them per offer.
+    """
+
+    if offer is None:
+        offer = Offer.query.get(offer_id)
+    if settings is None:
+        settings = get_admin_settings()
     applied_rules: list[str] = []
     eligible = True
     reason = "eligible"
@@ -135,10 +136,10 @@ def evaluate_offer_eligibility(member_id: int | None, offer_id: int) -> dict:
     }
 
 
-def get_offer_runtime_flags(member_id: int | None, offer_id: int) -> dict:
+def get_offer_runtime_flags(member_id: int | None, offer_id: int, offer=None, settings=None) -> dict:
     """Return runtime flags for offer visibility and eligibility in templates."""
 
-    eligibility = evaluate_offer_eligibility(member_id, offer_id)
+    eligibility = evaluate_offer_eligibility(member_id, offer_id, offer=offer, settings=settings)
     applied_rules = set(eligibility.get("applied_rules", []))
     reason = eligibility.get("reason") or "eligible"
     
@@ -10,6 +10,7 @@ from flask import current_app, render_template
 from flask_mail import Message
 
 from app import mail
+from app.core.template_context import without_user_context
 
 WELCOME_EMAIL_SUBJECTS: Dict[str, str] = {
     "member": "مرحبًا بك في ELITE – عروضك المميزة بانتظارك!",
@@ -93,7 +94,9 @@ def send_email(
 
     safe_context = dict(context or {})
 
-    html_body = render_template(template, **safe_context)
+    # Email bodies never show the signed-in user's badges or labels.
+    with without_user_context():
+        html_body = render_template(template, **safe_context)
 
     if current_app.config.get("MAIL_SUPPRESS_SEND", False):
         return True
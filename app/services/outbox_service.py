@@ -0,0 +1,518 @@
+"""Transactional outbox for emails, SMS and admin notifications.
+
+Business code calls :func:`enqueue` (or one of the ``enqueue_*`` helpers)
+*before* committing, so the :class:`~app.models.OutboxMessage` row is written in
+the same transaction as the change it announces: a rolled-back change sends
+nothing and a committed one cannot lose its message. The request returns as
+soon as the commit completes.
+
+Delivery happens in :func:`dispatch_batch`, run by the ``outbox.dispatch``
+Celery task. The task is queued right after a commit that enqueued messages
+and also runs on the beat schedule, which picks up anything the broker missed.
+Rows are claimed with ``FOR UPDATE SKIP LOCKED`` (where supported) and leased
+for ``OUTBOX_LEASE_SECONDS``, so a worker that dies mid-batch only delays
+its messages. Failed deliveries are retried with exponential backoff and
+jitter until ``OUTBOX_MAX_ATTEMPTS``, then parked as ``failed``.
+
+Delivery is at least once: a handler can run again if the worker dies after
+the side effect but before recording it, so handlers must tolerate repeats.
+
+Messages that are useless once late (OTP codes, password-reset links) are
+enqueued with ``expires_at``; a message still undelivered by then is marked
+``failed`` instead of being sent. Once a message is sent, or expires, its
+payload is cleared so codes and links do not sit in the table until the
+retention sweep removes the row.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+
+from app import celery
+from app.core.database import db
+from app.core.metrics.instruments import record_outbox_delivery
+from app.logging.logger import get_logger
+from app.models import Company, OutboxMessage
+
+_LOGGER = get_logger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+KIND_EMAIL = "email"
+KIND_COMPANY_EMAIL = "company_email"
+KIND_SMS = "sms"
+KIND_ADMIN_NOTIFICATION = "admin_notification"
+
+_SESSION_FLAG = "outbox_enqueued"
+# Payload keys starting with "_" are dispatcher metadata, not handler arguments.
+_EXPIRES_AT_KEY = "_expires_at"
+EXPIRED_ERROR = "Expired before delivery"
+_HOOKS_INSTALLED = False
+
+OutboxHandler = Callable[[Dict[str, Any]], Any]
+_HANDLERS: Dict[str, OutboxHandler] = {}
+
+
+class OutboxDeliveryError(RuntimeError):
+    """Raised when a handler reports that its message was not delivered."""
+
+
+@dataclass
+class DispatchReport:
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    expired: int = 0
+
+
+def outbox_handler(kind: str) -> Callable[[OutboxHandler], OutboxHandler]:
+    """Register the function delivering messages of ``kind``.
+
+    The handler receives the stored payload; returning ``False`` or raising
+    counts as a failed attempt.
+    """
+
+    def _register(handler: OutboxHandler) -> OutboxHandler:
+        _HANDLERS[kind] = handler
+        return handler
+
+    return _register
+
+
+def enqueue(
+    kind: str,
+    payload: Dict[str, Any],
+    *,
+    session: Optional[Session] = None,
+    expires_at: Optional[datetime] = None,
+) -> OutboxMessage:
+    """Add a message to the current transaction; the caller commits.
+
+    A message with ``expires_at`` (UTC) is dropped rather than delivered late.
+    """
+
+    if kind not in _HANDLERS:
+        raise ValueError(f"Unknown outbox message kind: {kind!r}")
+    session = session or db.session
+    payload = dict(payload)
+    if expires_at is not None:
+        payload[_EXPIRES_AT_KEY] = expires_at.isoformat()
+    message = OutboxMessage(
+        kind=kind,
+        payload=payload,
+        status=STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    )
+    session.add(message)
+    session.info[_SESSION_FLAG] = True
+    return message
+
+
+def enqueue_email(
+    recipient: str,
+    subject: str,
+    template: str,
+    context: Optional[Dict[str, Any]] = None,
+    *,
+    expires_at: Optional[datetime] = None,
+) -> Optional[OutboxMessage]:
+    """Queue a templated email (see :func:`app.services.mailer.send_email`)."""
+
+    if not recipient:
+        return None
+    return enqueue(
+        KIND_EMAIL,
+        {"recipient": recipient, "subject": subject, "template": template, "context": dict(context or {})},
+        expires_at=expires_at,
+    )
+
+
+def enqueue_company_email(company: Company, event_name: str, **extra: Any) -> OutboxMessage:
+    """Queue one of the company lifecycle emails for ``company``.
+
+    The company is reloaded at delivery time, so the row must be flushed (have
+    an id) before calling this.
+    """
+
+    if event_name not in _COMPANY_EMAILS:
+        raise ValueError(f"Unknown company email: {event_name!r}")
+    if company.id is None:
+        db.session.flush()
+    return enqueue(KIND_COMPANY_EMAIL, {"company_id": company.id, "event": event_name, **extra})
+
+
+def enqueue_sms(
+    recipient: str, message: str, *, expires_at: Optional[datetime] = None
+) -> Optional[OutboxMessage]:
+    """Queue a plain SMS sent through :class:`app.services.sms_service.SMSService`."""
+
+    if not recipient:
+        return None
+    return enqueue(KIND_SMS, {"recipient": recipient, "message": message}, expires_at=expires_at)
+
+
+def enqueue_admin_notification(
+    event_type: str, title: str, message: str, link: str = "", **extra: Any
+) -> OutboxMessage:
+    """Queue an admin dashboard notification (see ``push_admin_notification``)."""
+
+    return enqueue(
+        KIND_ADMIN_NOTIFICATION,
+        {"event_type": event_type, "title": title, "message": message, "link": link, **extra},
+    )
+
+
+@outbox_handler(KIND_EMAIL)
+def _deliver_email(payload: Dict[str, Any]) -> bool:
+    from app.services.mailer import send_email
+
+    return send_email(payload["recipient"], payload["subject"], payload["template"], payload.get("context"))
+
+
+def _company_welcome(company: Company, payload: Dict[str, Any]) -> bool:
+    from app.services.mailer import send_company_welcome_email
+
+    return send_company_welcome_email(owner=company.owner, company_name=company.name)
+
+
+def _company_status(sender_name: str) -> Callable[[Company, Dict[str, Any]], bool]:
+    def _send(company: Company, payload: Dict[str, Any]) -> bool:
+        from app.services import mailer
+
+        return getattr(mailer, sender_name)(company)
+
+    return _send
+
+
+def _company_correction(company: Company, payload: Dict[str, Any]) -> bool:
+    from app.services.mailer import send_company_correction_email
+
+    return send_company_correction_email(company, payload.get("notes") or "", payload.get("link") or "")
+
+
+_COMPANY_EMAILS: Dict[str, Callable[[Company, Dict[str, Any]], bool]] = {
+    "welcome": _company_welcome,
+    "approved": _company_status("send_company_approval_email"),
+    "suspended": _company_status("send_company_suspension_email"),
+    "reactivated": _company_status("send_company_reactivation_email"),
+    "correction": _company_correction,
+}
+
+
+@outbox_handler(KIND_COMPANY_EMAIL)
+def _deliver_company_email(payload: Dict[str, Any]) -> bool:
+    company = db.session.get(Company, payload["company_id"])
+    if company is None:
+        # Deleted before delivery; there is nobody left to notify.
+        return True
+    return _COMPANY_EMAILS[payload["event"]](company, payload)
+
+
+@outbox_handler(KIND_SMS)
+def _deliver_sms(payload: Dict[str, Any]) -> bool:
+    from app.services.sms_service import SMSService
+
+    # send_sms logs the failure and returns None instead of raising.
+    return SMSService().send_sms(payload["recipient"], payload["message"]) is not None
+
+
+@outbox_handler(KIND_ADMIN_NOTIFICATION)
+def _deliver_admin_notification(payload: Dict[str, Any]) -> None:
+    from app.modules.members.services.member_notifications_service import push_admin_notification
+
+    payload = dict(payload)
+    push_admin_notification(payload.pop("event_type"), payload.pop("title"), payload.pop("message"), **payload)
+
+
+def retry_delay(attempts: int, config=None) -> timedelta:
+    """Backoff before attempt ``attempts + 1``: doubling from the base, capped, half jittered."""
+
+    config = config if config is not None else current_app.config
+    base = float(config.get("OUTBOX_BACKOFF_SECONDS", 30))
+    cap = float(config.get("OUTBOX_BACKOFF_MAX_SECONDS", 3600))
+    delay = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=delay / 2 + random.uniform(0, delay / 2))
+
+
+def _claim(limit: int, lease_seconds: float) -> List[OutboxMessage]:
+    now = datetime.utcnow()
+    # Expired "processing" leases belong to a worker that died mid-delivery.
+    messages = (
+        OutboxMessage.query.filter(
+            OutboxMessage.status.in_((STATUS_PENDING, STATUS_PROCESSING)),
+            OutboxMessage.next_attempt_at <= now,
+        )
+        .order_by(OutboxMessage.next_attempt_at, OutboxMessage.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    lease_until = now + timedelta(seconds=lease_seconds)
+    for message in messages:
+        message.status = STATUS_PROCESSING
+        message.attempts += 1
+        message.next_attempt_at = lease_until
+    db.session.commit()
+    return messages
+
+
+def _is_expired(message: OutboxMessage, now: datetime) -> bool:
+    expires_at = (message.payload or {}).get(_EXPIRES_AT_KEY)
+    return bool(expires_at) and datetime.fromisoformat(expires_at) <= now
+
+
+def _redacted(payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Keep only dispatcher metadata; recipients, codes and links are dropped."""
+
+    return {key: value for key, value in (payload or {}).items() if key.startswith("_")}
+
+
+def _deliver(message: OutboxMessage) -> None:
+    handler = _HANDLERS.get(message.kind)
+    if handler is None:
+        raise OutboxDeliveryError(f"No outbox handler for {message.kind!r}")
+    payload = {key: value for key, value in (message.payload or {}).items() if not key.startswith("_")}
+    if handler(payload) is False:
+        raise OutboxDeliveryError(f"{message.kind} handler reported a failed delivery")
+
+
+def dispatch_batch(limit: Optional[int] = None) -> DispatchReport:
+    """Claim up to ``limit`` due messages and deliver them one by one."""
+
+    config = current_app.config
+    limit = int(limit or config.get("OUTBOX_BATCH_SIZE", 50))
+    max_attempts = int(config.get("OUTBOX_MAX_ATTEMPTS", 8))
+    report = DispatchReport()
+
+    lease_seconds = float(config.get("OUTBOX_LEASE_SECONDS", 300))
+    claimed = [(message.id, message.kind) for message in _claim(limit, lease_seconds)]
+    report.claimed = len(claimed)
+    for message_id, kind in claimed:
+        message = db.session.get(OutboxMessage, message_id)
+        if message is None:
+            continue
+        if _is_expired(message, datetime.utcnow()):
+            message.status = STATUS_FAILED
+            message.last_error = EXPIRED_ERROR
+            message.payload = _redacted(message.payload)
+            report.expired += 1
+            record_outbox_delivery(kind, "expired")
+            db.session.commit()
+            continue
+        error: Optional[Exception] = None
+        try:
+            _deliver(message)
+        except Exception as exc:  # noqa: BLE001 - every failure is recorded on the row
+            error = exc
+            db.session.rollback()
+            message = db.session.get(OutboxMessage, message_id)
+
+        now = datetime.utcnow()
+        if error is None:
+            message.status = STATUS_SENT
+            message.sent_at = now
+            message.last_error = None
+            message.payload = _redacted(message.payload)
+            report.sent += 1
+            record_outbox_delivery(kind, "sent", (now - message.created_at).total_seconds())
+        elif message.attempts >= max_attempts:
+            message.status = STATUS_FAILED
+            message.last_error = f"{type(error).__name__}: {error}"
+            report.failed += 1
+            record_outbox_delivery(kind, "failed")
+            _LOGGER.error(
+                "Outbox message failed permanently",
+                extra={
+                    "log_payload": {
+                        "event": "outbox_message_failed",
+                        "id": message_id,
+                        "kind": kind,
+                        "attempts": message.attempts,
+                        "error": message.last_error,
+                    }
+                },
+            )
+        else:
+            message.status = STATUS_PENDING
+            message.next_attempt_at = now + retry_delay(message.attempts, config)
+            message.last_error = f"{type(error).__name__}: {error}"
+            report.retried += 1
+            record_outbox_delivery(kind, "retry")
+            _LOGGER.warning(
+                "Outbox delivery failed; will retry",
+                extra={
+                    "log_payload": {
+                        "event": "outbox_message_retry",
+                        "id": message_id,
+                        "kind": kind,
+                        "attempts": message.attempts,
+                        "error": message.last_error,
+                    }
+                },
+            )
+        db.session.commit()
+    return report
+
+
+def dispatch_pending(max_batches: Optional[int] = None) -> DispatchReport:
+    """Run batches until the due queue is drained or ``max_batches`` is reached."""
+
+    config = current_app.config
+    limit = int(config.get("OUTBOX_BATCH_SIZE", 50))
+    max_batches = int(max_batches or config.get("OUTBOX_MAX_BATCHES_PER_RUN", 20))
+    total = DispatchReport()
+    for _ in range(max_batches):
+        report = dispatch_batch(limit)
+        total.claimed += report.claimed
+        total.sent += report.sent
+        total.retried += report.retried
+        total.failed += report.failed
+        total.expired += report.expired
+        if report.claimed < limit:
+            break
+    return total
+
+
+def requeue_failed(kind: Optional[str] = None) -> int:
+    """Reset ``failed`` messages (optionally of one kind) for another round of attempts.
+
+    Expired messages are left alone: their payload is already cleared.
+    """
+
+    query = OutboxMessage.query.filter(
+        OutboxMessage.status == STATUS_FAILED,
+        or_(OutboxMessage.last_error.is_(None), OutboxMessage.last_error != EXPIRED_ERROR),
+    )
+    if kind:
+        query = query.filter(OutboxMessage.kind == kind)
+    count = query.update(
+        {"status": STATUS_PENDING, "attempts": 0, "next_attempt_at": datetime.utcnow()},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    return count
+
+
+@celery.task(name="outbox.dispatch", ignore_result=True)
+def dispatch_outbox_task(max_batches: Optional[int] = None):
+    """Drain due outbox messages; queued after commits and run by beat."""
+
+    report = dispatch_pending(max_batches)
+    return {
+        "claimed": report.claimed,
+        "sent": report.sent,
+        "retried": report.retried,
+        "failed": report.failed,
+        "expired": report.expired,
+    }
+
+
+class _DispatchKicker:
+    """Queues ``outbox.dispatch`` from a per-process background thread.
+
+    Committing code only sets a flag, so a slow or unreachable broker never
+    holds a request. Kicks raised while a publish is in flight collapse into
+    one, and after a failed publish further kicks are dropped for
+    ``cooldown_seconds``; the beat schedule delivers those messages instead.
+    """
+
+    def __init__(self) -> None:
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._paused_until = 0.0
+        self.cooldown_seconds = 30.0
+
+    def kick(self, cooldown_seconds: float) -> None:
+        self.cooldown_seconds = cooldown_seconds
+        if monotonic() < self._paused_until:
+            return
+        self._ensure_thread()
+        self._wakeup.set()
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive fork; each worker process starts its own.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._wakeup = threading.Event()
+            threading.Thread(target=self._run, name="outbox-kicker", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        wakeup = self._wakeup
+        while True:
+            wakeup.wait()
+            wakeup.clear()
+            try:
+                dispatch_outbox_task.apply_async(retry=False)
+            except Exception:  # pragma: no cover - the beat sweep delivers it instead
+                self._paused_until = monotonic() + self.cooldown_seconds
+                _LOGGER.warning(
+                    "outbox_dispatch_queue_failed",
+                    extra={"log_payload": {"event": "outbox_dispatch_queue_failed"}},
+                    exc_info=True,
+                )
+
+
+_KICKER = _DispatchKicker()
+
+
+def _kick_dispatcher(session: Session) -> None:
+    if not session.info.pop(_SESSION_FLAG, False):
+        return
+    config = current_app.config
+    if not config.get("OUTBOX_DISPATCH_ON_COMMIT", True):
+        return
+    _KICKER.kick(float(config.get("OUTBOX_KICK_COOLDOWN_SECONDS", 30)))
+
+
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
+
+
+def register_outbox_hooks() -> None:
+    """Queue the dispatcher after commits that enqueued outbox messages."""
+
+    global _HOOKS_INSTALLED
+    if _HOOKS_INSTALLED:
+        return
+    event.listen(Session, "after_commit", _kick_dispatcher)
+    event.listen(Session, "after_rollback", _clear_after_rollback)
+    _HOOKS_INSTALLED = True
+
+
+__all__ = [
+    "DispatchReport",
+    "EXPIRED_ERROR",
+    "OutboxDeliveryError",
+    "dispatch_batch",
+    "dispatch_outbox_task",
+    "dispatch_pending",
+    "enqueue",
+    "enqueue_admin_notification",
+    "enqueue_company_email",
+    "enqueue_email",
+    "enqueue_sms",
+    "outbox_handler",
+    "register_outbox_hooks",
+    "requeue_failed",
+    "retry_delay",
+]
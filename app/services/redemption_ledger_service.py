@@ -0,0 +1,163 @@
+"""Redemption ledger: usage-code attempts and applied incentives.
+
+The ledger lives in ``redemption_events`` (see :class:`~app.models.RedemptionEvent`),
+separate from the admin audit rows that stay in ``activity_log``. On PostgreSQL
+the table is partitioned by month; :func:`maintain_partitions` (the
+``redemptions.maintain_partitions`` beat task) keeps
+``REDEMPTION_PARTITION_MONTHS_AHEAD`` future months created. Rows for a month
+without a child land in the DEFAULT partition instead of failing, and the next
+run moves them into their month.
+
+Compatibility while callers migrate:
+
+* ``ActivityLog(action="usage_code_attempt" | "incentive_applied", ...)`` rows
+  added to a session are written to ``redemption_events`` instead (see
+  :func:`register_activity_log_compat_hooks`), with a warning naming the action.
+* The ``activity_log_with_redemptions`` view (created by the migration) exposes
+  both tables with the old ``activity_log`` columns for SQL reports.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Query, Session
+
+from app import celery
+from app.core.database import db
+from app.core.partitioning import add_months, ensure_monthly_partitions, month_start
+from app.logging.logger import get_logger
+from app.models import ActivityLog, RedemptionEvent
+
+_LOGGER = get_logger(__name__)
+
+USAGE_CODE_ATTEMPT = "usage_code_attempt"
+INCENTIVE_APPLIED = "incentive_applied"
+REDEMPTION_KINDS = (USAGE_CODE_ATTEMPT, INCENTIVE_APPLIED)
+SUCCESS_RESULTS = ("valid", "success")
+
+_HOOKS_INSTALLED = False
+
+
+def record_event(
+    kind: str,
+    *,
+    member_id: int | None,
+    partner_id: int | None,
+    offer_id: int | None,
+    result: str | None,
+    code_used: str | None = None,
+    created_at: datetime | None = None,
+) -> RedemptionEvent:
+    """Add a ledger row to the current session; the caller commits."""
+
+    if kind not in REDEMPTION_KINDS:
+        raise ValueError(f"Unknown redemption event kind: {kind!r}")
+    entry = RedemptionEvent(
+        kind=kind,
+        member_id=member_id,
+        partner_id=partner_id,
+        offer_id=offer_id,
+        code_used=code_used,
+        result=result,
+        created_at=created_at or datetime.utcnow(),
+    )
+    db.session.add(entry)
+    return entry
+
+
+def usage_attempts(results: Optional[Iterable[str]] = None) -> Query:
+    """Query usage-code attempts, optionally limited to the given results."""
+
+    query = RedemptionEvent.query.filter(RedemptionEvent.kind == USAGE_CODE_ATTEMPT)
+    if results is not None:
+        query = query.filter(RedemptionEvent.result.in_(list(results)))
+    return query
+
+
+def successful_usages() -> Query:
+    """Query usage-code attempts that redeemed an offer."""
+
+    return usage_attempts(SUCCESS_RESULTS)
+
+
+def applied_incentives() -> Query:
+    return RedemptionEvent.query.filter(RedemptionEvent.kind == INCENTIVE_APPLIED)
+
+
+def maintain_partitions(months_ahead: Optional[int] = None, *, now: Optional[datetime] = None) -> List[str]:
+    """Create the current and next ``months_ahead`` monthly partitions; return new names."""
+
+    if months_ahead is None:
+        months_ahead = int(current_app.config.get("REDEMPTION_PARTITION_MONTHS_AHEAD", 3))
+    current = month_start(now or datetime.utcnow())
+    with db.engine.begin() as connection:
+        created = ensure_monthly_partitions(
+            connection,
+            RedemptionEvent.__tablename__,
+            first=current,
+            last=add_months(current, max(months_ahead, 0)),
+        )
+    if created:
+        _LOGGER.info(
+            "Created redemption_events partitions",
+            extra={"log_payload": {"event": "redemption_partitions_created", "partitions": created}},
+        )
+    return created
+
+
+@celery.task(name="redemptions.maintain_partitions", ignore_result=True)
+def maintain_partitions_task(months_ahead: Optional[int] = None):
+    """Beat job keeping future ``redemption_events`` partitions in place."""
+
+    return maintain_partitions(months_ahead)
+
+
+def _redirect_activity_log_rows(session: Session, flush_context, instances) -> None:
+    for instance in list(session.new):
+        if not isinstance(instance, ActivityLog) or instance.action not in REDEMPTION_KINDS:
+            continue
+        session.expunge(instance)
+        session.add(
+            RedemptionEvent(
+                kind=instance.action,
+                member_id=instance.member_id,
+                partner_id=instance.partner_id,
+                offer_id=instance.offer_id,
+                code_used=instance.code_used,
+                result=instance.result,
+                created_at=instance.created_at or instance.timestamp or datetime.utcnow(),
+            )
+        )
+        _LOGGER.warning(
+            "ActivityLog redemption row redirected to redemption_events",
+            extra={"log_payload": {"event": "activity_log_redemption_redirected", "action": instance.action}},
+        )
+
+
+def register_activity_log_compat_hooks() -> None:
+    """Write ledger rows still created as ``ActivityLog`` to ``redemption_events``."""
+
+    global _HOOKS_INSTALLED
+    if _HOOKS_INSTALLED:
+        return
+    event.listen(Session, "before_flush", _redirect_activity_log_rows)
+    _HOOKS_INSTALLED = True
+
+
+__all__ = [
+    "INCENTIVE_APPLIED",
+    "REDEMPTION_KINDS",
+    "SUCCESS_RESULTS",
+    "USAGE_CODE_ATTEMPT",
+    "applied_incentives",
+    "maintain_partitions",
+    "maintain_partitions_task",
+    "record_event",
+    "register_activity_log_compat_hooks",
+    "successful_usages",
+    "usage_attempts",
+]
@@ -0,0 +1,353 @@
+"""Retention sweeps for tables that only ever grow.
+
+Each :class:`RetentionPolicy` names a table, the timestamp column that ages its
+rows, optional status criteria and, optionally, how many of each owner's newest
+rows to keep whatever their age. The ``retention.sweep`` beat task runs every
+enabled policy in batches of ``RETENTION_BATCH_SIZE``: select the oldest
+eligible ids through the age index, archive those rows if asked to, delete them
+by primary key and commit. Every batch is its own short transaction, and
+``RETENTION_MAX_BATCHES_PER_RUN`` caps the work per policy and run, so a large
+backlog is worked off over several runs instead of in one long lock.
+
+When ``RETENTION_ARCHIVE_DIR`` is set, policies marked ``archive`` first write
+each batch to ``<dir>/<table>/<YYYY>/<MM>/<table>-<timestamp>-<first id>.ndjson.gz``.
+The file is complete on disk before the delete commits, so a crash can archive
+a batch twice but never lose it.
+
+A policy whose ``*_DAYS`` setting is 0 is skipped.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from flask import current_app
+from sqlalchemy import delete, select
+from sqlalchemy.orm import aliased
+
+from app import celery
+from app.core.database import db
+from app.core.json_provider import dumps_bytes
+from app.core.metrics.instruments import record_retention_batch
+from app.logging.logger import get_logger
+from app.models import Notification, OutboxMessage, SMSLog, UsageCode, VerificationCode
+
+_LOGGER = get_logger(__name__)
+
+
+def _no_criteria() -> Sequence[Any]:
+    return ()
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Which rows of one table may be reclaimed.
+
+    A row is eligible once ``age_column`` is older than the configured number
+    of days and every ``criteria`` expression holds. With ``owner_column`` set,
+    the owner's ``keep_last`` newest rows (by ``age_column``, regardless of
+    criteria) are never eligible.
+    """
+
+    name: str
+    model: Any
+    age_column: str
+    days_setting: str
+    default_days: int
+    criteria: Callable[[], Sequence[Any]] = _no_criteria
+    owner_column: Optional[str] = None
+    keep_last_setting: Optional[str] = None
+    default_keep_last: int = 0
+    archive: bool = False
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    def max_age_days(self, config) -> int:
+        return int(config.get(self.days_setting, self.default_days))
+
+    def keep_last(self, config) -> int:
+        if not self.owner_column or not self.keep_last_setting:
+            return 0
+        return max(int(config.get(self.keep_last_setting, self.default_keep_last)), 0)
+
+
+POLICIES = (
+    # OTPs are useless once expired and are never archived.
+    RetentionPolicy(
+        name="verification_codes",
+        model=VerificationCode,
+        age_column="expires_at",
+        days_setting="RETENTION_VERIFICATION_CODES_DAYS",
+        default_days=7,
+    ),
+    # Every rotation adds a row; the newest few per partner stay for support lookups.
+    RetentionPolicy(
+        name="usage_codes",
+        model=UsageCode,
+        age_column="expires_at",
+        days_setting="RETENTION_USAGE_CODES_DAYS",
+        default_days=30,
+        owner_column="partner_id",
+        keep_last_setting="RETENTION_USAGE_CODES_KEEP_LAST",
+        default_keep_last=20,
+        archive=True,
+    ),
+    RetentionPolicy(
+        name="sms_logs",
+        model=SMSLog,
+        age_column="sent_at",
+        days_setting="RETENTION_SMS_LOGS_DAYS",
+        default_days=180,
+        archive=True,
+    ),
+    RetentionPolicy(
+        name="notifications_read",
+        model=Notification,
+        age_column="created_at",
+        days_setting="RETENTION_NOTIFICATIONS_READ_DAYS",
+        default_days=90,
+        criteria=lambda: (Notification.is_read.is_(True),),
+        owner_column="user_id",
+        keep_last_setting="RETENTION_NOTIFICATIONS_KEEP_LAST",
+        default_keep_last=50,
+        archive=True,
+    ),
+    # Broadcasts to members who never open them would otherwise stay forever.
+    RetentionPolicy(
+        name="notifications",
+        model=Notification,
+        age_column="created_at",
+        days_setting="RETENTION_NOTIFICATIONS_DAYS",
+        default_days=365,
+        owner_column="user_id",
+        keep_last_setting="RETENTION_NOTIFICATIONS_KEEP_LAST",
+        default_keep_last=50,
+        archive=True,
+    ),
+    # Failed messages stay until someone requeues or inspects them.
+    RetentionPolicy(
+        name="outbox_messages",
+        model=OutboxMessage,
+        age_column="sent_at",
+        days_setting="RETENTION_OUTBOX_DAYS",
+        default_days=30,
+        criteria=lambda: (OutboxMessage.status == "sent",),
+    ),
+)
+
+
+@dataclass
+class RetentionReport:
+    policy: str
+    deleted: int = 0
+    archived: int = 0
+    batches: int = 0
+    files: List[str] = field(default_factory=list)
+
+
+def get_policy(name: str) -> RetentionPolicy:
+    for policy in POLICIES:
+        if policy.name == name:
+            return policy
+    raise KeyError(f"Unknown retention policy: {name!r}")
+
+
+def cutoff_for(policy: RetentionPolicy, *, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Return the age cutoff for ``policy``, or ``None`` when it is disabled."""
+
+    days = policy.max_age_days(current_app.config)
+    if days <= 0:
+        return None
+    return (now or datetime.utcnow()) - timedelta(days=days)
+
+
+def _eligible_filters(policy: RetentionPolicy, cutoff: datetime) -> List[Any]:
+    model = policy.model
+    age = getattr(model, policy.age_column)
+    filters = [age < cutoff, *policy.criteria()]
+
+    keep_last = policy.keep_last(current_app.config)
+    if keep_last:
+        # Age of the owner's keep_last-th newest row, read through (owner, age).
+        # Owners with fewer rows get NULL here, which protects all of them.
+        newer = aliased(model)
+        newer_age = getattr(newer, policy.age_column)
+        nth_newest = (
+            select(newer_age)
+            .where(getattr(newer, policy.owner_column) == getattr(model, policy.owner_column))
+            .where(newer_age.is_not(None))
+            .order_by(newer_age.desc())
+            .offset(keep_last - 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        filters.append(age < nth_newest)
+    return filters
+
+
+def count_eligible(policy: RetentionPolicy, *, now: Optional[datetime] = None) -> int:
+    cutoff = cutoff_for(policy, now=now)
+    if cutoff is None:
+        return 0
+    return db.session.query(policy.model.id).filter(*_eligible_filters(policy, cutoff)).count()
+
+
+def _archive_directory() -> Optional[Path]:
+    configured = current_app.config.get("RETENTION_ARCHIVE_DIR")
+    if not configured:
+        return None
+    path = Path(configured)
+    return path if path.is_absolute() else Path(current_app.instance_path) / path
+
+
+def write_archive(directory: Path, table: str, rows: Sequence[dict], *, now: Optional[datetime] = None) -> Path:
+    """Write ``rows`` as gzip-compressed NDJSON and return the file path."""
+
+    now = now or datetime.utcnow()
+    folder = directory / table / f"{now:%Y}" / f"{now:%m}"
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"{table}-{now:%Y%m%dT%H%M%S}-{rows[0]['id']}.ndjson.gz"
+    partial = path.with_name(path.name + ".part")
+    with open(partial, "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as archive:
+            for row in rows:
+                archive.write(dumps_bytes(dict(row)))
+                archive.write(b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(partial, path)
+    return path
+
+
+def _run_batch(policy: RetentionPolicy, filters: List[Any], limit: int, archive_dir: Optional[Path]):
+    model = policy.model
+    table = model.__table__
+    ids = [
+        row_id
+        for (row_id,) in db.session.query(model.id)
+        .filter(*filters)
+        .order_by(getattr(model, policy.age_column), model.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    ]
+    if not ids:
+        db.session.rollback()
+        return 0, None
+
+    archive_path = None
+    if archive_dir is not None:
+        rows = db.session.execute(select(table).where(table.c.id.in_(ids)).order_by(table.c.id)).mappings().all()
+        archive_path = write_archive(archive_dir, policy.table, rows)
+
+    deleted = db.session.execute(delete(table).where(table.c.id.in_(ids))).rowcount
+    db.session.commit()
+    return deleted, archive_path
+
+
+def run_policy(
+    policy: RetentionPolicy,
+    *,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> RetentionReport:
+    """Reclaim eligible rows of one policy, batch by batch."""
+
+    config = current_app.config
+    report = RetentionReport(policy.name)
+    cutoff = cutoff_for(policy, now=now)
+    if cutoff is None:
+        return report
+
+    batch_size = int(batch_size or config.get("RETENTION_BATCH_SIZE", 500))
+    max_batches = int(max_batches or config.get("RETENTION_MAX_BATCHES_PER_RUN", 50))
+    pause = float(config.get("RETENTION_BATCH_PAUSE_SECONDS", 0.1))
+    archive_dir = _archive_directory() if policy.archive else None
+    filters = _eligible_filters(policy, cutoff)
+
+    for batch in range(max_batches):
+        if batch and pause > 0:
+            time.sleep(pause)
+        started = time.perf_counter()
+        deleted, archive_path = _run_batch(policy, filters, batch_size, archive_dir)
+        if not deleted:
+            break
+        archived = deleted if archive_path else 0
+        record_retention_batch(
+            policy.name, deleted=deleted, archived=archived, duration_seconds=time.perf_counter() - started
+        )
+        report.batches += 1
+        report.deleted += deleted
+        report.archived += archived
+        if archive_path:
+            report.files.append(str(archive_path))
+        if deleted < batch_size:
+            break
+
+    if report.deleted:
+        _LOGGER.info(
+            "Retention sweep reclaimed rows",
+            extra={
+                "log_payload": {
+                    "event": "retention_policy_swept",
+                    "policy": policy.name,
+                    "table": policy.table,
+                    "deleted": report.deleted,
+                    "archived": report.archived,
+                    "batches": report.batches,
+                }
+            },
+        )
+    return report
+
+
+def sweep(
+    names: Optional[Iterable[str]] = None,
+    *,
+    now: Optional[datetime] = None,
+    max_batches: Optional[int] = None,
+) -> List[RetentionReport]:
+    """Run the named policies (all by default); one failing policy does not stop the rest."""
+
+    policies = [get_policy(name) for name in names] if names else list(POLICIES)
+    reports = []
+    for policy in policies:
+        try:
+            reports.append(run_policy(policy, now=now, max_batches=max_batches))
+        except Exception:  # pragma: no cover - logged and retried on the next run
+            db.session.rollback()
+            _LOGGER.exception(
+                "Retention sweep failed",
+                extra={"log_payload": {"event": "retention_policy_failed", "policy": policy.name}},
+            )
+    return reports
+
+
+@celery.task(name="retention.sweep", ignore_result=True)
+def retention_sweep_task(names: Optional[List[str]] = None):
+    """Beat job reclaiming expired rows under every retention policy."""
+
+    sweep(names)
+
+
+__all__ = [
+    "POLICIES",
+    "RetentionPolicy",
+    "RetentionReport",
+    "count_eligible",
+    "cutoff_for",
+    "get_policy",
+    "retention_sweep_task",
+    "run_policy",
+    "sweep",
+    "write_archive",
+]
@@ -0,0 +1,258 @@
+"""Arabic-aware search over offers, partner companies and their industries.
+
+Queries and stored documents go through :func:`normalize_arabic` so spelling
+variants (alef/hamza forms, taa marbuta, diacritics, tatweel) match each other.
+On PostgreSQL the ``search_document`` columns are matched with ``ILIKE``
+served by ``pg_trgm`` GIN indexes and ranked with ``word_similarity``. Other
+databases (SQLite in development and tests) use an in-process inverted index
+built from the offer catalogue snapshot and rebuilt when the catalogue
+version changes.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import contains_eager
+
+from app.core.database import db
+from app.core.normalization import normalize_arabic
+from app.models import Company, Offer
+from app.modules.companies.services.offer_catalog_service import get_catalog_snapshot
+from app.services.catalog_version_service import get_catalog_version
+
+MAX_RESULTS = 200
+# Field weights shared by both backends: title/name hits outrank body text.
+OFFER_TITLE_WEIGHT = 3.0
+COMPANY_NAME_WEIGHT = 2.0
+BODY_WEIGHT = 1.0
+# Prefix hits ("مطع" -> "مطعم") score below whole-token hits.
+_PREFIX_FACTOR = 0.6
+_COMPANY_INDEX_TTL_SECONDS = 30.0
+
+
+class InvertedIndex:
+    """Token -> postings map with prefix lookup over a sorted vocabulary."""
+
+    __slots__ = ("_postings", "_vocabulary")
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+
+    def add(self, key: int, text: Optional[str], weight: float) -> None:
+        for token in normalize_arabic(text).split():
+            postings = self._postings.setdefault(token, {})
+            if postings.get(key, 0.0) < weight:
+                postings[key] = weight
+
+    def freeze(self) -> "InvertedIndex":
+        self._vocabulary = sorted(self._postings)
+        return self
+
+    def _matches(self, term: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        start = bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            factor = 1.0 if token == term else _PREFIX_FACTOR
+            for key, weight in self._postings[token].items():
+                score = weight * factor
+                if scores.get(key, 0.0) < score:
+                    scores[key] = score
+        return scores
+
+    def search(self, terms: Sequence[str], limit: int) -> List[Tuple[int, float]]:
+        """Return ``(key, score)`` pairs matching every term, best first."""
+
+        if not terms:
+            return []
+        totals: Optional[Dict[int, float]] = None
+        for term in terms:
+            matches = self._matches(term)
+            if totals is None:
+                totals = matches
+            else:
+                totals = {key: totals[key] + score for key, score in matches.items() if key in totals}
+            if not totals:
+                return []
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], -item[0]))
+        return ranked[:limit]
+
+
+_index_lock = threading.Lock()
+_offer_index: Tuple[Optional[object], Optional[InvertedIndex]] = (None, None)
+_company_index: Tuple[Optional[str], float, Optional[InvertedIndex]] = (None, 0.0, None)
+
+
+def _uses_trigram_backend() -> bool:
+    return db.session.get_bind().dialect.name == "postgresql"
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _offer_hit(offer, score: float) -> Dict[str, object]:
+    company = offer.company
+    renditions = offer.image_renditions or {}
+    card = renditions.get("card") if isinstance(renditions, dict) else None
+    return {
+        "id": offer.id,
+        "title": offer.title,
+        "discount_percent": float(offer.base_discount or 0.0),
+        "valid_until": offer.valid_until.isoformat() if offer.valid_until else None,
+        "image_url": (card or {}).get("jpeg") or offer.image_url or "",
+        "company_id": offer.company_id,
+        "company": company.name if company else None,
+        "industry": company.industry if company else None,
+        "score": round(float(score or 0.0), 4),
+    }
+
+
+def _get_offer_index():
+    """Return the catalogue snapshot together with its inverted index."""
+
+    global _offer_index
+
+    snapshot = get_catalog_snapshot()
+    indexed_snapshot, index = _offer_index
+    if indexed_snapshot is snapshot and index is not None:
+        return snapshot, index
+
+    with _index_lock:
+        indexed_snapshot, index = _offer_index
+        if indexed_snapshot is snapshot and index is not None:
+            return snapshot, index
+        index = InvertedIndex()
+        for offer in snapshot.featured:
+            index.add(offer.id, offer.title, OFFER_TITLE_WEIGHT)
+            index.add(offer.id, offer.description, BODY_WEIGHT)
+            index.add(offer.id, offer.company.name, COMPANY_NAME_WEIGHT)
+            index.add(offer.id, offer.company.industry, BODY_WEIGHT)
+        _offer_index = (snapshot, index.freeze())
+    return snapshot, index
+
+
+def _company_index_is_fresh(version: Optional[str]) -> bool:
+    indexed_version, built_at, index = _company_index
+    if index is None:
+        return False
+    if version is None:
+        return (time.monotonic() - built_at) < _COMPANY_INDEX_TTL_SECONDS
+    return version == indexed_version
+
+
+def _get_company_index() -> InvertedIndex:
+    global _company_index
+
+    version = get_catalog_version()
+    if _company_index_is_fresh(version):
+        return _company_index[2]
+
+    with _index_lock:
+        if _company_index_is_fresh(version):
+            return _company_index[2]
+        index = InvertedIndex()
+        for company in Company.query.all():
+            index.add(company.id, company.name, COMPANY_NAME_WEIGHT)
+            index.add(company.id, company.industry, BODY_WEIGHT)
+        index.freeze()
+        _company_index = (version, time.monotonic(), index)
+    return index
+
+
+def _trigram_filters(columns: Iterable, terms: Sequence[str]):
+    """Require every term to appear in at least one of ``columns``."""
+
+    columns = list(columns)
+    return and_(
+        *[
+            or_(*[column.ilike(f"%{_escape_like(term)}%", escape="\\") for column in columns])
+            for term in terms
+        ]
+    )
+
+
+def search_offers(query: Optional[str], limit: int = 20) -> List[Dict[str, object]]:
+    """Return active offers matching ``query`` ranked by relevance."""
+
+    normalized = normalize_arabic(query)
+    terms = normalized.split()
+    if not terms:
+        return []
+    limit = max(1, min(int(limit), MAX_RESULTS))
+
+    if not _uses_trigram_backend():
+        snapshot, index = _get_offer_index()
+        return [
+            _offer_hit(snapshot.by_id[offer_id], score)
+            for offer_id, score in index.search(terms, limit)
+        ]
+
+    offer_document = func.coalesce(Offer.search_document, "")
+    company_document = func.coalesce(Company.search_document, "")
+    score = func.greatest(
+        func.word_similarity(normalized, offer_document) * OFFER_TITLE_WEIGHT,
+        func.word_similarity(normalized, company_document) * COMPANY_NAME_WEIGHT,
+    )
+    rows = (
+        db.session.query(Offer, score.label("score"))
+        .join(Company, Offer.company_id == Company.id)
+        .options(contains_eager(Offer.company))
+        .filter(Offer.status == "active")
+        .filter(_trigram_filters((Offer.search_document, Company.search_document), terms))
+        .order_by(score.desc(), Offer.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_offer_hit(offer, row_score) for offer, row_score in rows]
+
+
+def search_companies(query: Optional[str], limit: int = 20) -> List[Company]:
+    """Return companies whose name or industry matches ``query``, best first."""
+
+    normalized = normalize_arabic(query)
+    terms = normalized.split()
+    if not terms:
+        return []
+    limit = max(1, min(int(limit), MAX_RESULTS))
+
+    if not _uses_trigram_backend():
+        ranked = _get_company_index().search(terms, limit)
+        companies = {
+            company.id: company
+            for company in Company.query.filter(Company.id.in_([key for key, _ in ranked])).all()
+        }
+        return [companies[key] for key, _ in ranked if key in companies]
+
+    score = func.word_similarity(normalized, func.coalesce(Company.search_document, ""))
+    return (
+        Company.query.filter(_trigram_filters((Company.search_document,), terms))
+        .order_by(score.desc(), Company.name.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def reset_search_indexes() -> None:
+    """Discard the in-process fallback indexes."""
+
+    global _offer_index, _company_index
+    with _index_lock:
+        _offer_index = (None, None)
+        _company_index = (None, 0.0, None)
+
+
+__all__ = [
+    "InvertedIndex",
+    "MAX_RESULTS",
+    "search_offers",
+    "search_companies",
+    "reset_search_indexes",
+]
@@ -1,14 +1,51 @@
-from TaqnyatSms import client as TaqnyatClient
 from app.models import SMSLog, VerificationCode, db
+from app.services.outbox_service import enqueue_sms
 from flask import current_app
 from datetime import datetime, timedelta
 import random
 
+OTP_MESSAGE = "رمز التحقق للنخبه هو: {code}"
+WELCOME_MESSAGE = "مرحباً بك في إليت! شكراً لتسجيلك معنا. نأمل أن تستمتع بتجربتك."
+
+
+def _store_otp(recipient: str, code: str, purpose: str) -> datetime:
+    expires_at = datetime.utcnow() + timedelta(minutes=10)
+    db.session.add(
+        VerificationCode(
+            phone_number=recipient,
+            code=code,
+            purpose=purpose,
+            expires_at=expires_at,
+        )
+    )
+    return expires_at
+
+
+def queue_otp(recipient: str, purpose: str = 'verification') -> None:
+    """Store a new OTP and queue its SMS in the current transaction; the caller commits.
+
+    Unlike ``SMSService.send_otp`` this does not talk to the SMS provider, so
+    request handlers return as soon as their commit completes. The SMS expires
+    with the code, so a backed-up outbox never delivers a dead code.
+    """
+    code = SMSService._generate_code()
+    expires_at = _store_otp(recipient, code, purpose)
+    enqueue_sms(recipient, OTP_MESSAGE.format(code=code), expires_at=expires_at)
+
+
+def queue_welcome(recipient: str) -> None:
+    """Queue the welcome SMS in the current transaction; the caller commits."""
+    enqueue_sms(recipient, WELCOME_MESSAGE)
+
+
 class SMSService:
     def __init__(self):
         # We should ideally move these to config, but for now using constants as per user sample
         self.bearer_token = '78fadbffb8d0f05434c0189f6d9cbf9f'
         self.sender_name = 'HENTAUTO'
+        # Imported here so the SMS SDK only loads in processes that send SMS.
+        from TaqnyatSms import client as TaqnyatClient
+
         self.client = TaqnyatClient(self.bearer_token)
 
     def send_sms(self, recipient, message):
@@ -28,21 +65,11 @@ class SMSService:
     def send_otp(self, recipient: str, purpose: str = 'verification'):
         """Generate and send an OTP."""
         code = self._generate_code()
-        message = f"رمز التحقق للنخبه هو: {code}"
-        
-        # Save code to DB
-        expires_at = datetime.utcnow() + timedelta(minutes=10)
-        verification = VerificationCode(
-            phone_number=recipient,
-            code=code,
-            purpose=purpose,
-            expires_at=expires_at
-        )
-        db.session.add(verification)
+        _store_otp(recipient, code, purpose)
         db.session.commit()
         
         # Send SMS
-        return self.send_sms(recipient, message)
+        return self.send_sms(recipient, OTP_MESSAGE.format(code=code))
 
     def verify_otp(self, phone_number: str, code: str, purpose: str = 'verification') -> bool:
         """Verify the provided OTP."""
@@ -61,8 +88,7 @@ class SMSService:
 
     def send_welcome(self, recipient: str):
         """Send welcome message."""
-        message = "مرحباً بك في إليت! شكراً لتسجيلك معنا. نأمل أن تستمتع بتجربتك."
-        return self.send_sms(recipient, message)
+        return self.send_sms(recipient, WELCOME_MESSAGE)
         
     def send_password_reset(self, recipient: str, token: str):
         """Send password reset link via SMS."""
@@ -76,7 +102,8 @@ class SMSService:
         message = f"رابط إعادة تعيين كلمة المرور لـ ELITE: {reset_url}"
         return self.send_sms(recipient, message)
 
-    def _generate_code(self):
+    @staticmethod
+    def _generate_code():
         return str(random.randint(1000, 9999))
 
     def _log_sms(self, recipient, message, response):
@@ -0,0 +1,489 @@
+"""Synthetic data generator used for load testing and capacity planning.
+
+Rows are generated in Python and written in batches straight through the
+connection: ``COPY ... FROM STDIN`` on PostgreSQL (psycopg2) and DBAPI
+``executemany`` elsewhere. The ORM session and its mapper events are
+bypassed, so derived columns such as ``search_document`` are filled in here.
+
+Activity is skewed with Zipf-like weights: a handful of "hot" partners and
+"power" members account for most redemption attempts, messages and
+notifications, which is what index and query tuning need to see.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import random
+import time
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text
+from werkzeug.security import generate_password_hash
+
+from app.core.database import db
+from app.core.normalization import build_search_document
+from app.core.partitioning import ensure_monthly_partitions
+from app.models import (
+    Company,
+    Conversation,
+    Message,
+    Notification,
+    Offer,
+    OfferClassification,
+    RedemptionEvent,
+    UsageCode,
+    User,
+)
+from app.models.communication import conversation_participants
+
+SEED_PASSWORD = "elite-seed-password"
+SEED_EMAIL_DOMAIN = "seed.elite.test"
+
+INDUSTRIES = ("مطاعم", "مقاهي", "ترفيه", "صحة", "تسوق", "سفر", "تعليم", "رياضة", "تجميل", "خدمات")
+CITIES = ("الرياض", "جدة", "الدمام", "مكة المكرمة", "المدينة المنورة", "الخبر", "أبها", "تبوك")
+CLASSIFICATIONS = ("first_time_offer", "loyalty_offer", "active_members_only", "happy_hour", "mid_week")
+NOTIFICATION_TYPES = ("new_offer", "membership_upgrade", "offer_feedback", "admin_broadcast", "welcome")
+# Verification outcomes and their relative frequency in the generated ledger.
+ATTEMPT_RESULTS: Tuple[Tuple[str, float], ...] = (
+    ("valid", 0.70),
+    ("invalid", 0.08),
+    ("not_found", 0.07),
+    ("expired", 0.06),
+    ("not_eligible", 0.04),
+    ("usage_limit_reached", 0.03),
+    ("limit_exceeded", 0.02),
+)
+
+
+@dataclass(frozen=True)
+class SeedScale:
+    """Row counts and distribution knobs for one generator run."""
+
+    members: int = 1_000
+    companies: int = 50
+    offers_per_company: int = 5
+    usage_codes_per_company: int = 10
+    attempts: int = 20_000
+    notifications: int = 5_000
+    conversations: int = 500
+    messages_per_conversation: int = 6
+    days: int = 365
+    skew: float = 1.1
+    batch_size: int = 10_000
+    seed: int = 42
+
+
+SCALE_PRESETS: Dict[str, SeedScale] = {
+    "small": SeedScale(),
+    "medium": SeedScale(
+        members=100_000,
+        companies=2_000,
+        attempts=1_000_000,
+        notifications=500_000,
+        conversations=20_000,
+    ),
+    "large": SeedScale(
+        members=300_000,
+        companies=5_000,
+        offers_per_company=8,
+        usage_codes_per_company=50,
+        attempts=10_000_000,
+        notifications=2_000_000,
+        conversations=100_000,
+        batch_size=50_000,
+    ),
+}
+
+
+@dataclass
+class SeedReport:
+    """Rows written per table and the elapsed wall time."""
+
+    rows: Dict[str, int]
+    seconds: float
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+
+ProgressCallback = Callable[[str, int, float], None]
+
+
+class _SkewedPicker:
+    """Draw ids with Zipf-like weights so low ranks are picked far more often."""
+
+    def __init__(self, ids: Sequence[int], skew: float, rng: random.Random) -> None:
+        self._ids = list(ids)
+        self._rng = rng
+        # Shuffle ranks so "hot" rows are not simply the oldest ids.
+        rng.shuffle(self._ids)
+        weights = [1.0 / ((rank + 1) ** skew) for rank in range(len(self._ids))] if skew > 0 else [1.0] * len(self._ids)
+        self._cumulative = list(accumulate(weights))
+        self._total = self._cumulative[-1] if self._cumulative else 0.0
+
+    def pick(self) -> int:
+        return self._ids[bisect_right(self._cumulative, self._rng.random() * self._total)]
+
+    def many(self, count: int) -> List[int]:
+        return self._rng.choices(self._ids, cum_weights=self._cumulative, k=count)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+class _BulkWriter:
+    """Batch rows into COPY (PostgreSQL/psycopg2) or DBAPI executemany."""
+
+    def __init__(self, connection, batch_size: int) -> None:
+        self._connection = connection
+        self._batch_size = max(1, int(batch_size))
+        dialect = connection.dialect
+        self._use_copy = dialect.name == "postgresql" and dialect.driver == "psycopg2"
+        self._paramstyle = dialect.paramstyle
+
+    def _placeholders(self, count: int) -> str:
+        if self._paramstyle == "qmark":
+            return ", ".join("?" for _ in range(count))
+        if self._paramstyle == "numeric":
+            return ", ".join(f":{index + 1}" for index in range(count))
+        return ", ".join("%s" for _ in range(count))
+
+    def _copy(self, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(rows)
+        buffer.seek(0)
+        cursor = self._connection.connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+
+    def write(self, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+        statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({self._placeholders(len(columns))})"
+        written = 0
+        batch: List[tuple] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self._batch_size:
+                written += self._flush(table, columns, statement, batch)
+                batch = []
+        if batch:
+            written += self._flush(table, columns, statement, batch)
+        return written
+
+    def _flush(self, table: str, columns: Sequence[str], statement: str, batch: List[tuple]) -> int:
+        if self._use_copy:
+            self._copy(table, columns, batch)
+        else:
+            self._connection.exec_driver_sql(statement, batch)
+        return len(batch)
+
+
+def _next_id(connection, model) -> int:
+    return int(connection.execute(select(func.coalesce(func.max(model.id), 0))).scalar_one()) + 1
+
+
+def _offer_title(rng: random.Random, industry: str, index: int) -> str:
+    discount = rng.choice((10, 15, 20, 25, 30, 40, 50))
+    return f"خصم {discount}% - {industry} {index}"
+
+
+def generate_synthetic_data(
+    scale: SeedScale,
+    *,
+    progress: Optional[ProgressCallback] = None,
+) -> SeedReport:
+    """Append a synthetic dataset sized by ``scale`` and return row counts."""
+
+    rng = random.Random(scale.seed)
+    now = datetime.utcnow()
+    window_seconds = max(scale.days, 1) * 86_400
+    started = time.perf_counter()
+    rows: Dict[str, int] = {}
+    # Hashing is deliberately slow; every seeded account shares one hash.
+    password_hash = generate_password_hash(SEED_PASSWORD)
+    engine = db.engine
+    run_tag = f"{scale.seed}-{int(time.time())}"
+
+    def _random_moment() -> datetime:
+        return now - timedelta(seconds=rng.random() * window_seconds)
+
+    def _step(name: str, write: Callable[[_BulkWriter, object], int]) -> None:
+        step_started = time.perf_counter()
+        with engine.begin() as connection:
+            count = write(_BulkWriter(connection, scale.batch_size), connection)
+        rows[name] = rows.get(name, 0) + count
+        if progress is not None:
+            progress(name, count, time.perf_counter() - step_started)
+
+    with engine.connect() as connection:
+        first_user_id = _next_id(connection, User)
+        first_company_id = _next_id(connection, Company)
+        first_offer_id = _next_id(connection, Offer)
+
+    member_ids = list(range(first_user_id, first_user_id + scale.members))
+    owner_start = first_user_id + scale.members
+    owner_ids = list(range(owner_start, owner_start + scale.companies))
+    company_ids = list(range(first_company_id, first_company_id + scale.companies))
+
+    user_columns = ("id", "username", "email", "password_hash", "role", "is_phone_verified", "is_active", "joined_at")
+
+    def _users(writer: _BulkWriter, _connection) -> int:
+        def _generate() -> Iterator[tuple]:
+            for user_id in member_ids:
+                handle = f"seed-{run_tag}-m{user_id}"
+                yield (
+                    user_id, handle, f"{handle}@{SEED_EMAIL_DOMAIN}", password_hash, "member",
+                    rng.random() < 0.6, rng.random() < 0.97, _timestamp(_random_moment()),
+                )
+            for user_id in owner_ids:
+                handle = f"seed-{run_tag}-p{user_id}"
+                yield (
+                    user_id, handle, f"{handle}@{SEED_EMAIL_DOMAIN}", password_hash, "company",
+                    True, True, _timestamp(_random_moment()),
+                )
+
+        return writer.write(User.__tablename__, user_columns, _generate())
+
+    company_industries: Dict[int, str] = {}
+
+    def _companies(writer: _BulkWriter, connection) -> int:
+        def _generate() -> Iterator[tuple]:
+            for company_id, owner_id in zip(company_ids, owner_ids):
+                industry = INDUSTRIES[int(rng.paretovariate(1.5)) % len(INDUSTRIES)]
+                company_industries[company_id] = industry
+                name = f"شريك {company_id} - {industry}"
+                yield (
+                    company_id, name, f"وصف تجريبي لشريك في قطاع {industry}", _timestamp(_random_moment()),
+                    owner_id, json.dumps({}), "approved" if rng.random() < 0.95 else "pending",
+                    rng.choice(CITIES), industry, build_search_document((name, industry)),
+                )
+
+        count = writer.write(
+            Company.__tablename__,
+            (
+                "id", "name", "description", "created_at", "owner_user_id", "notification_preferences",
+                "status", "city", "industry", "search_document",
+            ),
+            _generate(),
+        )
+        if owner_ids:
+            connection.execute(
+                text(
+                    "UPDATE users SET company_id = "
+                    "(SELECT companies.id FROM companies WHERE companies.owner_user_id = users.id) "
+                    "WHERE users.id BETWEEN :low AND :high"
+                ),
+                {"low": owner_ids[0], "high": owner_ids[-1]},
+            )
+        return count
+
+    offers_by_company: Dict[int, Tuple[int, int]] = {}
+    offer_count = scale.companies * scale.offers_per_company
+
+    def _offers(writer: _BulkWriter, _connection) -> int:
+        def _generate() -> Iterator[tuple]:
+            offer_id = first_offer_id
+            for company_id in company_ids:
+                industry = company_industries.get(company_id, INDUSTRIES[0])
+                offers_by_company[company_id] = (offer_id, offer_id + scale.offers_per_company - 1)
+                for index in range(scale.offers_per_company):
+                    title = _offer_title(rng, industry, index + 1)
+                    description = f"عرض حصري لأعضاء النخبة في {industry}"
+                    created_at = _random_moment()
+                    yield (
+                        offer_id, title, description, float(rng.choice((5, 10, 15, 20, 25, 30, 40, 50))),
+                        "active" if rng.random() < 0.9 else "paused",
+                        _timestamp(created_at + timedelta(days=rng.randint(30, 240))),
+                        company_id, _timestamp(created_at), build_search_document((title, description)),
+                    )
+                    offer_id += 1
+
+        return writer.write(
+            Offer.__tablename__,
+            ("id", "title", "description", "base_discount", "status", "valid_until", "company_id", "created_at", "search_document"),
+            _generate(),
+        )
+
+    def _classifications(writer: _BulkWriter, _connection) -> int:
+        def _generate() -> Iterator[tuple]:
+            for offer_id in range(first_offer_id, first_offer_id + offer_count):
+                for classification in rng.sample(CLASSIFICATIONS, rng.choice((0, 1, 1, 2))):
+                    yield (offer_id, classification)
+
+        return writer.write(OfferClassification.__tablename__, ("offer_id", "classification"), _generate())
+
+    def _usage_codes(writer: _BulkWriter, _connection) -> int:
+        def _generate() -> Iterator[tuple]:
+            for company_id in company_ids:
+                created_at = now - timedelta(minutes=5 * scale.usage_codes_per_company)
+                for index in range(scale.usage_codes_per_company):
+                    last = index == scale.usage_codes_per_company - 1
+                    yield (
+                        str(rng.randint(1000, 99999)), company_id, _timestamp(created_at),
+                        _timestamp(created_at + timedelta(minutes=5)) if not last else _timestamp(now + timedelta(minutes=5)),
+                        rng.randint(0, 10) if not last else 0, 10,
+                    )
+                    created_at += timedelta(minutes=5)
+
+        return writer.write(
+            UsageCode.__tablename__,
+            ("code", "partner_id", "created_at", "expires_at", "usage_count", "max_uses_per_window"),
+            _generate(),
+        )
+
+    def _attempts(writer: _BulkWriter, connection) -> int:
+        if not (member_ids and company_ids and scale.offers_per_company):
+            return 0
+        # On PostgreSQL the ledger is partitioned by month; cover the whole window.
+        ensure_monthly_partitions(
+            connection,
+            RedemptionEvent.__tablename__,
+            first=now - timedelta(seconds=window_seconds),
+            last=now,
+        )
+        partners = _SkewedPicker(company_ids, scale.skew, rng)
+        members = _SkewedPicker(member_ids, scale.skew * 0.8, rng)
+        results = [name for name, _weight in ATTEMPT_RESULTS]
+        result_weights = list(accumulate(weight for _name, weight in ATTEMPT_RESULTS))
+        chunk = max(1, scale.batch_size)
+
+        def _generate() -> Iterator[tuple]:
+            remaining = scale.attempts
+            while remaining > 0:
+                size = min(chunk, remaining)
+                picked_partners = partners.many(size)
+                picked_members = members.many(size)
+                picked_results = rng.choices(results, cum_weights=result_weights, k=size)
+                for partner_id, member_id, result in zip(picked_partners, picked_members, picked_results):
+                    low, high = offers_by_company[partner_id]
+                    moment = _timestamp(_random_moment())
+                    yield (
+                        "usage_code_attempt", member_id, partner_id, rng.randint(low, high),
+                        str(rng.randint(1000, 99999)), result, moment,
+                    )
+                remaining -= size
+
+        return writer.write(
+            RedemptionEvent.__tablename__,
+            ("kind", "member_id", "partner_id", "offer_id", "code_used", "result", "created_at"),
+            _generate(),
+        )
+
+    def _notifications(writer: _BulkWriter, _connection) -> int:
+        if not member_ids:
+            return 0
+        recipients = _SkewedPicker(member_ids, scale.skew * 0.5, rng)
+
+        def _generate() -> Iterator[tuple]:
+            for user_id in recipients.many(scale.notifications):
+                kind = rng.choice(NOTIFICATION_TYPES)
+                yield (
+                    user_id, kind, f"إشعار تجريبي ({kind})", "رسالة تجريبية لاختبار الأداء.",
+                    "/portal/notifications", rng.random() < 0.6, _timestamp(_random_moment()), json.dumps({"seed": True}),
+                )
+
+        return writer.write(
+            Notification.__tablename__,
+            ("user_id", "type", "title", "message", "link_url", "is_read", "created_at", "metadata_json"),
+            _generate(),
+        )
+
+    def _conversations(writer: _BulkWriter, connection) -> int:
+        if not (member_ids and owner_ids and scale.conversations):
+            return 0
+        first_conversation_id = _next_id(connection, Conversation)
+        conversation_ids = range(first_conversation_id, first_conversation_id + scale.conversations)
+        members = _SkewedPicker(member_ids, scale.skew * 0.8, rng)
+        owners = _SkewedPicker(owner_ids, scale.skew, rng)
+        pairs = [(members.pick(), owners.pick()) for _ in conversation_ids]
+        moments = [_random_moment() for _ in conversation_ids]
+
+        count = writer.write(
+            Conversation.__tablename__,
+            ("id", "subject", "created_at", "updated_at"),
+            (
+                (conversation_id, f"محادثة تجريبية {conversation_id}", _timestamp(moment), _timestamp(moment))
+                for conversation_id, moment in zip(conversation_ids, moments)
+            ),
+        )
+        writer.write(
+            conversation_participants.name,
+            ("conversation_id", "user_id"),
+            (
+                participant
+                for conversation_id, (member_id, owner_id) in zip(conversation_ids, pairs)
+                for participant in ((conversation_id, member_id), (conversation_id, owner_id))
+            ),
+        )
+
+        def _messages() -> Iterator[tuple]:
+            for conversation_id, (member_id, owner_id), moment in zip(conversation_ids, pairs, moments):
+                for index in range(scale.messages_per_conversation):
+                    sent_at = moment + timedelta(minutes=7 * index)
+                    yield (
+                        conversation_id, member_id if index % 2 == 0 else owner_id,
+                        f"رسالة تجريبية رقم {index + 1}", _timestamp(sent_at),
+                        _timestamp(sent_at + timedelta(minutes=3)) if rng.random() < 0.7 else None,
+                    )
+
+        rows["messages"] = writer.write(
+            Message.__tablename__,
+            ("conversation_id", "sender_id", "body", "created_at", "read_at"),
+            _messages(),
+        )
+        return count
+
+    _step("users", _users)
+    _step("companies", _companies)
+    _step("offers", _offers)
+    _step("offer_classifications", _classifications)
+    _step("usage_codes", _usage_codes)
+    _step("redemption_events", _attempts)
+    _step("notifications", _notifications)
+    _step("conversations", _conversations)
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            for table in ("users", "companies", "offers", "offer_classifications", "usage_codes",
+                          "redemption_events", "notifications", "conversations", "messages"):
+                connection.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+                )
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("ANALYZE")
+
+    return SeedReport(rows=rows, seconds=round(time.perf_counter() - started, 2))
+
+
+def resolve_scale(preset: str, **overrides) -> SeedScale:
+    """Return ``preset`` with any non-``None`` override applied."""
+
+    base = SCALE_PRESETS[preset]
+    values = {key: value for key, value in overrides.items() if value is not None}
+    return replace(base, **values)
+
+
+def describe_scale(scale: SeedScale) -> Dict[str, object]:
+    return asdict(scale)
+
+
+__all__ = [
+    "SCALE_PRESETS",
+    "SEED_PASSWORD",
+    "SeedReport",
+    "SeedScale",
+    "describe_scale",
+    "generate_synthetic_data",
+    "resolve_scale",
+]
@@ -6,13 +6,22 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import secrets
 
+from typing import List
+
+from app import celery
 from app.core.database import db
+from app.core.metrics import record_usage_attempt
 from flask import current_app
 from sqlalchemy import or_
-from sqlalchemy.orm import lazyload
-from app.models import ActivityLog, Offer, UsageCode
-from app.modules.admin.services.admin_settings_service import get_admin_settings
-from app.services.incentive_eligibility_service import evaluate_offer_eligibility
+from app.models import Company, Offer, RedemptionEvent, UsageCode
+from app.services.redemption_ledger_service import USAGE_CODE_ATTEMPT, record_event, usage_attempts
+from app.services.usage_code_stream_service import (
+    EVENT_REDEEMED,
+    EVENT_ROTATED,
+    StreamSettings,
+    open_screen_partners,
+    queue_usage_code_event,
+)
 
 
 USAGE_CODE_MAX_USES = 10
@@ -27,6 +36,11 @@ class UsageCodeSettings:
 def get_usage_code_settings() -> UsageCodeSettings:
     """Return usage-code settings sourced from admin configuration."""
 
+    # Imported here: app.modules.admin loads every blueprint, and the company
+    # portal imports this module, so a top-level import is circular whenever
+    # this module is imported first (as the Celery worker does).
+    from app.modules.admin.services.admin_settings_service import get_admin_settings
+
     verification = get_admin_settings().get("verification_code", {})
     expiry_seconds = int(
         verification.get("usage_code_expiry_seconds")
@@ -50,9 +64,9 @@ def _generate_numeric_code() -> str:
 
 
 def _usage_code_query():
-    """Return a usage code query without eager-loading partner relationships."""
+    """Return the base usage code query (partners load lazily by default)."""
 
-    return UsageCode.query.options(lazyload(UsageCode.partner))
+    return UsageCode.query
 
 
 def _active_usage_code_filter(query, now: datetime):
@@ -63,6 +77,16 @@ def _active_usage_code_filter(query, now: datetime):
     )
 
 
+def get_active_usage_code(partner_id: int, *, now: datetime | None = None) -> UsageCode | None:
+    """Return the partner's newest non-expired code, if any."""
+
+    return (
+        _active_usage_code_filter(_usage_code_query().filter_by(partner_id=partner_id), now or datetime.utcnow())
+        .order_by(UsageCode.created_at.desc())
+        .first()
+    )
+
+
 def generate_usage_code(partner_id: int, *, commit: bool = True) -> UsageCode:
     """Create a fresh usage code for a partner, expiring any active code."""
 
@@ -107,6 +131,7 @@ def generate_usage_code(partner_id: int, *, commit: bool = True) -> UsageCode:
         max_uses_per_window=settings.max_uses_per_window,
     )
     db.session.add(usage_code)
+    queue_usage_code_event(EVENT_ROTATED, usage_code)
     if commit:
         db.session.commit()
     else:
@@ -121,24 +146,18 @@ def log_usage_attempt(
     offer_id: int | None,
     code_used: str | None,
     result: str,
-) -> ActivityLog:
-    """Persist a usage verification attempt in the activity log."""
-
-    created_at = datetime.utcnow()
-    entry = ActivityLog(
-        admin_id=None,
-        company_id=None,
-        action="usage_code_attempt",
-        details=f"Usage code attempt result: {result}",
+) -> RedemptionEvent:
+    """Persist a usage verification attempt in the redemption ledger."""
+
+    entry = record_event(
+        USAGE_CODE_ATTEMPT,
         member_id=member_id,
         partner_id=partner_id,
         offer_id=offer_id,
         code_used=code_used,
         result=result,
-        created_at=created_at,
-        timestamp=created_at,
     )
-    db.session.add(entry)
+    record_usage_attempt(result)
     return entry
 
 
@@ -220,6 +239,8 @@ def verify_usage_code(
                 return {"ok": False, "result": "expired", "message": "انتهت صلاحية الكود."}
 
             # 5. التحقق من أهلية العضو (Eligibility)
+            from app.services.incentive_eligibility_service import evaluate_offer_eligibility
+
             eligibility = evaluate_offer_eligibility(member_id, offer_id)
             if not eligibility["eligible"]:
                 reason_code = eligibility.get("reason", "unknown")
@@ -250,18 +271,16 @@ def verify_usage_code(
             window_start = usage_code.created_at
             window_end = usage_code.expires_at
 
-            successful_attempts_query = ActivityLog.query.filter_by(
-                action="usage_code_attempt",
+            successful_attempts_query = usage_attempts(["valid", "success"]).filter_by(
                 partner_id=partner_id,
                 code_used=normalized_code,
             ).filter(
-                ActivityLog.result.in_(["valid", "success"]),
-                ActivityLog.created_at >= window_start
+                RedemptionEvent.created_at >= window_start
             )
 
             if window_end:
                 successful_attempts_query = successful_attempts_query.filter(
-                    ActivityLog.created_at <= window_end
+                    RedemptionEvent.created_at <= window_end
                 )
 
             # التحقق من تكرار الاستخدام لنفس العضو
@@ -314,7 +333,12 @@ def verify_usage_code(
             # تأكيد الحفظ في قاعدة البيانات قبل الخروج من سياق المعاملة
             session.flush()
 
-            # 9. التزام الحفظ النهائي (Commit)
+        # Queued only once the savepoint is released: rolling a savepoint back
+        # does not fire after_rollback, so an event queued inside it would
+        # still be published by the caller's next commit.
+        queue_usage_code_event(EVENT_REDEEMED, usage_code)
+
+        # 9. التزام الحفظ النهائي (Commit)
         if not is_in_txn:
             session.commit()
 
@@ -337,10 +361,55 @@ def verify_usage_code(
         return {"ok": False, "result": "error", "message": "حدث خطأ أثناء معالجة الطلب."}
 
 
+def rotate_due_usage_codes(*, now: datetime | None = None) -> List[int]:
+    """Replace codes that expire before the next run, for partners with a screen open.
+
+    Returns the partner ids that received a new code; each rotation is pushed
+    to the partner's screens once the batch commits.
+    """
+
+    config = current_app.config
+    partner_ids = open_screen_partners(StreamSettings.from_config(config).screen_ttl_seconds)
+    if not partner_ids:
+        return []
+
+    now = now or datetime.utcnow()
+    # Rotating one interval early means screens never show an expired code.
+    horizon = now + timedelta(seconds=float(config.get("USAGE_CODE_ROTATION_INTERVAL_SECONDS", 10)))
+    covered = {
+        partner_id
+        for (partner_id,) in db.session.query(UsageCode.partner_id)
+        .filter(UsageCode.partner_id.in_(partner_ids))
+        .filter(or_(UsageCode.expires_at.is_(None), UsageCode.expires_at > horizon))
+        .distinct()
+    }
+    due = [
+        partner_id
+        for (partner_id,) in db.session.query(Company.id)
+        .filter(Company.id.in_(partner_ids), Company.status != "correction")
+        .order_by(Company.id)
+        if partner_id not in covered
+    ]
+    for partner_id in due:
+        generate_usage_code(partner_id, commit=False)
+    db.session.commit()
+    return due
+
+
+@celery.task(name="usage_codes.rotate", ignore_result=True)
+def rotate_usage_codes_task():
+    """Beat job rotating expiring usage codes for partners with an open screen."""
+
+    rotate_due_usage_codes()
+
+
 __all__ = [
     "UsageCodeSettings",
     "generate_usage_code",
+    "get_active_usage_code",
     "get_usage_code_settings",
     "log_usage_attempt",
+    "rotate_due_usage_codes",
+    "rotate_usage_codes_task",
     "verify_usage_code",
 ]
@@ -0,0 +1,241 @@
+"""Server-sent events for partner usage-code screens.
+
+Cashier screens keep one ``EventSource`` open on ``/company/usage-codes/stream``
+instead of polling. :func:`queue_usage_code_event` records a snapshot of a code
+on the session; once that transaction commits, the snapshot is published on the
+partner's Redis channel and every stream subscribed to it forwards it:
+
+* ``rotated``: a new code was generated, by hand, on reaching its usage limit
+  or by the ``usage_codes.rotate`` beat job when the old one expires;
+* ``redeemed``: a redemption raised the code's ``usage_count``.
+
+Open streams (and the polling fallback) record the partner in a Redis sorted
+set with a heartbeat. The rotation job only replaces codes for partners with a
+screen open, so idle partners do not gain a row per expiry window.
+
+A stream holds a worker for at most ``USAGE_CODE_STREAM_MAX_SECONDS`` and then
+ends; the browser reconnects after the ``retry`` delay sent first, which also
+re-checks the partner's session.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import monotonic, time
+from typing import Any, Dict, Iterator, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import app as app_module
+from app.core.database import db
+from app.core.json_provider import dumps, loads
+from app.core.metrics.instruments import track_redis
+from app.logging.logger import get_logger
+from app.models import UsageCode
+
+_LOGGER = get_logger(__name__)
+
+CHANNEL_PREFIX = "usage_codes:partner"
+SCREENS_KEY = "usage_codes:screens"
+
+EVENT_SNAPSHOT = "snapshot"
+EVENT_ROTATED = "rotated"
+EVENT_REDEEMED = "redeemed"
+
+_SESSION_KEY = "usage_code_events"
+_HOOKS_INSTALLED = False
+
+
+@dataclass(frozen=True)
+class StreamSettings:
+    heartbeat_seconds: float
+    max_seconds: float
+    retry_ms: int
+
+    @classmethod
+    def from_config(cls, config) -> "StreamSettings":
+        return cls(
+            heartbeat_seconds=max(float(config.get("USAGE_CODE_STREAM_HEARTBEAT_SECONDS", 15)), 1.0),
+            max_seconds=float(config.get("USAGE_CODE_STREAM_MAX_SECONDS", 300)),
+            retry_ms=int(config.get("USAGE_CODE_STREAM_RETRY_MS", 3000)),
+        )
+
+    @property
+    def screen_ttl_seconds(self) -> float:
+        # Three missed heartbeats (or polls) and the screen counts as closed.
+        return self.heartbeat_seconds * 3
+
+
+def channel_for(partner_id: int) -> str:
+    return f"{CHANNEL_PREFIX}:{partner_id}"
+
+
+def snapshot(usage_code: Optional[UsageCode]) -> Dict[str, Any]:
+    """Public view of a code, as returned by the JSON endpoints and pushed to screens."""
+
+    if usage_code is None:
+        return {"code": None, "expires_at": None, "usage_count": 0, "max_uses_per_window": None}
+    return {
+        "code": usage_code.code,
+        "expires_at": usage_code.expires_at.isoformat() if usage_code.expires_at else None,
+        "usage_count": usage_code.usage_count,
+        "max_uses_per_window": usage_code.max_uses_per_window,
+    }
+
+
+def queue_usage_code_event(event_name: str, usage_code: UsageCode, *, session: Optional[Session] = None) -> None:
+    """Publish ``usage_code``'s current state to its partner's screens after the next commit."""
+
+    session = session or db.session
+    session.info.setdefault(_SESSION_KEY, []).append((usage_code.partner_id, event_name, snapshot(usage_code)))
+
+
+def publish(partner_id: int, event_name: str, payload: Dict[str, Any]) -> bool:
+    client = app_module.redis_client
+    if client is None:
+        return False
+    try:
+        with track_redis("publish"):
+            client.publish(channel_for(partner_id), dumps({"event": event_name, "data": payload}))
+    except RedisError as exc:
+        _LOGGER.warning(
+            "Usage code event not published",
+            extra={
+                "log_payload": {
+                    "event": "usage_code_publish_failed",
+                    "partner_id": partner_id,
+                    "error": str(exc),
+                }
+            },
+        )
+        return False
+    return True
+
+
+def mark_screen_open(partner_id: int) -> None:
+    client = app_module.redis_client
+    if client is None:
+        return
+    try:
+        with track_redis("zadd"):
+            client.zadd(SCREENS_KEY, {str(partner_id): time()})
+    except RedisError:
+        # Without presence the screen still works; it just waits for a manual rotation.
+        pass
+
+
+def open_screen_partners(ttl_seconds: float) -> List[int]:
+    """Return partners with a stream or poll seen within ``ttl_seconds``, pruning the rest."""
+
+    client = app_module.redis_client
+    if client is None:
+        return []
+    cutoff = time() - ttl_seconds
+    try:
+        with track_redis("zremrangebyscore"):
+            client.zremrangebyscore(SCREENS_KEY, "-inf", cutoff)
+        with track_redis("zrangebyscore"):
+            members = client.zrangebyscore(SCREENS_KEY, cutoff, "+inf")
+    except RedisError as exc:
+        _LOGGER.warning(
+            "Usage code screen presence unavailable",
+            extra={"log_payload": {"event": "usage_code_presence_unavailable", "error": str(exc)}},
+        )
+        return []
+    return [int(member) for member in members]
+
+
+def format_event(event_name: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event_name}\ndata: {dumps(payload)}\n\n"
+
+
+def subscribe(partner_id: int):
+    """Open a pub/sub subscription for ``partner_id``; raises ``RedisError`` when Redis is down."""
+
+    client = app_module.redis_client
+    if client is None:
+        raise RedisError("Redis client is not configured")
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    try:
+        with track_redis("subscribe"):
+            pubsub.subscribe(channel_for(partner_id))
+    except RedisError:
+        pubsub.close()
+        raise
+    return pubsub
+
+
+def iter_events(pubsub, partner_id: int, initial: Dict[str, Any], settings: StreamSettings) -> Iterator[str]:
+    """Yield the initial snapshot, then published events and keep-alives until the deadline.
+
+    Runs outside the request context: it touches neither the database nor the app config.
+    """
+
+    yield f"retry: {settings.retry_ms}\n" + format_event(EVENT_SNAPSHOT, initial)
+    deadline = monotonic() + settings.max_seconds
+    next_heartbeat = monotonic() + settings.heartbeat_seconds
+    try:
+        while True:
+            now = monotonic()
+            if now >= deadline:
+                break
+            message = pubsub.get_message(timeout=max(min(next_heartbeat, deadline) - now, 0.0))
+            if message and message.get("type") == "message":
+                published = loads(message["data"])
+                yield format_event(published["event"], published["data"])
+            if monotonic() >= next_heartbeat:
+                mark_screen_open(partner_id)
+                yield ": keep-alive\n\n"
+                next_heartbeat = monotonic() + settings.heartbeat_seconds
+    except RedisError as exc:
+        # Ending the stream makes the browser reconnect after the retry delay.
+        _LOGGER.warning(
+            "Usage code stream interrupted",
+            extra={
+                "log_payload": {
+                    "event": "usage_code_stream_interrupted",
+                    "partner_id": partner_id,
+                    "error": str(exc),
+                }
+            },
+        )
+
+
+def _publish_after_commit(session: Session) -> None:
+    for partner_id, event_name, payload in session.info.pop(_SESSION_KEY, None) or ():
+        publish(partner_id, event_name, payload)
+
+
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+def register_usage_code_stream_hooks() -> None:
+    """Publish queued usage-code events once their transaction commits."""
+
+    global _HOOKS_INSTALLED
+    if _HOOKS_INSTALLED:
+        return
+    event.listen(Session, "after_commit", _publish_after_commit)
+    event.listen(Session, "after_rollback", _clear_after_rollback)
+    _HOOKS_INSTALLED = True
+
+
+__all__ = [
+    "EVENT_REDEEMED",
+    "EVENT_ROTATED",
+    "EVENT_SNAPSHOT",
+    "StreamSettings",
+    "channel_for",
+    "format_event",
+    "iter_events",
+    "mark_screen_open",
+    "open_screen_partners",
+    "publish",
+    "queue_usage_code_event",
+    "register_usage_code_stream_hooks",
+    "snapshot",
+    "subscribe",
+]
@@ -0,0 +1 @@
+"""In-process benchmark suite for ELITE hot paths (see ``benchmarks/README.md``)."""
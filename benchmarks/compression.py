@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Bytes on the wire and CPU cost of response compression for the offers pages.
+
+Seeds the benchmark dataset, fetches ``GET /portal/offers`` (HTML) and
+``GET /api/offers/?limit=200`` (JSON) uncompressed, then compresses each body
+at several gzip levels and brotli qualities and reports the compressed size,
+the ratio and the CPU time per compression. The last rows time the full
+request through ``app.core.compression`` with and without
+``Accept-Encoding``.
+
+    python -m benchmarks.compression
+    python -m benchmarks.compression --offers 300 --iterations 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import zlib
+from time import perf_counter, process_time
+from typing import Callable, Dict, List
+
+from .run import ROOT, _configure_environment
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 6, 11)
+
+
+def _gzip(level: int) -> Callable[[bytes], bytes]:
+    def _compress(data: bytes) -> bytes:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    return _compress
+
+
+def _brotli(quality: int) -> Callable[[bytes], bytes]:
+    import brotli
+
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def _cpu_ms(operation: Callable[[], object], iterations: int) -> float:
+    operation()
+    started = process_time()
+    for _ in range(iterations):
+        operation()
+    return (process_time() - started) * 1000 / iterations
+
+
+def _codecs() -> List[tuple]:
+    codecs = [(f"gzip-{level}", _gzip(level)) for level in GZIP_LEVELS]
+    try:
+        codecs += [(f"br-{quality}", _brotli(quality)) for quality in BROTLI_QUALITIES]
+    except ImportError:
+        print("ℹ️  brotli is not installed; reporting gzip only.\n")
+    return codecs
+
+
+def _request_ms(client, path: str, accept_encoding: str, iterations: int) -> Dict[str, float]:
+    headers = {"Accept-Encoding": accept_encoding}
+    client.get(path, headers=headers)
+    started = perf_counter()
+    cpu_started = process_time()
+    size = 0
+    for _ in range(iterations):
+        size = len(client.get(path, headers=headers).get_data())
+    return {
+        "bytes": size,
+        "wall_ms": (perf_counter() - started) * 1000 / iterations,
+        "cpu_ms": (process_time() - cpu_started) * 1000 / iterations,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure response compression on the offers pages.")
+    parser.add_argument("--database-url", help="Throwaway database to seed (tables are dropped afterwards).")
+    parser.add_argument("--offers", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    temp_path = _configure_environment(args.database_url)
+    sys.path.insert(0, str(ROOT))
+
+    from app import create_app
+    from app.core.database import db
+
+    from .scenarios import BenchmarkScale, _client, seed_database
+
+    app = create_app()
+    scale = BenchmarkScale(offers=args.offers)
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            fixture = seed_database(scale)
+        client = _client(app, fixture.member_id)
+        pages = {
+            "portal_offers.html": "/portal/offers",
+            "api_offers.json": "/api/offers/?limit=200",
+        }
+        bodies = {
+            name: client.get(path, headers={"Accept-Encoding": "identity"}).get_data()
+            for name, path in pages.items()
+        }
+
+        print(f"{'body':<20} {'codec':<9} {'bytes':>9} {'ratio':>7} {'cpu ms':>8}")
+        for name, body in bodies.items():
+            print(f"{name:<20} {'identity':<9} {len(body):>9} {1:>7.3f} {0:>8.3f}")
+            for label, compress in _codecs():
+                size = len(compress(body))
+                cpu = _cpu_ms(lambda: compress(body), args.iterations)
+                print(f"{name:<20} {label:<9} {size:>9} {size / len(body):>7.3f} {cpu:>8.3f}")
+            print()
+
+        print(f"{'request':<20} {'encoding':<9} {'bytes':>9} {'wall ms':>9} {'cpu ms':>8}")
+        for name, path in pages.items():
+            for encoding in ("identity", "gzip", "br"):
+                timing = _request_ms(client, path, encoding, args.iterations)
+                print(
+                    f"{name:<20} {encoding:<9} {timing['bytes']:>9} "
+                    f"{timing['wall_ms']:>9.2f} {timing['cpu_ms']:>8.2f}"
+                )
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
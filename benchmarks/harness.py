@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Timing, query counting and baseline comparison helpers for the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class ScenarioResult:
+    """Summary statistics for one benchmark scenario."""
+
+    name: str
+    operations: int
+    errors: int
+    wall_seconds: float
+    throughput_per_second: float
+    latency_ms: Dict[str, float]
+    queries_per_operation: float
+    parameters: Dict[str, object] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank style percentile with linear interpolation."""
+
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (pct / 100) * (len(sorted_values) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = rank - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies_ms)
+    summary = {f"p{pct}": round(percentile(ordered, pct), 3) for pct in PERCENTILES}
+    summary["mean"] = round(sum(ordered) / len(ordered), 3) if ordered else 0.0
+    summary["min"] = round(ordered[0], 3) if ordered else 0.0
+    summary["max"] = round(ordered[-1], 3) if ordered else 0.0
+    return summary
+
+
+class QueryCounter:
+    """Count SQL statements emitted on ``engine`` from any thread."""
+
+    def __init__(self, engine) -> None:
+        self._engine = engine
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _record(self, *_args, **_kwargs) -> None:
+        with self._lock:
+            self.count += 1
+
+    @contextmanager
+    def capture(self) -> Iterator["QueryCounter"]:
+        self.count = 0
+        event.listen(self._engine, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            event.remove(self._engine, "before_cursor_execute", self._record)
+
+
+def run_scenario(
+    name: str,
+    operation: Callable[[int], Optional[bool]],
+    *,
+    engine,
+    iterations: int,
+    warmup: int = 3,
+    threads: int = 1,
+    parameters: Optional[Dict[str, object]] = None,
+) -> ScenarioResult:
+    """Time ``operation(index)`` ``iterations`` times, optionally across threads.
+
+    ``operation`` returns ``False`` to mark an operation as failed; exceptions
+    are counted as errors as well.
+    """
+
+    for index in range(warmup):
+        operation(-1 - index)
+
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def _timed(index: int) -> None:
+        nonlocal errors
+        started = perf_counter()
+        try:
+            ok = operation(index)
+        except Exception:
+            ok = False
+        elapsed = (perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if ok is False:
+                errors += 1
+
+    counter = QueryCounter(engine)
+    with counter.capture():
+        wall_started = perf_counter()
+        if threads > 1:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(_timed, range(iterations)))
+        else:
+            for index in range(iterations):
+                _timed(index)
+        wall_seconds = perf_counter() - wall_started
+
+    return ScenarioResult(
+        name=name,
+        operations=iterations,
+        errors=errors,
+        wall_seconds=round(wall_seconds, 4),
+        throughput_per_second=round(iterations / wall_seconds, 2) if wall_seconds else 0.0,
+        latency_ms=summarize_latencies(latencies),
+        queries_per_operation=round(counter.count / iterations, 2) if iterations else 0.0,
+        parameters={"threads": threads, **(parameters or {})},
+    )
+
+
+def load_baseline(path: str) -> Tuple[Dict[str, object], Dict[str, Dict[str, object]]]:
+    """Return ``(metadata, scenarios by name)`` from a baseline file."""
+
+    try:
+        with open(path, encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except FileNotFoundError:
+        return {}, {}
+    scenarios = {entry["name"]: entry for entry in payload.get("scenarios", [])}
+    return payload.get("metadata") or {}, scenarios
+
+
+def write_results(path: str, results: List[ScenarioResult], metadata: Dict[str, object]) -> None:
+    payload = {"metadata": metadata, "scenarios": [result.to_dict() for result in results]}
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, ensure_ascii=False)
+        handle.write("\n")
+
+
+def compare_with_baseline(
+    result: ScenarioResult,
+    baseline: Optional[Dict[str, object]],
+    *,
+    latency_tolerance: float,
+    query_tolerance: float = 0.0,
+    latency_floor_ms: float = 0.0,
+    compare_latency: bool = True,
+) -> List[str]:
+    """Return human-readable regressions of ``result`` against ``baseline``.
+
+    Latency percentiles may drift by ``latency_tolerance`` and statements per
+    operation by ``query_tolerance`` (both fractions) before they count as a
+    regression. Latency changes smaller than ``latency_floor_ms`` are treated
+    as noise regardless of the relative change. With ``compare_latency`` off
+    only statements per operation and errors are checked.
+    """
+
+    if not baseline:
+        return []
+    problems = []
+    base_latency = baseline.get("latency_ms") or {}
+    for key in ("p50", "p95") if compare_latency else ():
+        previous = float(base_latency.get(key) or 0.0)
+        current = float(result.latency_ms.get(key) or 0.0)
+        if previous > 0 and current > previous * (1 + latency_tolerance) and current - previous > latency_floor_ms:
+            problems.append(f"{key} {current:.2f}ms vs baseline {previous:.2f}ms")
+    previous_queries = float(baseline.get("queries_per_operation") or 0.0)
+    if previous_queries > 0 and result.queries_per_operation > previous_queries * (1 + query_tolerance) + 1e-9:
+        problems.append(
+            f"{result.queries_per_operation} queries/op vs baseline {previous_queries}"
+        )
+    if result.errors > int(baseline.get("errors") or 0):
+        problems.append(f"{result.errors} errors vs baseline {baseline.get('errors') or 0}")
+    return problems
+
+
+__all__ = [
+    "QueryCounter",
+    "ScenarioResult",
+    "compare_with_baseline",
+    "load_baseline",
+    "percentile",
+    "run_scenario",
+    "summarize_latencies",
+    "write_results",
+]
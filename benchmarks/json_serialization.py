@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Compare JSON encoding backends on the platform's two hottest documents.
+
+``catalogue`` is a 300-offer ``GET /api/offers`` page as ``jsonify`` builds it
+(sorted keys, compact) and ``request_cycle`` is the unified request log
+document written for every request. Each case runs the pre-provider stdlib
+call it replaces, then ``app.core.json_provider`` on the stdlib and orjson
+backends. No database or Flask app is needed.
+
+    python -m benchmarks.json_serialization
+    python -m benchmarks.json_serialization --offers 300 --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from flask.json.provider import _default as flask_default
+
+from app.core import json_provider
+
+from .harness import summarize_latencies
+
+
+def build_catalogue(offers: int) -> Dict[str, object]:
+    """Return an offers page shaped like ``offer_routes._serialize_offer`` output."""
+
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    items = []
+    for index in range(offers):
+        renditions = {
+            "thumb": f"/static/uploads/offers/{index}-160.webp",
+            "card": f"/static/uploads/offers/{index}-480.webp",
+            "full": f"/static/uploads/offers/{index}-1200.webp",
+        }
+        items.append(
+            {
+                "id": index + 1,
+                "title": f"عرض تجريبي {index}",
+                "description": "وصف عرض للاختبار مع تفاصيل الخصم وشروط الاستخدام",
+                "base_discount": float(5 + index % 30),
+                "discount_percent": float(5 + index % 30),
+                "valid_until": (now + timedelta(days=1 + index % 60)).isoformat(),
+                "image_url": renditions["full"],
+                "image_renditions": renditions,
+                "company_id": 1 + index % 20,
+                "company": f"Benchmark Partner {index % 20}",
+                "company_summary": "شريك معتمد في برنامج النخبة",
+                "company_description": "شريك معتمد في برنامج النخبة يقدم خصومات حصرية للأعضاء",
+                "company_logo_url": f"/static/uploads/logos/{index % 20}.webp",
+                "company_logo_renditions": {"small": f"/static/uploads/logos/{index % 20}-64.webp"},
+                "industry_icon": "restaurant",
+                "classification_values": ["family", "weekend"],
+                "created_at": (now - timedelta(days=index)).isoformat(),
+            }
+        )
+    return {"items": items, "next_cursor": "aWQ6MzAw", "catalog_version": 42}
+
+
+def build_request_cycle() -> Dict[str, object]:
+    """Return a typical API ``request_cycle`` log document."""
+
+    return {
+        "timestamp": "2026-01-01T12:00:00.000000Z",
+        "level": "INFO",
+        "message": "request_cycle",
+        "request_id": "5f0c6b7e9d4a4f0e8f1d2c3b4a596877",
+        "trace_id": "0a1b2c3d4e5f60718293a4b5c6d7e8f9",
+        "user_id": 1042,
+        "path": "/api/usage-codes/verify",
+        "method": "POST",
+        "incoming_payload": {
+            "json": {"offer_id": 311, "code": "48213"},
+            "combined": {"offer_id": 311, "code": "48213"},
+        },
+        "outgoing_payload": {
+            "status_code": 200,
+            "json": {"ok": True, "message": "تم التحقق من الرمز بنجاح", "offer_id": 311, "partner_id": 17},
+            "response_size": 118,
+        },
+        "timing": {"total_ms": 23},
+        "database": {
+            "query_count": 7,
+            "total_ms": 4.31,
+            "slowest": {"fingerprint": "SELECT usage_codes.id FROM usage_codes WHERE ?", "duration_ms": 1.12},
+            "repeated_statements": [],
+            "n_plus_one_suspected": False,
+            "pool_wait_ms": 0.04,
+        },
+        "response_status": 200,
+        "file": "middleware.py",
+        "function": "_emit_final_log",
+        "line": 237,
+    }
+
+
+def _flask_stdlib_dumps(obj) -> str:
+    # What DefaultJSONProvider.response() did before EliteJSONProvider.
+    return json.dumps(obj, default=flask_default, ensure_ascii=True, sort_keys=True, separators=(",", ":"))
+
+
+def _log_stdlib_dumps(obj) -> str:
+    # What RequestAwareFormatter.format() did before.
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _provider(backend: str, sort_keys: bool) -> Callable[[object], bytes]:
+    def _dumps(obj) -> bytes:
+        json_provider.set_backend(backend)
+        return json_provider.dumps_bytes(obj, sort_keys=sort_keys)
+
+    return _dumps
+
+
+def _time(operation: Callable[[], object], iterations: int) -> Dict[str, float]:
+    for _ in range(min(iterations, 20)):
+        operation()
+    latencies: List[float] = []
+    for _ in range(iterations):
+        started = perf_counter()
+        operation()
+        latencies.append((perf_counter() - started) * 1000)
+    return summarize_latencies(latencies)
+
+
+def run(offers: int, iterations: int) -> List[Dict[str, object]]:
+    documents = {
+        "catalogue": (build_catalogue(offers), _flask_stdlib_dumps, True),
+        "request_cycle": (build_request_cycle(), _log_stdlib_dumps, False),
+    }
+    backends = ["stdlib"] + (["orjson"] if json_provider.orjson is not None else [])
+    results = []
+    for name, (document, legacy, sort_keys) in documents.items():
+        encoded = legacy(document)
+        cases = [("legacy stdlib", lambda: legacy(document))]
+        for backend in backends:
+            cases.append((f"provider/{backend}", lambda dumps=_provider(backend, sort_keys): dumps(document)))
+        cases.append(("loads/stdlib", lambda: json.loads(encoded)))
+        if json_provider.orjson is not None:
+            cases.append(("loads/orjson", lambda: json_provider.orjson.loads(encoded)))
+        for label, operation in cases:
+            output = operation()
+            if isinstance(output, str):
+                output = output.encode("utf-8")
+            size = len(output) if isinstance(output, bytes) else len(encoded.encode("utf-8"))
+            results.append({"document": name, "case": label, "bytes": size, **_time(operation, iterations)})
+    json_provider.set_backend("auto")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON backends on catalogue and log documents.")
+    parser.add_argument("--offers", type=int, default=300)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--output", help="Also write the results to a JSON file.")
+    args = parser.parse_args(argv)
+
+    results = run(args.offers, args.iterations)
+    print(f"{'document':<14} {'case':<18} {'bytes':>8} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for row in results:
+        print(
+            f"{row['document']:<14} {row['case']:<18} {row['bytes']:>8} "
+            f"{row['p50']:>9.4f} {row['p95']:>9.4f} {row['mean']:>9.4f}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"offers": args.offers, "iterations": args.iterations, "results": results}, handle, indent=2)
+            handle.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark runner for ELITE hot paths.
+
+Seeds a throwaway database (a temporary SQLite file by default, or the
+database given with ``--database-url``), runs every scenario in-process
+through the Flask test client or the service layer, prints latency
+percentiles, throughput and SQL statements per operation, and compares the
+results with a stored baseline JSON. Exits with status 1 on regressions.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scenario portal_offers --iterations 200
+    python -m benchmarks.run --database-url postgresql://localhost/elite_bench
+    python -m benchmarks.run --write-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run ELITE hot-path benchmarks.")
+    parser.add_argument("--database-url", help="Throwaway database to seed (tables are dropped afterwards).")
+    parser.add_argument("--scenario", action="append", help="Scenario name to run (repeatable; default: all).")
+    parser.add_argument("--offers", type=int, default=200)
+    parser.add_argument("--partners", type=int, default=20)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--redemptions", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--write-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file.")
+    parser.add_argument(
+        "--latency-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed p50/p95 slowdown versus the baseline (fraction, default 0.25).",
+    )
+    parser.add_argument(
+        "--latency-floor-ms",
+        type=float,
+        default=5.0,
+        help="Ignore latency changes smaller than this many milliseconds (default 5).",
+    )
+    parser.add_argument(
+        "--query-tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed growth in statements per operation (fraction, default 0.10; "
+        "concurrent scenarios vary slightly with interleaving).",
+    )
+    return parser.parse_args(argv)
+
+
+def _configure_environment(database_url: str | None) -> str | None:
+    """Point the app at the benchmark database before it is imported."""
+
+    temp_path = None
+    if not database_url:
+        handle, temp_path = tempfile.mkstemp(prefix="elite-bench-", suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{temp_path}"
+    os.environ["SQLALCHEMY_DATABASE_URI"] = database_url
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+    os.environ.setdefault("MAIL_USERNAME", "benchmark")
+    os.environ.setdefault("MAIL_PASSWORD", "benchmark")
+    return temp_path
+
+
+def _host() -> dict:
+    """Identify the machine a run was timed on; latencies only compare on the same one."""
+
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpus": os.cpu_count(),
+    }
+
+
+def _print_result(result, problems) -> None:
+    latency = result.latency_ms
+    status = "❌" if problems else "✅"
+    print(
+        f"{status} {result.name:<30} "
+        f"p50 {latency['p50']:>8.2f}ms  p95 {latency['p95']:>8.2f}ms  p99 {latency['p99']:>8.2f}ms  "
+        f"{result.throughput_per_second:>8.1f} op/s  {result.queries_per_operation:>6.1f} q/op  "
+        f"errors {result.errors}"
+    )
+    for problem in problems:
+        print(f"      ↳ regression: {problem}")
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    temp_path = _configure_environment(args.database_url)
+    sys.path.insert(0, str(ROOT))
+
+    from app import create_app
+    from app.core.database import db
+
+    from .harness import compare_with_baseline, load_baseline, write_results
+    from .scenarios import SCENARIOS, BenchmarkScale, seed_database
+
+    selected = args.scenario or list(SCENARIOS)
+    unknown = [name for name in selected if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+        return 2
+
+    scale = BenchmarkScale(
+        offers=args.offers,
+        partners=args.partners,
+        members=args.members,
+        redemptions=args.redemptions,
+        iterations=args.iterations,
+        threads=args.threads,
+    )
+
+    app = create_app()
+    app.config["WTF_CSRF_ENABLED"] = False
+    baseline_metadata, baseline = load_baseline(args.baseline)
+    if baseline and baseline_metadata.get("scale") != scale.__dict__:
+        print("ℹ️  Baseline was recorded at a different scale; skipping the comparison.\n")
+        baseline = {}
+    same_host = baseline_metadata.get("host") == _host()
+    if baseline and not same_host:
+        print(
+            "ℹ️  Baseline was recorded on another machine; comparing statements and errors only. "
+            "Run with --write-baseline on this host first to compare latencies.\n"
+        )
+    results = []
+    ok = True
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            fixture = seed_database(scale)
+            engine = db.engine
+            dialect = engine.dialect.name
+
+        print(f"🏁 Running {len(selected)} scenario(s) on {dialect} with {scale}\n")
+        for name in selected:
+            result = SCENARIOS[name](app, engine, fixture, scale)
+            problems = compare_with_baseline(
+                result,
+                baseline.get(name),
+                latency_tolerance=args.latency_tolerance,
+                query_tolerance=args.query_tolerance,
+                latency_floor_ms=args.latency_floor_ms,
+                compare_latency=same_host,
+            )
+            _print_result(result, problems)
+            results.append(result)
+            ok = ok and not problems
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    metadata = {
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "host": _host(),
+        "dialect": dialect,
+        "scale": scale.__dict__,
+    }
+    if args.output:
+        write_results(args.output, results, metadata)
+    if args.write_baseline:
+        write_results(args.baseline, results, metadata)
+        print(f"\n💾 Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\nℹ️  No baseline found; run with --write-baseline to create one.")
+        return 0
+    print("\n✅ No regressions against the baseline.\n" if ok else "\n🚫 Regressions detected.\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Seed data and hot-path scenarios measured by ``benchmarks/run.py``."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from app.core.database import db
+from app.models import Company, Notification, Offer, RedemptionEvent, UsageCode, User
+from app.modules.members.auth.utils import AUTH_COOKIE_NAME, create_token
+
+from .harness import ScenarioResult, run_scenario
+
+PASSWORD = "benchmark-password"
+
+
+@dataclass(frozen=True)
+class BenchmarkScale:
+    """Dataset size and load knobs shared by every scenario."""
+
+    offers: int = 200
+    partners: int = 20
+    members: int = 200
+    redemptions: int = 50
+    iterations: int = 50
+    threads: int = 8
+    seed: int = 1234
+
+
+@dataclass
+class BenchmarkFixture:
+    """Identifiers of the seeded rows the scenarios operate on."""
+
+    admin_id: int
+    member_id: int
+    member_ids: List[int]
+    partner_ids: List[int]
+    offer_ids: List[int]
+    hot_partner_id: int
+    hot_offer_id: int
+
+
+def _user(username: str, role: str, password_hash: str) -> User:
+    user = User(username=username, email=f"{username}@bench.example.com", role=role, is_active=True)
+    user.password_hash = password_hash
+    return user
+
+
+def seed_database(scale: BenchmarkScale) -> BenchmarkFixture:
+    """Insert a deterministic dataset sized by ``scale`` and return its ids."""
+
+    rng = random.Random(scale.seed)
+    template = User(username="bench-template", email="template@bench.example.com")
+    template.set_password(PASSWORD)
+    password_hash = template.password_hash
+
+    admin = _user("bench-admin", "admin", password_hash)
+    members = [_user(f"bench-member-{index}", "member", password_hash) for index in range(scale.members)]
+    db.session.add(admin)
+    db.session.add_all(members)
+    db.session.flush()
+
+    industries = ("مطاعم", "مقاهي", "ترفيه", "صحة", "تسوق")
+    cities = ("الرياض", "جدة", "الدمام")
+    partners = []
+    for index in range(scale.partners):
+        owner = _user(f"bench-partner-{index}", "company", password_hash)
+        company = Company(
+            name=f"Benchmark Partner {index}",
+            status="approved",
+            industry=industries[index % len(industries)],
+            city=cities[index % len(cities)],
+        )
+        company.owner = owner
+        db.session.add_all([owner, company])
+        partners.append(company)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    offers = []
+    for index in range(scale.offers):
+        offers.append(
+            Offer(
+                title=f"عرض تجريبي {index}",
+                description="وصف عرض للاختبار",
+                base_discount=float(5 + index % 30),
+                company_id=partners[index % len(partners)].id,
+                valid_until=now + timedelta(days=1 + index % 60),
+                status="active",
+            )
+        )
+    db.session.add_all(offers)
+    db.session.flush()
+
+    member = members[0]
+    for index in range(scale.redemptions):
+        offer = offers[rng.randrange(len(offers))]
+        db.session.add(
+            RedemptionEvent(
+                kind="usage_code_attempt",
+                member_id=member.id,
+                partner_id=offer.company_id,
+                offer_id=offer.id,
+                code_used="1234",
+                result="valid",
+                created_at=now - timedelta(hours=index),
+            )
+        )
+    db.session.commit()
+
+    hot_partner = partners[0]
+    hot_offer = next(offer for offer in offers if offer.company_id == hot_partner.id)
+    return BenchmarkFixture(
+        admin_id=admin.id,
+        member_id=member.id,
+        member_ids=[item.id for item in members],
+        partner_ids=[item.id for item in partners],
+        offer_ids=[item.id for item in offers],
+        hot_partner_id=hot_partner.id,
+        hot_offer_id=hot_offer.id,
+    )
+
+
+def _client(app, user_id: int):
+    with app.app_context():
+        token = create_token(user_id)
+    client = app.test_client()
+    client.set_cookie(AUTH_COOKIE_NAME, token)
+    return client
+
+
+def bench_portal_offers(app, engine, fixture: BenchmarkFixture, scale: BenchmarkScale) -> ScenarioResult:
+    client = _client(app, fixture.member_id)
+
+    def _operation(_index: int) -> bool:
+        return client.get("/portal/offers").status_code == 200
+
+    return run_scenario(
+        "portal_offers",
+        _operation,
+        engine=engine,
+        iterations=scale.iterations,
+        parameters={"offers": scale.offers, "redemptions": scale.redemptions},
+    )
+
+
+def bench_usage_code_verify(app, engine, fixture: BenchmarkFixture, scale: BenchmarkScale) -> ScenarioResult:
+    from app.services.usage_code_service import generate_usage_code
+
+    member_ids = fixture.member_ids[1:] or fixture.member_ids
+    with app.app_context():
+        code = generate_usage_code(fixture.hot_partner_id).code
+        tokens = [create_token(member_id) for member_id in member_ids]
+
+    def _operation(index: int) -> bool:
+        client = app.test_client()
+        client.set_cookie(AUTH_COOKIE_NAME, tokens[index % len(tokens)])
+        response = client.post(
+            "/api/usage-codes/verify",
+            json={"offer_id": fixture.hot_offer_id, "code": code},
+        )
+        return response.status_code == 200
+
+    return run_scenario(
+        "usage_code_verify_concurrent",
+        _operation,
+        engine=engine,
+        iterations=scale.iterations,
+        threads=scale.threads,
+        parameters={"partner_id": fixture.hot_partner_id},
+    )
+
+
+def bench_generate_usage_code(app, engine, fixture: BenchmarkFixture, scale: BenchmarkScale) -> ScenarioResult:
+    from app.services.usage_code_service import generate_usage_code
+
+    partner_ids = fixture.partner_ids
+
+    def _operation(index: int) -> bool:
+        with app.app_context():
+            generate_usage_code(partner_ids[index % len(partner_ids)])
+        return True
+
+    result = run_scenario(
+        "generate_usage_code",
+        _operation,
+        engine=engine,
+        iterations=scale.iterations,
+        parameters={"partners": len(partner_ids)},
+    )
+    with app.app_context():
+        UsageCode.query.delete()
+        db.session.commit()
+    return result
+
+
+def bench_analytics_summary(app, engine, fixture: BenchmarkFixture, scale: BenchmarkScale) -> ScenarioResult:
+    from app.modules.admin.services.analytics_summary_service import get_analytics_summary
+
+    def _operation(_index: int) -> bool:
+        with app.app_context():
+            get_analytics_summary()
+        return True
+
+    return run_scenario(
+        "admin_analytics_summary",
+        _operation,
+        engine=engine,
+        iterations=scale.iterations,
+        parameters={"redemptions": scale.redemptions},
+    )
+
+
+def bench_broadcast_offer(app, engine, fixture: BenchmarkFixture, scale: BenchmarkScale) -> ScenarioResult:
+    from app.modules.members.services.member_notifications_service import broadcast_offer_task
+
+    iterations = max(1, scale.iterations // 10)
+
+    def _operation(_index: int) -> bool:
+        # url_for() in the task needs a request context to build links.
+        with app.test_request_context("/"):
+            created = broadcast_offer_task.run(fixture.hot_offer_id)
+            Notification.query.filter_by(type="new_offer").delete()
+            db.session.commit()
+        return created > 0
+
+    return run_scenario(
+        "broadcast_offer_fanout",
+        _operation,
+        engine=engine,
+        iterations=iterations,
+        warmup=1,
+        parameters={"recipients": scale.members + scale.partners + 1},
+    )
+
+
+def bench_middleware_overhead(app, engine, fixture: BenchmarkFixture, scale: BenchmarkScale) -> ScenarioResult:
+    client = app.test_client()
+
+    def _operation(_index: int) -> bool:
+        return client.get("/about").status_code == 200
+
+    return run_scenario(
+        "middleware_overhead",
+        _operation,
+        engine=engine,
+        iterations=scale.iterations * 4,
+        parameters={"path": "/about"},
+    )
+
+
+SCENARIOS: Dict[str, Callable[..., ScenarioResult]] = {
+    "portal_offers": bench_portal_offers,
+    "usage_code_verify_concurrent": bench_usage_code_verify,
+    "generate_usage_code": bench_generate_usage_code,
+    "admin_analytics_summary": bench_analytics_summary,
+    "broadcast_offer_fanout": bench_broadcast_offer,
+    "middleware_overhead": bench_middleware_overhead,
+}
+
+
+__all__ = ["BenchmarkFixture", "BenchmarkScale", "SCENARIOS", "seed_database"]
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""Entry point for Celery worker and beat processes.
+
+Usage::
+
+    celery -A celery_worker.celery worker
+    ELITE_PROCESS_ROLE=beat celery -A celery_worker.celery beat
+"""
+
+import os
+
+os.environ.setdefault("ELITE_PROCESS_ROLE", "worker")
+
+from app import create_worker_app  # noqa: E402
+from app.core.extensions import celery  # noqa: E402
+
+app = create_worker_app()
@@ -0,0 +1,25 @@
+"""Gunicorn settings and hooks for the web app.
+
+Gunicorn loads ``./gunicorn.conf.py`` automatically; the command line and
+``GUNICORN_CMD_ARGS`` override anything set here.
+"""
+
+import os
+
+from app.core.metrics.registry import REGISTRY, clear_multiproc_dir
+
+# Each /company/usage-codes/stream connection holds its thread for up to
+# USAGE_CODE_STREAM_MAX_SECONDS. With sync workers a handful of partner
+# screens would take every worker, so requests are served from threads.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 32))
+
+
+def on_starting(server):
+    # Snapshots left by a previous master would be counted again.
+    clear_multiproc_dir(os.getenv("METRICS_MULTIPROC_DIR"))
+
+
+def child_exit(server, worker):
+    REGISTRY.configure(os.getenv("METRICS_MULTIPROC_DIR"), float(os.getenv("METRICS_FLUSH_INTERVAL", 5)))
+    REGISTRY.mark_process_dead(worker.pid)
@@ -0,0 +1,134 @@
+"""add offer feedback fact table
+
+Revision ID: 6d2e8b4f1a93
+Revises: 234ff335896f, 2f1c3a7e4e1b
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2e8b4f1a93'
+down_revision = ('234ff335896f', '2f1c3a7e4e1b')
+branch_labels = None
+depends_on = None
+
+
+# Feedback notifications were fanned out once per company recipient; rows that
+# share the same payload within this window describe a single member event.
+_DEDUP_WINDOW = timedelta(seconds=60)
+
+
+def _backfill_from_notifications():
+    bind = op.get_bind()
+
+    notifications = sa.table(
+        'notifications',
+        sa.column('type', sa.String),
+        sa.column('metadata_json', sa.JSON),
+        sa.column('created_at', sa.DateTime),
+    )
+    offers = sa.table(
+        'offers',
+        sa.column('id', sa.Integer),
+        sa.column('company_id', sa.Integer),
+    )
+    users = sa.table('users', sa.column('id', sa.Integer))
+    offer_feedback = sa.table(
+        'offer_feedback',
+        sa.column('offer_id', sa.Integer),
+        sa.column('company_id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('action', sa.String),
+        sa.column('note', sa.Text),
+        sa.column('created_at', sa.DateTime),
+    )
+
+    offer_companies = {
+        row.id: row.company_id
+        for row in bind.execute(sa.select(offers.c.id, offers.c.company_id))
+        if row.company_id is not None
+    }
+    user_ids = {row.id for row in bind.execute(sa.select(users.c.id))}
+
+    rows = bind.execute(
+        sa.select(notifications.c.metadata_json, notifications.c.created_at)
+        .where(notifications.c.type == 'offer_feedback')
+        .order_by(notifications.c.created_at)
+    )
+
+    last_seen = {}
+    pending = []
+    for metadata, created_at in rows:
+        metadata = metadata or {}
+        try:
+            offer_id = int(metadata.get('offer_id'))
+        except (TypeError, ValueError):
+            continue
+        company_id = offer_companies.get(offer_id)
+        if company_id is None:
+            continue
+        user_id = metadata.get('user_id')
+        action = (metadata.get('action') or 'like')[:20]
+        note = metadata.get('note')
+
+        key = (offer_id, user_id, action, note)
+        previous = last_seen.get(key)
+        if previous is not None and created_at - previous <= _DEDUP_WINDOW:
+            continue
+        last_seen[key] = created_at
+
+        pending.append(
+            {
+                'offer_id': offer_id,
+                'company_id': company_id,
+                'user_id': user_id if user_id in user_ids else None,
+                'action': action,
+                'note': note,
+                'created_at': created_at,
+            }
+        )
+        if len(pending) >= 1000:
+            op.bulk_insert(offer_feedback, pending)
+            pending = []
+
+    if pending:
+        op.bulk_insert(offer_feedback, pending)
+
+
+def upgrade():
+    op.create_table(
+        'offer_feedback',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('offer_id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('action', sa.String(length=20), nullable=False),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['offer_id'], ['offers.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('offer_feedback', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_offer_feedback_offer_id_action', ['offer_id', 'action'], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f('ix_offer_feedback_company_id'), ['company_id'], unique=False
+        )
+
+    _backfill_from_notifications()
+
+
+def downgrade():
+    with op.batch_alter_table('offer_feedback', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_offer_feedback_company_id'))
+        batch_op.drop_index('ix_offer_feedback_offer_id_action')
+
+    op.drop_table('offer_feedback')
@@ -0,0 +1,32 @@
+"""add image renditions to offers and companies
+
+Revision ID: 8c41f27d9b05
+Revises: 6d2e8b4f1a93
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41f27d9b05'
+down_revision = '6d2e8b4f1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_renditions', sa.JSON(), nullable=True))
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('logo_renditions', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_column('logo_renditions')
+
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.drop_column('image_renditions')
@@ -0,0 +1,96 @@
+"""add normalized search documents and trigram indexes
+
+Revision ID: a4f19c7e2b60
+Revises: 8c41f27d9b05
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.normalization import build_search_document
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f19c7e2b60'
+down_revision = '8c41f27d9b05'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, column) pairs created with gin_trgm_ops on PostgreSQL.
+_TRIGRAM_INDEXES = (
+    ('ix_offers_search_document_trgm', 'offers', 'search_document'),
+    ('ix_companies_search_document_trgm', 'companies', 'search_document'),
+    ('ix_users_username_trgm', 'users', 'username'),
+    ('ix_users_email_trgm', 'users', 'email'),
+)
+
+
+def _backfill():
+    bind = op.get_bind()
+    offers = sa.table(
+        'offers',
+        sa.column('id', sa.Integer),
+        sa.column('title', sa.String),
+        sa.column('description', sa.Text),
+        sa.column('search_document', sa.Text),
+    )
+    companies = sa.table(
+        'companies',
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('notification_preferences', sa.JSON),
+        sa.column('search_document', sa.Text),
+    )
+
+    for row in bind.execute(sa.select(offers.c.id, offers.c.title, offers.c.description)).all():
+        bind.execute(
+            offers.update()
+            .where(offers.c.id == row.id)
+            .values(search_document=build_search_document((row.title, row.description)))
+        )
+
+    rows = bind.execute(
+        sa.select(companies.c.id, companies.c.name, companies.c.notification_preferences)
+    ).all()
+    for row in rows:
+        preferences = row.notification_preferences if isinstance(row.notification_preferences, dict) else {}
+        bind.execute(
+            companies.update()
+            .where(companies.c.id == row.id)
+            .values(search_document=build_search_document((row.name, preferences.get('industry'))))
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_document', sa.Text(), nullable=True))
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_document', sa.Text(), nullable=True))
+
+    _backfill()
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, table, column in _TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for name, table, _column in reversed(_TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_column('search_document')
+
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.drop_column('search_document')
@@ -0,0 +1,34 @@
+"""add a DEFAULT partition to redemption_events
+
+Revision ID: a7c3e9f2b614
+Revises: e5b1c9d7a240
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+from app.core.partitioning import create_default_partition, default_partition_name, is_partitioned
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f2b614'
+down_revision = 'e5b1c9d7a240'
+branch_labels = None
+depends_on = None
+
+
+_TABLE = 'redemption_events'
+
+
+def upgrade():
+    # Catches inserts for months without a child if partition maintenance stops.
+    create_default_partition(op.get_bind(), _TABLE)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if not is_partitioned(bind, _TABLE):
+        return
+    # Rows still in the default partition go with it; run
+    # `flask elite-partitions ensure` first to move them into monthly children.
+    op.execute(f'DROP TABLE IF EXISTS "{default_partition_name(_TABLE)}"')
@@ -0,0 +1,80 @@
+"""promote company city and industry to indexed columns
+
+Revision ID: b3e8d5a1c274
+Revises: a4f19c7e2b60
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8d5a1c274'
+down_revision = 'a4f19c7e2b60'
+branch_labels = None
+depends_on = None
+
+
+_FACET_KEYS = ('city', 'industry')
+
+companies = sa.table(
+    'companies',
+    sa.column('id', sa.Integer),
+    sa.column('city', sa.String),
+    sa.column('industry', sa.String),
+    sa.column('notification_preferences', sa.JSON),
+)
+
+
+def _clean(value):
+    value = (str(value) if value is not None else '').strip()
+    return value or None
+
+
+def upgrade():
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('city', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('industry', sa.String(length=255), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(companies.c.id, companies.c.notification_preferences)).all()
+    for row in rows:
+        preferences = dict(row.notification_preferences) if isinstance(row.notification_preferences, dict) else {}
+        values = {key: _clean(preferences.pop(key, None)) for key in _FACET_KEYS}
+        bind.execute(
+            companies.update()
+            .where(companies.c.id == row.id)
+            .values(notification_preferences=preferences, **values)
+        )
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_companies_city'), ['city'], unique=False)
+        batch_op.create_index(batch_op.f('ix_companies_industry'), ['industry'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(
+            companies.c.id,
+            companies.c.city,
+            companies.c.industry,
+            companies.c.notification_preferences,
+        )
+    ).all()
+    for row in rows:
+        preferences = dict(row.notification_preferences) if isinstance(row.notification_preferences, dict) else {}
+        preferences['city'] = row.city
+        preferences['industry'] = row.industry
+        bind.execute(
+            companies.update()
+            .where(companies.c.id == row.id)
+            .values(notification_preferences=preferences)
+        )
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_companies_industry'))
+        batch_op.drop_index(batch_op.f('ix_companies_city'))
+        batch_op.drop_column('industry')
+        batch_op.drop_column('city')
@@ -0,0 +1,43 @@
+"""add transactional outbox table
+
+Revision ID: c9f2a7d4e815
+Revises: b3e8d5a1c274
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f2a7d4e815'
+down_revision = 'b3e8d5a1c274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'outbox_messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_outbox_messages_status_next_attempt',
+        'outbox_messages',
+        ['status', 'next_attempt_at'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_outbox_messages_status_next_attempt', table_name='outbox_messages')
+    op.drop_table('outbox_messages')
@@ -0,0 +1,140 @@
+"""move usage attempts and incentives into partitioned redemption_events
+
+Revision ID: d4a8e6f1b930
+Revises: c9f2a7d4e815
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.partitioning import add_months, ensure_monthly_partitions, month_start
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8e6f1b930'
+down_revision = 'c9f2a7d4e815'
+branch_labels = None
+depends_on = None
+
+
+_KINDS = ('usage_code_attempt', 'incentive_applied')
+_MONTHS_AHEAD = 3
+
+# (name, columns) created on the parent; PostgreSQL propagates them to every partition.
+_INDEXES = (
+    ('ix_redemption_events_kind_result_created', ['kind', 'result', 'created_at']),
+    ('ix_redemption_events_member_created', ['member_id', 'created_at']),
+    ('ix_redemption_events_partner_created', ['partner_id', 'created_at']),
+    ('ix_redemption_events_offer_member', ['offer_id', 'member_id']),
+)
+
+_COMPAT_VIEW = 'activity_log_with_redemptions'
+_COMPAT_VIEW_SQL = f"""
+CREATE VIEW {_COMPAT_VIEW} AS
+SELECT 'activity_log' AS source, id, admin_id, company_id, action, details, timestamp,
+       member_id, partner_id, offer_id, code_used, result, created_at
+FROM activity_log
+UNION ALL
+SELECT 'redemption_events' AS source, id, NULL, NULL, kind, NULL, created_at,
+       member_id, partner_id, offer_id, code_used, result, created_at
+FROM redemption_events
+"""
+
+
+def _create_postgresql_table():
+    op.execute(
+        """
+        CREATE TABLE redemption_events (
+            id BIGSERIAL NOT NULL,
+            kind VARCHAR(32) NOT NULL,
+            member_id INTEGER REFERENCES users (id) ON DELETE SET NULL,
+            partner_id INTEGER REFERENCES companies (id) ON DELETE SET NULL,
+            offer_id INTEGER REFERENCES offers (id) ON DELETE SET NULL,
+            code_used VARCHAR(8),
+            result VARCHAR(32),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+
+
+def _create_plain_table():
+    op.create_table(
+        'redemption_events',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=True),
+        sa.Column('partner_id', sa.Integer(), nullable=True),
+        sa.Column('offer_id', sa.Integer(), nullable=True),
+        sa.Column('code_used', sa.String(length=8), nullable=True),
+        sa.Column('result', sa.String(length=32), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['users.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['partner_id'], ['companies.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['offer_id'], ['offers.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    postgresql = bind.dialect.name == 'postgresql'
+    kinds = ', '.join(f"'{kind}'" for kind in _KINDS)
+
+    if postgresql:
+        _create_postgresql_table()
+        oldest = bind.execute(
+            sa.text(f"SELECT MIN(COALESCE(created_at, timestamp)) FROM activity_log WHERE action IN ({kinds})")
+        ).scalar()
+        now = datetime.utcnow()
+        ensure_monthly_partitions(
+            bind,
+            'redemption_events',
+            first=month_start(oldest or now),
+            last=add_months(month_start(now), _MONTHS_AHEAD),
+        )
+    else:
+        _create_plain_table()
+
+    for name, columns in _INDEXES:
+        op.create_index(name, 'redemption_events', columns, unique=False)
+
+    # Timestamps were nullable in activity_log; the ledger's partition key is not.
+    op.execute(
+        f"""
+        INSERT INTO redemption_events (kind, member_id, partner_id, offer_id, code_used, result, created_at)
+        SELECT action, member_id, partner_id, offer_id, code_used, result,
+               COALESCE(created_at, timestamp, CURRENT_TIMESTAMP)
+        FROM activity_log
+        WHERE action IN ({kinds})
+        ORDER BY id
+        """
+    )
+    op.execute(f"DELETE FROM activity_log WHERE action IN ({kinds})")
+    op.execute(_COMPAT_VIEW_SQL)
+
+
+def downgrade():
+    kinds = ', '.join(f"'{kind}'" for kind in _KINDS)
+    op.execute(f"DROP VIEW IF EXISTS {_COMPAT_VIEW}")
+    op.execute(
+        f"""
+        INSERT INTO activity_log (action, details, timestamp, member_id, partner_id, offer_id,
+                                  code_used, result, created_at)
+        SELECT kind,
+               CASE kind WHEN 'incentive_applied' THEN 'Incentive applied result: '
+                         ELSE 'Usage code attempt result: ' END || COALESCE(result, ''),
+               created_at, member_id, partner_id, offer_id, code_used, result, created_at
+        FROM redemption_events
+        WHERE kind IN ({kinds})
+        ORDER BY created_at, id
+        """
+    )
+    for name, _columns in reversed(_INDEXES):
+        op.drop_index(name, table_name='redemption_events')
+    # Dropping the parent drops every monthly partition with it.
+    op.drop_table('redemption_events')
@@ -0,0 +1,37 @@
+"""add indexes used by the retention sweeps
+
+Revision ID: e5b1c9d7a240
+Revises: d4a8e6f1b930
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b1c9d7a240'
+down_revision = 'd4a8e6f1b930'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns): each sweep walks its age column, and keep-last-N
+# policies look up an owner's newest rows through (owner, age).
+_INDEXES = (
+    ('ix_verification_codes_expires_at', 'verification_codes', ['expires_at']),
+    ('ix_usage_codes_partner_expires', 'usage_codes', ['partner_id', 'expires_at']),
+    ('ix_usage_codes_expires_at', 'usage_codes', ['expires_at']),
+    ('ix_sms_logs_sent_at', 'sms_logs', ['sent_at']),
+    ('ix_notifications_user_created', 'notifications', ['user_id', 'created_at']),
+    ('ix_outbox_messages_status_sent_at', 'outbox_messages', ['status', 'sent_at']),
+)
+
+
+def upgrade():
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _columns in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
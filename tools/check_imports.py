@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Utility: Import Cycle Detector for ELITE Project
+
+Imports the Celery entry point and every task module it loads, each in a
+fresh interpreter. Inside the web app the blueprints are always loaded first,
+which hides circular imports that only break a process importing the module
+on its own, such as the worker (``celery_worker`` -> ``create_worker_app``).
+Keep ``MODULES`` in line with the imports in ``create_worker_app``.
+
+Exits with status 1 when any module fails to import.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = (
+    "celery_worker",
+    "app.modules.members.services.member_notifications_service",
+    "app.services.image_processing_service",
+    "app.services.outbox_service",
+    "app.services.redemption_ledger_service",
+    "app.services.retention_service",
+    "app.services.usage_code_service",
+)
+
+
+def _import_error(module: str):
+    """Import ``module`` in a new interpreter and return its error output, if any."""
+
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode == 0:
+        return None
+    lines = completed.stderr.strip().splitlines()
+    return lines[-1] if lines else f"exit status {completed.returncode}"
+
+
+def main() -> int:
+    print("🔍 Importing the worker and its task modules on their own...\n")
+
+    failures = {}
+    for module in MODULES:
+        error = _import_error(module)
+        if error:
+            failures[module] = error
+            print(f"❌ {module}: {error}")
+        else:
+            print(f"✅ {module}")
+
+    print("\n✅ Check completed.\n" if not failures else f"\n🚫 {len(failures)} module(s) failed to import.\n")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
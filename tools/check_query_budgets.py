@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Utility: SQL Query Budget Checker for ELITE Project
+
+Seeds a throwaway SQLite database, requests a set of endpoints through the
+Flask test client and records every SQL statement they emit. Each check has a
+maximum statement count and may forbid eager ``LEFT OUTER JOIN`` loading, so
+relationship loader regressions (N+1 queries or unconditional joined loads)
+fail loudly. Exits with status 1 when any budget is exceeded.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "query-budget-check-secret-key-0123456789")
+os.environ.setdefault("MAIL_USERNAME", "budget-check")
+os.environ.setdefault("MAIL_PASSWORD", "budget-check")
+
+from sqlalchemy import event
+
+from app import create_app
+from app.core.database import db
+from app.models import ActivityLog, Company, Offer, RedemptionEvent, User
+from app.modules.members.auth.utils import AUTH_COOKIE_NAME, create_token
+
+# Budgets include the eight lookup_choices statements the request cleaning
+# middleware issues on every request; the remainder must not grow with rows.
+# (label, role, path, max statements, forbid LEFT OUTER JOIN)
+ENDPOINT_BUDGETS = (
+    ("portal home", "member", "/portal/", 16, False),
+    ("portal profile", "member", "/portal/profile", 12, False),
+    ("portal offers", "member", "/portal/offers", 15, False),
+    ("offers api page", "member", "/api/offers/?limit=20", 12, False),
+    ("offer facets api", "member", "/portal/api/offers/facets?city=الرياض", 12, True),
+    ("admin activity log", "admin", "/admin/activity-log", 12, False),
+)
+
+# (label, analytics_service function name, max statements, forbid LEFT OUTER JOIN)
+SERVICE_BUDGETS = (
+    ("total usage attempts", "total_usage_attempts", 1, True),
+    ("successful usages", "successful_usages", 1, True),
+    ("incentives applied", "incentives_applied", 1, True),
+)
+
+
+@contextmanager
+def capture_statements(engine):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def seed():
+    admin = User(username="budget-admin", email="admin@example.com", role="admin", is_active=True)
+    member = User(username="budget-member", email="member@example.com", role="member", is_active=True)
+    for user in (admin, member):
+        user.set_password("budget-password")
+    db.session.add_all([admin, member])
+    db.session.flush()
+
+    companies = []
+    for index in range(5):
+        owner = User(
+            username=f"partner-{index}",
+            email=f"partner-{index}@example.com",
+            role="company",
+            is_active=True,
+        )
+        owner.set_password("budget-password")
+        company = Company(name=f"Partner {index}", status="approved", industry="مطاعم", city="الرياض")
+        company.owner = owner
+        db.session.add_all([owner, company])
+        companies.append(company)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    offers = []
+    for index in range(40):
+        offer = Offer(
+            title=f"Offer {index}",
+            company_id=companies[index % len(companies)].id,
+            valid_until=now + timedelta(days=index + 1),
+        )
+        db.session.add(offer)
+        offers.append(offer)
+    db.session.flush()
+
+    for index in range(30):
+        offer = offers[index]
+        db.session.add(
+            RedemptionEvent(
+                kind="usage_code_attempt",
+                member_id=member.id,
+                partner_id=offer.company_id,
+                offer_id=offer.id,
+                code_used="1234",
+                result="valid",
+                created_at=now,
+            )
+        )
+        db.session.add(
+            ActivityLog(
+                action="company_update",
+                admin_id=admin.id,
+                company_id=offer.company_id,
+                details="seeded",
+            )
+        )
+    db.session.commit()
+    return {"admin": admin.id, "member": member.id}
+
+
+def _report(label, statements, budget, forbid_outer_join):
+    problems = []
+    if len(statements) > budget:
+        problems.append(f"{len(statements)} statements (budget {budget})")
+    if forbid_outer_join and any("LEFT OUTER JOIN" in statement for statement in statements):
+        problems.append("unexpected LEFT OUTER JOIN")
+    status = "❌" if problems else "✅"
+    detail = "; ".join(problems) if problems else f"{len(statements)} statements"
+    print(f"{status} {label}: {detail}")
+    return not problems
+
+
+def main():
+    app = create_app()
+    from app.services import analytics_service
+
+    app.config["WTF_CSRF_ENABLED"] = False
+    ok = True
+
+    with app.app_context():
+        db.create_all()
+        user_ids = seed()
+        tokens = {role: create_token(user_id) for role, user_id in user_ids.items()}
+        engine = db.engine
+
+        print("🔍 Checking SQL statement budgets...\n")
+        client = app.test_client()
+        for label, role, path, budget, forbid_outer_join in ENDPOINT_BUDGETS:
+            client.set_cookie(AUTH_COOKIE_NAME, tokens[role])
+            # Warm per-worker caches so the budget reflects steady-state requests.
+            client.get(path)
+            db.session.remove()
+            with capture_statements(engine) as statements:
+                response = client.get(path)
+            if response.status_code >= 400:
+                print(f"❌ {label}: HTTP {response.status_code}")
+                ok = False
+                continue
+            ok = _report(label, statements, budget, forbid_outer_join) and ok
+
+        for label, name, budget, forbid_outer_join in SERVICE_BUDGETS:
+            db.session.remove()
+            with capture_statements(engine) as statements:
+                getattr(analytics_service, name)()
+            ok = _report(label, statements, budget, forbid_outer_join) and ok
+
+    print("\n✅ Check completed.\n" if ok else "\n🚫 Query budgets exceeded.\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())